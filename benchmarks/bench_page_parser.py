@@ -0,0 +1,29 @@
+"""Benchmark the plugin page parsers against the saved sample pages.
+
+Usage: python -m benchmarks.bench_page_parser [repeat]
+"""
+import sys
+import timeit
+from pathlib import Path
+
+from wp_plugin_scanner.page_parser import extract_page_fields, extract_page_fields_soup
+
+PAGES = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "plugin_pages"
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    repeat = int(argv[0]) if argv else 200
+    for page in sorted(PAGES.glob("*.html")):
+        html = page.read_text(encoding="utf-8")
+        if extract_page_fields(html) != extract_page_fields_soup(html):
+            print(f"[!] {page.name}: parsers disagree")
+            return 1
+        fast = timeit.timeit(lambda: extract_page_fields(html), number=repeat) / repeat
+        soup = timeit.timeit(lambda: extract_page_fields_soup(html), number=repeat) / repeat
+        print(f"{page.name:<24} fast {fast * 1000:7.3f} ms  soup {soup * 1000:7.3f} ms  x{soup / fast:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+"""Deterministic offline plugin corpus for the benchmarks.
+
+``build_corpus`` writes, for a fixed seed, the same set of plugin ZIPs,
+category listing pages and plugins-API JSON documents every time, so runs
+on different machines and versions measure identical inputs.
+"""
+import io
+import json
+import random
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+UPLOAD_SNIPPETS = (
+    "$file = wp_handle_upload($_FILES['file'], array('test_form' => false));",
+    "$id = media_handle_upload('async-upload', $post_id);",
+    "move_uploaded_file($_FILES['f']['tmp_name'], $dest);",
+)
+FILLER = (
+    "$value = get_option('{slug}_setting', '');",
+    "add_action('init', '{slug}_register');",
+    "echo esc_html__('Settings saved', '{slug}');",
+    "return apply_filters('{slug}_args', $args);",
+    "if (!defined('ABSPATH')) {{ exit; }}",
+)
+PER_PAGE = 20
+
+
+@dataclass
+class Corpus:
+    root: Path
+    slugs: list[str]
+    categories: dict[str, list[str]] = field(default_factory=dict)
+
+    def zip_path(self, slug: str) -> Path:
+        return self.root / "plugin" / f"{slug}.latest-stable.zip"
+
+    def info_path(self, slug: str) -> Path:
+        return self.root / "info" / f"{slug}.json"
+
+    def listing_path(self, category: str, page: int) -> Path:
+        return self.root / "browse" / category / f"{page}.html"
+
+    def total_zip_bytes(self) -> int:
+        return sum(self.zip_path(s).stat().st_size for s in self.slugs)
+
+
+def _plugin_zip(slug: str, rng: random.Random) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for index in range(rng.randint(3, 12)):
+            ext = rng.choice((".php", ".php", ".php", ".js", ".css", ".txt"))
+            lines = [rng.choice(FILLER).format(slug=slug.replace("-", "_")) for _ in range(rng.randint(50, 400))]
+            if ext in (".php", ".js") and rng.random() < 0.15:
+                lines.insert(rng.randrange(len(lines)), rng.choice(UPLOAD_SNIPPETS))
+            body = "<?php\n" + "\n".join(lines) if ext == ".php" else "\n".join(lines)
+            # fixed timestamps keep the archives byte-identical between runs
+            entry = zipfile.ZipInfo(f"{slug}/file-{index}{ext}", date_time=(2024, 1, 1, 0, 0, 0))
+            entry.compress_type = zipfile.ZIP_DEFLATED
+            zf.writestr(entry, body)
+    return buf.getvalue()
+
+
+def _info(slug: str, rng: random.Random) -> dict:
+    return {
+        "name": slug.replace("-", " ").title(),
+        "slug": slug,
+        "version": f"{rng.randint(1, 5)}.{rng.randint(0, 9)}.{rng.randint(0, 20)}",
+        "author": f"<a href=\"https://example.org/\">{slug} team</a>",
+        "requires": "5.0",
+        "tested": "6.4",
+        "requires_php": "7.4",
+        "rating": rng.randint(60, 100),
+        "num_ratings": rng.randint(0, 5000),
+        "active_installs": rng.choice((10, 100, 1000, 10000, 100000, 1000000)),
+        "downloaded": rng.randint(100, 10_000_000),
+        "last_updated": "2024-01-15 10:00am GMT",
+        "added": "2019-05-01",
+        "tags": {"forms": "forms", "upload": "upload"},
+        "sections": {"description": f"<p>{slug} description.</p>"},
+        "download_link": f"https://downloads.wordpress.org/plugin/{slug}.latest-stable.zip",
+    }
+
+
+def _listing(slugs: list[str]) -> str:
+    items = "\n".join(
+        f'<article class="plugin-card"><h3><a href="https://wordpress.org/plugins/{s}/">{s}</a></h3></article>'
+        for s in slugs
+    )
+    return f"<html><body><main>{items}</main></body></html>"
+
+
+def build_corpus(root: Path, count: int = 200, seed: int = 1234) -> Corpus:
+    """Write ``count`` plugins (and their listing/API documents) below ``root``."""
+    rng = random.Random(seed)
+    slugs = [f"bench-plugin-{i:05d}" for i in range(count)]
+    corpus = Corpus(Path(root), slugs, {"popular": slugs})
+    for slug in slugs:
+        path = corpus.zip_path(slug)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(_plugin_zip(slug, rng))
+        info = corpus.info_path(slug)
+        info.parent.mkdir(parents=True, exist_ok=True)
+        info.write_text(json.dumps(_info(slug, rng)), encoding="utf-8")
+    for category, members in corpus.categories.items():
+        for page, start in enumerate(range(0, len(members), PER_PAGE), start=1):
+            path = corpus.listing_path(category, page)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(_listing(members[start:start + PER_PAGE]), encoding="utf-8")
+    return corpus
@@ -0,0 +1,269 @@
+"""End-to-end and micro benchmarks against an offline corpus.
+
+A deterministic corpus of plugin ZIPs, listing pages and plugins-API JSON
+is generated and served by a local stand-in for the wordpress.org hosts.
+Results are written as JSON so runs can be compared across versions.
+
+Usage:
+    python -m benchmarks.run_suite [--plugins N] [--workers N] [--output FILE]
+                                   [--compare OLD.json] [--only NAME ...]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+import requests
+
+from wp_plugin_scanner.config import SLUG_RE
+from wp_plugin_scanner.downloader import RequestsDownloader, download_true_plugin_zips
+from wp_plugin_scanner.manager import AuditManager
+from wp_plugin_scanner.models import PluginResult, UploadMatch
+from wp_plugin_scanner.plugin_fetcher import PluginDetailFetcher
+from wp_plugin_scanner.plugin_lister import PluginLister
+from wp_plugin_scanner.reporter import CsvReporter, SqliteReporter
+from wp_plugin_scanner.scan_cache import ScanCache
+from wp_plugin_scanner.scanner import UploadScanner
+
+from .corpus import Corpus, build_corpus
+from .standin_server import StandInServer, route_session
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def _best_of(repeat: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_end_to_end(corpus: Corpus, base_url: str, workdir: Path, workers: int) -> dict:
+    """AuditManager.run over the whole corpus through the stand-in server."""
+    run_dir = workdir / "e2e"
+    run_dir.mkdir()
+    cwd = os.getcwd()
+    os.chdir(run_dir)  # AuditManager saves sources/zips relative to the cwd
+    try:
+        downloader = RequestsDownloader()
+        route_session(downloader.session, base_url, pool_size=workers)
+        manager = AuditManager(downloader, UploadScanner(), SqliteReporter(run_dir / "audit.db"),
+                               save_zip=True, max_workers=workers)
+        start = time.perf_counter()
+        manager.run(list(corpus.slugs), progress_cb=lambda msg: None)
+        seconds = time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+    snapshot = manager.metrics.snapshot()
+    return {
+        "value": round(len(corpus.slugs) / seconds, 3),
+        "unit": "slugs/s",
+        "seconds": round(seconds, 3),
+        "workers": workers,
+        "download_mb_per_s": round(corpus.total_zip_bytes() / seconds / 1e6, 3),
+        "stages": {name: {"p50": s["p50"], "p90": s["p90"]} for name, s in snapshot["stages"].items()},
+    }
+
+
+def bench_zip_export(corpus: Corpus, base_url: str, workdir: Path, workers: int) -> dict:
+    """download_true_plugin_zips for every corpus plugin flagged in the audit CSV."""
+    run_dir = workdir / "zip_export"
+    run_dir.mkdir()
+    (run_dir / "plugin_upload_audit.csv").write_text(
+        "slug,upload\n" + "".join(f"{slug},True\n" for slug in corpus.slugs), encoding="utf-8")
+    session = route_session(requests.Session(), base_url, pool_size=workers)
+    cwd = os.getcwd()
+    os.chdir(run_dir)  # CSV_PATH is relative to the cwd
+    try:
+        counts = download_true_plugin_zips(run_dir / "plugins", max_workers=workers, session=session,
+                                           progress_cb=lambda msg: None)
+    finally:
+        os.chdir(cwd)
+    return {
+        "value": round(counts["bytes_per_second"] / 1e6, 3),
+        "unit": "MB/s",
+        "seconds": counts["seconds"],
+        "zips_per_s": round(counts["downloaded"] / counts["seconds"], 1) if counts["seconds"] else None,
+        "failed": counts["failed"],
+    }
+
+
+def bench_scanner(corpus: Corpus, workdir: Path, repeat: int) -> dict:
+    """UploadScanner over every extracted corpus plugin."""
+    extracted = workdir / "extracted"
+    for slug in corpus.slugs:
+        with zipfile.ZipFile(corpus.zip_path(slug)) as zf:
+            zf.extractall(extracted)
+    dirs = [extracted / slug for slug in corpus.slugs]
+    scanner = UploadScanner()
+    total_bytes = sum(f.stat().st_size for d in dirs for f in scanner.gather_files(d))
+    files = sum(scanner.scan_for_upload_features(d)[1] for d in dirs)
+    seconds = _best_of(repeat, lambda: [scanner.scan_for_upload_features(d) for d in dirs])
+    cached = UploadScanner(cache=ScanCache(workdir / "scan_cache.db"))
+    cold = _best_of(1, lambda: [cached.scan_for_upload_features(d) for d in dirs])
+    warm = _best_of(repeat, lambda: [cached.scan_for_upload_features(d) for d in dirs])
+    return {
+        "value": round(total_bytes / seconds / 1e6, 3),
+        "unit": "MB/s",
+        "seconds": round(seconds, 4),
+        "files_per_s": round(files / seconds, 1),
+        "cache_cold_mb_per_s": round(total_bytes / cold / 1e6, 3),
+        "cache_warm_mb_per_s": round(total_bytes / warm / 1e6, 3),
+    }
+
+
+def _synthetic_results(count: int) -> list[PluginResult]:
+    match = UploadMatch("includes/upload.php", 42, "wp_handle_upload($_FILES['f']);", "wp_handle_upload")
+    return [
+        PluginResult(f"bench-result-{i:05d}", "True" if i % 5 == 0 else "False",
+                     upload_matches=[match, match] if i % 5 == 0 else [], files_scanned=10)
+        for i in range(count)
+    ]
+
+
+def bench_reporters(workdir: Path, count: int) -> dict:
+    """Per-result add_result against one add_results batch, for CSV and SQLite."""
+    results = _synthetic_results(count)
+    out = {}
+    for name, factory in (
+        ("csv", lambda tag: CsvReporter(workdir / f"report-{tag}.csv")),
+        ("sqlite", lambda tag: SqliteReporter(workdir / f"report-{tag}.db")),
+    ):
+        reporter = factory("single")
+        start = time.perf_counter()
+        for result in results:
+            reporter.add_result(result)
+        single = time.perf_counter() - start
+        reporter = factory("batch")
+        start = time.perf_counter()
+        reporter.add_results(results)
+        batch = time.perf_counter() - start
+        out[f"reporter_{name}"] = {
+            "value": round(count / single, 1),
+            "unit": "results/s",
+            "batch_results_per_s": round(count / batch, 1),
+            "results": count,
+        }
+    return out
+
+
+def bench_lister(corpus: Corpus, base_url: str, repeat: int) -> dict:
+    """PluginLister over the stand-in listing pages, plus the bare slug regex."""
+    session = route_session(requests.Session(), base_url)
+    lister = PluginLister(session)
+    start = time.perf_counter()
+    slugs = list(lister.iter_by_category("popular", interval=0))
+    seconds = time.perf_counter() - start
+    pages = [p.read_text(encoding="utf-8") for p in sorted(corpus.listing_path("popular", 1).parent.glob("*.html"))]
+    parse = _best_of(repeat, lambda: [SLUG_RE.findall(html) for html in pages])
+    return {
+        "value": round(len(slugs) / seconds, 1),
+        "unit": "slugs/s",
+        "slugs": len(slugs),
+        "pages": len(pages),
+        "parse_pages_per_s": round(len(pages) / parse, 1) if parse else None,
+    }
+
+
+def bench_plugin_info(corpus: Corpus, base_url: str, limit: int = 100) -> dict:
+    """PluginDetailFetcher API lookups served by the stand-in."""
+    fetcher = PluginDetailFetcher(route_session(requests.Session(), base_url))
+    slugs = corpus.slugs[:limit]
+    start = time.perf_counter()
+    found = sum(1 for slug in slugs if fetcher._fetch_from_api(slug) is not None)
+    seconds = time.perf_counter() - start
+    return {"value": round(len(slugs) / seconds, 1), "unit": "lookups/s", "found": found}
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def run_suite(plugins: int = 200, workers: int = 8, seed: int = 1234, repeat: int = 3,
+              only: tuple = ()) -> dict:
+    """Build the corpus, run the selected benchmarks and return the report."""
+    workdir = Path(tempfile.mkdtemp(prefix="wp-bench-"))
+    wanted = lambda name: not only or name in only
+    try:
+        corpus = build_corpus(workdir / "corpus", count=plugins, seed=seed)
+        results = {}
+        with StandInServer(corpus) as server:
+            if wanted("end_to_end"):
+                results["end_to_end"] = bench_end_to_end(corpus, server.base_url, workdir, workers)
+            if wanted("zip_export"):
+                results["zip_export"] = bench_zip_export(corpus, server.base_url, workdir, workers)
+            if wanted("scanner"):
+                results["scanner"] = bench_scanner(corpus, workdir, repeat)
+            if wanted("reporters"):
+                results.update(bench_reporters(workdir, min(plugins, 500)))
+            if wanted("lister"):
+                results["lister"] = bench_lister(corpus, server.base_url, repeat)
+            if wanted("plugin_info"):
+                results["plugin_info"] = bench_plugin_info(corpus, server.base_url)
+        return {
+            "revision": _git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "corpus": {"plugins": plugins, "seed": seed, "zip_bytes": corpus.total_zip_bytes()},
+            "results": results,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def compare(old: dict, new: dict) -> list[str]:
+    """One line per benchmark with the change of its headline value."""
+    lines = []
+    for name, result in new["results"].items():
+        before = old.get("results", {}).get(name, {}).get("value")
+        if before:
+            lines.append(f"{name:<16} {before:>10} -> {result['value']:>10} {result['unit']:<10} "
+                         f"x{result['value'] / before:.2f}")
+        else:
+            lines.append(f"{name:<16} {'-':>10} -> {result['value']:>10} {result['unit']}")
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plugins", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", default=())
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    report = run_suite(args.plugins, args.workers, args.seed, args.repeat, tuple(args.only))
+    output = args.output or RESULTS_DIR / f"bench-{report['revision']}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    for name, result in report["results"].items():
+        print(f"{name:<16} {result['value']:>10} {result['unit']}")
+    if args.compare:
+        print(f"\ncompared with {args.compare}:")
+        for line in compare(json.loads(args.compare.read_text(encoding="utf-8")), report):
+            print(line)
+    print(f"\n[i] results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+"""Local HTTP stand-in for downloads.wordpress.org, api.wordpress.org and
+the wordpress.org listing pages, serving a ``Corpus``.
+
+``route_session`` mounts an adapter on a ``requests.Session`` that sends
+requests for the real hostnames to the stand-in, so the code under test
+runs unchanged with its production URLs.
+"""
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .corpus import Corpus
+
+WORDPRESS_HOSTS = ("downloads.wordpress.org", "api.wordpress.org", "wordpress.org")
+
+_ROUTES = (
+    (re.compile(r"^/plugin/([a-z0-9\-]+)\.latest-stable\.zip$"), "zip", "application/zip"),
+    (re.compile(r"^/plugins/info/1\.0/([a-z0-9\-]+)\.json$"), "info", "application/json"),
+    (re.compile(r"^/plugins/browse/([a-z0-9\-]+)/page/(\d+)/$"), "listing", "text/html; charset=utf-8"),
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    corpus: Corpus  # set on the per-server subclass
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        for pattern, kind, content_type in _ROUTES:
+            m = pattern.match(path)
+            if not m:
+                continue
+            if kind == "zip":
+                target = self.corpus.zip_path(m.group(1))
+            elif kind == "info":
+                target = self.corpus.info_path(m.group(1))
+            else:
+                target = self.corpus.listing_path(m.group(1), int(m.group(2)))
+            if target.exists():
+                body = target.read_bytes()
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            break
+        self.send_error(404)
+
+    def log_message(self, format, *args):  # keep benchmark output clean
+        pass
+
+
+class StandInServer:
+    """Threaded HTTP server on 127.0.0.1 serving one corpus."""
+
+    def __init__(self, corpus: Corpus, host: str = "127.0.0.1", port: int = 0):
+        handler = type("CorpusHandler", (_Handler,), {"corpus": corpus})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+class StandInAdapter(HTTPAdapter):
+    """Rewrites wordpress.org URLs to the stand-in before sending."""
+
+    def __init__(self, base_url: str, **kwargs):
+        self.base_url = base_url.rstrip("/")
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = f"{self.base_url}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+        return super().send(request, **kwargs)
+
+
+def route_session(session: requests.Session, base_url: str, pool_size: int = 16) -> requests.Session:
+    adapter = StandInAdapter(base_url, pool_connections=pool_size, pool_maxsize=pool_size)
+    for host in WORDPRESS_HOSTS:
+        session.mount(f"https://{host}/", adapter)
+    return session
@@ -1,18 +1,30 @@
 """Command line interface for the WP plugin scanner."""
 from __future__ import annotations
 
+import itertools
+import os
 import sys
-from typing import List
+from typing import Iterable, List
 from pathlib import Path
 
-from wp_plugin_scanner.downloader import RequestsDownloader, download_true_plugin_zips
+from wp_plugin_scanner.downloader import LocalZipDownloader, RequestsDownloader, download_true_plugin_zips
 from wp_plugin_scanner.scanner import UploadScanner
+from wp_plugin_scanner.scan_cache import ScanCache
+from wp_plugin_scanner.archive_memo import ArchiveMemo
+from wp_plugin_scanner.source_store import SourceStore
 from wp_plugin_scanner.reporter import CsvReporter, SqliteReporter
 from wp_plugin_scanner.searcher import PluginSearcher
+from wp_plugin_scanner.plugin_lister import PluginLister
 from wp_plugin_scanner.manager import AuditManager
 from wp_plugin_scanner.local_scanner import scan_local_plugin
-from wp_plugin_scanner.cleanup import clean_saved_plugins_only_true, clean_saved_plugins
+from wp_plugin_scanner.cleanup import (
+    QUOTA_POLICIES, DiskQuota, clean_saved_plugins_only_true, clean_saved_plugins, parse_size,
+)
 from wp_plugin_scanner.extract import scan_all_true_plugins
+from wp_plugin_scanner.path_rules import VENDORED_RULES, PathRules
+from wp_plugin_scanner.config import MATCH_CONTEXT_LINES
+from wp_plugin_scanner.job_journal import JobJournal
+from wp_plugin_scanner import endpoints
 
 try:
     import tkinter as tk  # type: ignore
@@ -67,6 +79,182 @@ def main(argv: list[str] | None = None) -> int:
         save_flag = True
         argv.remove("--save")
 
+    resume_job = None
+    if "--resume" in argv:
+        idx = argv.index("--resume")
+        if idx + 1 < len(argv):
+            resume_job = argv.pop(idx + 1)
+        argv.pop(idx)
+
+    if "--jobs" in argv:
+        argv.remove("--jobs")
+        journal = JobJournal()
+        for job in journal.list_jobs():
+            state = "finished" if job["finished"] else "incomplete"
+            print(f"{job['job_id']}  {job['total']} slugs  {state}  {journal.summary(job['job_id'])}")
+        return 0
+
+    # local mirror for all wordpress.org traffic (defaults come from WP_SCANNER_MIRROR_*)
+    mirror = endpoints.settings()
+    mirror_url, mirror_dir, fallback = mirror.url, mirror.directory, mirror.fallback
+    if "--mirror" in argv:
+        idx = argv.index("--mirror")
+        if idx + 1 < len(argv):
+            mirror_url = argv.pop(idx + 1)
+        argv.pop(idx)
+    if "--mirror-dir" in argv:
+        idx = argv.index("--mirror-dir")
+        if idx + 1 < len(argv):
+            mirror_dir = Path(argv.pop(idx + 1))
+        argv.pop(idx)
+    if "--no-upstream" in argv:
+        argv.remove("--no-upstream")
+        fallback = False
+    endpoints.configure(mirror_url, mirror_dir, fallback)
+
+    local_zips = None
+    if "--local-zips" in argv:
+        idx = argv.index("--local-zips")
+        if idx + 1 < len(argv):
+            local_zips = argv.pop(idx + 1)
+        argv.pop(idx)
+
+    force = "--force" in argv
+    if force:
+        argv.remove("--force")
+
+    use_scan_cache = "--no-scan-cache" not in argv
+    if not use_scan_cache:
+        argv.remove("--no-scan-cache")
+
+    # packed, deduplicated source storage instead of the saved_sources tree
+    source_store = None
+    if "--source-store" in argv:
+        argv.remove("--source-store")
+        source_store = SourceStore()
+
+    export_sources = None
+    if "--export-sources" in argv:
+        idx = argv.index("--export-sources")
+        if idx + 1 >= len(argv):
+            print("[!] --export-sources needs a destination directory")
+            return 1
+        export_sources = Path(argv.pop(idx + 1))
+        argv.pop(idx)
+        store = source_store or SourceStore()
+        slugs_to_export = argv or store.slugs()
+        for slug in slugs_to_export:
+            store.export(slug, export_sources)
+        print(f"[i] Exported {len(slugs_to_export)} plugins to {export_sources}")
+        return 0
+
+    disk_quota = None
+    if "--disk-quota" in argv:
+        idx = argv.index("--disk-quota")
+        if idx + 1 < len(argv):
+            try:
+                disk_quota = parse_size(argv.pop(idx + 1))
+            except ValueError as e:
+                print(f"[!] --disk-quota: {e}")
+                return 1
+        argv.pop(idx)
+
+    quota_policy = "lru"
+    if "--quota-policy" in argv:
+        idx = argv.index("--quota-policy")
+        if idx + 1 < len(argv):
+            quota_policy = argv.pop(idx + 1)
+        argv.pop(idx)
+        if quota_policy not in QUOTA_POLICIES:
+            print(f"[!] --quota-policy must be one of: {', '.join(QUOTA_POLICIES)}")
+            return 1
+
+    # gitignore-style rules for the files that are scanned
+    ignore_patterns: list[str] = []
+    if "--skip-vendored" in argv:
+        argv.remove("--skip-vendored")
+        ignore_patterns.extend(VENDORED_RULES)
+    if "--ignore-file" in argv:
+        idx = argv.index("--ignore-file")
+        if idx + 1 < len(argv):
+            try:
+                ignore_patterns.extend(Path(argv.pop(idx + 1)).read_text(encoding="utf-8").splitlines())
+            except OSError as e:
+                print(f"[!] --ignore-file: {e}")
+                return 1
+        argv.pop(idx)
+    while "--ignore" in argv:
+        idx = argv.index("--ignore")
+        if idx + 1 < len(argv):
+            ignore_patterns.append(argv.pop(idx + 1))
+        argv.pop(idx)
+
+    max_file_size = None
+    if "--max-file-size" in argv:
+        idx = argv.index("--max-file-size")
+        if idx + 1 < len(argv):
+            try:
+                max_file_size = parse_size(argv.pop(idx + 1))
+            except ValueError as e:
+                print(f"[!] --max-file-size: {e}")
+                return 1
+        argv.pop(idx)
+    path_rules = PathRules(ignore_patterns, max_file_size) or None
+
+    # lines stored before/after each match in the audit results
+    context_lines = MATCH_CONTEXT_LINES
+    if "--context-lines" in argv:
+        idx = argv.index("--context-lines")
+        if idx + 1 < len(argv):
+            try:
+                context_lines = int(argv.pop(idx + 1))
+            except ValueError:
+                print("[!] --context-lines needs a number")
+                return 1
+        argv.pop(idx)
+
+    use_archive_memo = "--no-archive-memo" not in argv
+    if not use_archive_memo:
+        argv.remove("--no-archive-memo")
+
+    if "--merge-memo" in argv:
+        idx = argv.index("--merge-memo")
+        if idx + 1 >= len(argv):
+            print("[!] --merge-memo needs a memo file")
+            return 1
+        other = Path(argv[idx + 1])
+        added = ArchiveMemo().merge(other)
+        print(f"[i] Merged {added} archive results from {other}")
+        return 0
+
+    sync_dir = None
+    if "--sync-mirror" in argv:
+        idx = argv.index("--sync-mirror")
+        if idx + 1 < len(argv):
+            sync_dir = Path(argv.pop(idx + 1))
+        argv.pop(idx)
+
+    metrics_json = None
+    if "--metrics-json" in argv:
+        idx = argv.index("--metrics-json")
+        if idx + 1 < len(argv):
+            metrics_json = Path(argv.pop(idx + 1))
+        argv.pop(idx)
+
+    prometheus_textfile = None
+    if "--prometheus" in argv:
+        idx = argv.index("--prometheus")
+        if idx + 1 < len(argv):
+            prometheus_textfile = Path(argv.pop(idx + 1))
+        argv.pop(idx)
+
+    category = None
+    if "--category" in argv:
+        idx = argv.index("--category")
+        if idx + 1 < len(argv):
+            category = argv.pop(idx + 1)
+        argv.pop(idx)
+
     search_kw = None
     if "--search" in argv:
         idx = argv.index("--search")
@@ -84,7 +272,7 @@ def main(argv: list[str] | None = None) -> int:
         idx = argv.index("--scan-local")
         plugin_path = Path(argv[idx + 1])
         is_scan_local = True
-        results = scan_local_plugin(plugin_path)
+        results = scan_local_plugin(plugin_path, path_rules)
         for path, lineno, content in results:
             print(f"{path}:{lineno}: {content}")
         return 0
@@ -94,9 +282,28 @@ def main(argv: list[str] | None = None) -> int:
         slugs_from_kw = PluginSearcher().search(search_kw)
         explicit_slugs.extend(slugs_from_kw)
         print(f"[i] Added {len(slugs_from_kw)} slugs from keyword '{search_kw}'.")
-        
 
-    if explicit_slugs:
+    slugs: Iterable[str] = explicit_slugs
+    if category:
+        # stream the category listing straight into the pipeline
+        slugs = itertools.chain(explicit_slugs, PluginLister().iter_by_category(category))
+
+    if sync_dir is not None:
+        counts = endpoints.sync_mirror(endpoints.plugin_urls(slugs), sync_dir)
+        print(f"[i] Mirror {sync_dir}: {counts}")
+        return 0
+
+    downloader = RequestsDownloader()
+    workers = {}
+    if local_zips:
+        # offline audit: no network, extraction and scanning are the only work
+        downloader = LocalZipDownloader(local_zips)
+        print(f"[i] {len(downloader.paths)} local ZIPs in {local_zips}")
+        if not explicit_slugs and not category:
+            slugs = downloader.slugs()
+        workers = {"max_workers": os.cpu_count() or 4, "scan_workers": os.cpu_count() or 4, "save_zip": False}
+
+    if explicit_slugs or resume_job or category or local_zips:
         # Select reporter based on format
         if db_format == "sqlite":
             reporter = SqliteReporter()
@@ -104,24 +311,37 @@ def main(argv: list[str] | None = None) -> int:
             reporter = CsvReporter()
             
         manager = AuditManager(
-            RequestsDownloader(),
-            UploadScanner(),
+            downloader,
+            UploadScanner(cache=ScanCache() if use_scan_cache else None, rules=path_rules,
+                          context_lines=context_lines),
             reporter,
+            archive_memo=ArchiveMemo() if use_archive_memo else None,
+            source_store=source_store,
+            disk_quota=DiskQuota(disk_quota, policy=quota_policy, reporter=reporter, store=source_store)
+            if disk_quota else None,
             save_sources=save_flag,
+            skip_done=not force,
+            journal=JobJournal(),
+            metrics_json=metrics_json,
+            prometheus_textfile=prometheus_textfile,
+            **workers,
         )
-        manager.run(explicit_slugs)
+        if resume_job:
+            manager.resume(resume_job)
+        else:
+            manager.run(slugs)
         
         if not is_scan_local:
-            clean_saved_plugins_only_true()
+            clean_saved_plugins_only_true(source_store, reporter)
             
         if do_extract_matches:
-            scan_all_true_plugins()
+            scan_all_true_plugins(source_store, reporter, rules=path_rules)
             
         if do_download_true_zips:
             download_true_plugin_zips(Path("plugins"))
                 
         if clean_plugins:
-            clean_saved_plugins()
+            clean_saved_plugins(source_store)
 
             
     else:
@@ -129,17 +349,7 @@ def main(argv: list[str] | None = None) -> int:
             print("GUI unavailable; supply slugs or --search <kw>.")
             return 1
         AuditGUI().mainloop()
-        return 0
-    
-    if do_extract_matches:
-        scan_all_true_plugins()
-
-    if do_download_true_zips:
-        download_true_plugin_zips(Path("plugins"))
-        
-    if clean_plugins:
-        clean_saved_plugins()
-
+    return 0
 
 
 if __name__ == "__main__":
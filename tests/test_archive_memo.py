@@ -0,0 +1,52 @@
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from wp_plugin_scanner.archive_memo import ArchiveMemo
+from wp_plugin_scanner.models import PluginResult, UploadMatch
+
+
+class TestArchiveMemo(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_round_trip_and_merge(self):
+        memo = ArchiveMemo(self.tmp / "a.db")
+        match = UploadMatch("inc/up.php", 3, "wp_handle_upload($f);", "wp_handle_upload")
+        memo.put("ab" * 32, "rules-1", PluginResult("orig", "True", upload_matches=[match], files_scanned=7))
+        memo.put("cd" * 32, "rules-1", PluginResult("broken", "error:Broken ZIP"))
+
+        hit = memo.get("ab" * 32, "rules-1", "renamed")
+        self.assertEqual((hit.slug, hit.status, hit.files_scanned), ("renamed", "True", 7))
+        self.assertEqual(hit.upload_matches, [match])
+        self.assertIsNone(memo.get("ab" * 32, "rules-2", "renamed"))
+        self.assertIsNone(memo.get("cd" * 32, "rules-1", "broken"))  # errors are not memoized
+        self.assertEqual((memo.hits, memo.misses), (1, 2))
+
+        other = ArchiveMemo(self.tmp / "b.db")
+        other.put("ef" * 32, "rules-1", PluginResult("x", "False", files_scanned=1))
+        self.assertEqual(other.merge(self.tmp / "a.db"), 1)
+        self.assertEqual(other.merge(self.tmp / "a.db"), 0)
+        self.assertEqual(len(other), 2)
+
+    def test_counters_are_thread_safe(self):
+        memo = ArchiveMemo(self.tmp / "a.db")
+        memo.put("ab" * 32, "rules-1", PluginResult("orig", "False"))
+        workers = [
+            threading.Thread(target=lambda: [memo.get(sha, "rules-1", "x") for _ in range(25) for sha in ("ab" * 32, "cd" * 32)])
+            for _ in range(8)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual((memo.hits, memo.misses), (200, 200))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import requests
+
+from benchmarks.corpus import build_corpus
+from benchmarks.standin_server import StandInServer, route_session
+from wp_plugin_scanner.plugin_lister import PluginLister
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_corpus_is_reproducible(self):
+        first = build_corpus(self.tmp / "a", count=5, seed=7)
+        second = build_corpus(self.tmp / "b", count=5, seed=7)
+        for slug in first.slugs:
+            self.assertEqual(first.zip_path(slug).read_bytes(), second.zip_path(slug).read_bytes())
+
+    def test_standin_serves_wordpress_urls(self):
+        corpus = build_corpus(self.tmp / "corpus", count=25)
+        with StandInServer(corpus) as server:
+            session = route_session(requests.Session(), server.base_url)
+            res = session.get("https://downloads.wordpress.org/plugin/bench-plugin-00003.latest-stable.zip")
+            self.assertEqual(res.content, corpus.zip_path("bench-plugin-00003").read_bytes())
+            info = session.get("https://api.wordpress.org/plugins/info/1.0/bench-plugin-00001.json").json()
+            self.assertEqual(info["slug"], "bench-plugin-00001")
+            self.assertEqual(session.get("https://api.wordpress.org/plugins/info/1.0/missing.json").status_code, 404)
+            slugs = list(PluginLister(session).iter_by_category("popular", interval=0))
+        self.assertEqual(slugs, corpus.slugs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from wp_plugin_scanner.cleanup import DiskQuota, clean_saved_plugins_only_true, flagged_slugs, parse_size
+from wp_plugin_scanner.models import PluginResult
+from wp_plugin_scanner.reporter import CsvReporter, SqliteReporter
+
+
+class TestCleanup(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp)  # SAVE_SOURCE / SAVE_ZIP / CSV_PATH are relative
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _save(self, slug, size, age):
+        root = Path("saved_sources") / slug
+        root.mkdir(parents=True)
+        (root / "main.php").write_bytes(b"x" * size)
+        zip_path = Path("saved_zips") / f"{slug}.zip"
+        zip_path.parent.mkdir(exist_ok=True)
+        zip_path.write_bytes(b"z" * size)
+        stamp = time.time() - age
+        for path in (root / "main.php", root, zip_path):
+            os.utime(path, (stamp, stamp))
+
+    def test_only_flagged_sources_survive(self):
+        reporter = SqliteReporter(self.tmp / "audit.db")
+        reporter.add_results([PluginResult("keep", "True"), PluginResult("drop", "False"),
+                              PluginResult("broken", "error:x")])
+        for slug in ("keep", "drop", "broken", "unknown"):
+            self._save(slug, 10, 0)
+        clean_saved_plugins_only_true(reporter=reporter)
+        self.assertEqual(sorted(os.listdir("saved_sources")), ["keep"])
+
+    def test_flagged_slugs_from_bool_csv(self):
+        CsvReporter().add_results([PluginResult("a", "True"), PluginResult("b", "False")])
+        self.assertEqual(flagged_slugs(), {"a"})
+        self.assertEqual(CsvReporter().flagged_slugs(), {"a"})
+
+    def test_quota_evicts_unflagged_then_least_recent(self):
+        reporter = SqliteReporter(self.tmp / "audit.db")
+        reporter.add_results([PluginResult("old-flagged", "True")])
+        self._save("old-flagged", 1000, 300)
+        self._save("new-plain", 1000, 10)
+        self._save("old-plain", 1000, 200)
+        self._save("recent", 1000, 0)
+        quota = DiskQuota(parse_size("5K"), reporter=reporter)
+        quota.charge(1)  # first charge measures: 8000 bytes > 5120
+        self.assertEqual(sorted(os.listdir("saved_sources")), ["old-flagged", "recent"])
+        self.assertFalse(Path("saved_zips/old-plain.zip").exists())
+        self.assertEqual(quota.enforce(), ([], 0))
+
+    def test_quota_oldest_audit_policy(self):
+        reporter = SqliteReporter(self.tmp / "audit.db")
+        old, new = PluginResult("audited-old", "False"), PluginResult("audited-new", "False")
+        old.timestamp -= 3600
+        reporter.add_results([old, new])
+        for slug in ("audited-old", "audited-new", "pending"):
+            self._save(slug, 1000, 0)
+        evicted, freed = DiskQuota(3000, policy="oldest-audit", reporter=reporter).enforce()
+        self.assertEqual((evicted, freed), (["audited-old", "audited-new"], 4000))
+
+
+if __name__ == "__main__":
+    unittest.main()
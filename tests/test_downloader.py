@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import requests
+
+from benchmarks.corpus import build_corpus
+from benchmarks.standin_server import StandInServer, route_session
+from wp_plugin_scanner import endpoints
+from wp_plugin_scanner.downloader import download_true_plugin_zips
+
+
+class TestZipExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp)  # CSV_PATH is relative to the cwd
+        self.corpus = build_corpus(self.tmp / "corpus", count=6)
+        # every value is True/False, so pandas reads the column as bool
+        rows = [f"{slug},{i % 2 == 0}" for i, slug in enumerate(self.corpus.slugs)]
+        rows.append("missing-plugin,True")
+        Path("plugin_upload_audit.csv").write_text("slug,upload\n" + "\n".join(rows) + "\n")
+
+    def tearDown(self):
+        endpoints.configure()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_parallel_export_is_atomic_and_resumable(self):
+        out = self.tmp / "plugins"
+        flagged = self.corpus.slugs[::2]
+        with StandInServer(self.corpus) as server:
+            session = route_session(requests.Session(), server.base_url)
+            counts = download_true_plugin_zips(out, max_workers=4, session=session, progress_cb=lambda msg: None)
+            self.assertEqual((counts["downloaded"], counts["existing"], counts["failed"]), (3, 0, 1))
+            self.assertGreater(counts["bytes_per_second"], 0)
+            for slug in flagged:
+                self.assertEqual((out / f"{slug}.zip").read_bytes(), self.corpus.zip_path(slug).read_bytes())
+            self.assertEqual(list(out.glob("*.part")), [])
+
+            # a truncated file from an interrupted run is fetched again
+            truncated = out / f"{flagged[0]}.zip"
+            truncated.write_bytes(truncated.read_bytes()[:100])
+            counts = download_true_plugin_zips(out, max_workers=4, session=session, progress_cb=lambda msg: None)
+            self.assertEqual((counts["downloaded"], counts["existing"]), (1, 2))
+            self.assertEqual(truncated.read_bytes(), self.corpus.zip_path(flagged[0]).read_bytes())
+
+    def test_export_from_directory_mirror(self):
+        flagged = self.corpus.slugs[::2]
+        with StandInServer(self.corpus) as upstream:
+            endpoints.sync_mirror([endpoints.zip_url(slug) for slug in flagged], self.tmp / "mirror",
+                                  session=route_session(requests.Session(), upstream.base_url),
+                                  progress_cb=lambda msg: None)
+        endpoints.configure(directory=self.tmp / "mirror", fallback=False)
+        out = self.tmp / "plugins"
+        # streamed downloads are served from the mirror files; the unsynced slug is a 404
+        counts = download_true_plugin_zips(out, max_workers=2, progress_cb=lambda msg: None)
+        self.assertEqual((counts["downloaded"], counts["failed"]), (3, 1))
+        for slug in flagged:
+            self.assertEqual((out / f"{slug}.zip").read_bytes(), self.corpus.zip_path(slug).read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
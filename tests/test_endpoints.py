@@ -0,0 +1,69 @@
+import functools
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+from benchmarks.corpus import build_corpus
+from benchmarks.standin_server import StandInServer, route_session
+from wp_plugin_scanner import endpoints
+from wp_plugin_scanner.downloader import RequestsDownloader
+
+
+class TestMirror(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.corpus = build_corpus(self.tmp / "corpus", count=3)
+
+    def tearDown(self):
+        endpoints.configure()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_mirror_path_layout(self):
+        self.assertEqual(endpoints.mirror_path(endpoints.zip_url("akismet")),
+                         "downloads.wordpress.org/plugin/akismet.latest-stable.zip")
+        self.assertEqual(endpoints.mirror_path(endpoints.browse_url("popular", 2)),
+                         "wordpress.org/plugins/browse/popular/page/2/index.html")
+        self.assertIsNone(endpoints.mirror_path("https://example.org/x"))
+
+    def test_sync_then_scan_from_directory_without_upstream(self):
+        slug = self.corpus.slugs[0]
+        with StandInServer(self.corpus) as upstream:
+            counts = endpoints.sync_mirror(endpoints.plugin_urls([slug]), self.tmp / "mirror",
+                                           session=route_session(requests.Session(), upstream.base_url),
+                                           progress_cb=lambda msg: None)
+        self.assertEqual(counts, {"fetched": 2, "skipped": 0, "failed": 0})
+
+        endpoints.configure(directory=self.tmp / "mirror", fallback=False)
+        downloader = RequestsDownloader(retries=0)
+        plugin_dir = downloader.download(slug)
+        self.assertTrue(any(plugin_dir.iterdir()))
+        shutil.rmtree(plugin_dir.parent, ignore_errors=True)
+        with self.assertRaises(RuntimeError):
+            downloader.download(self.corpus.slugs[1])  # not synced, upstream disabled
+
+    def test_mirror_server(self):
+        slug = self.corpus.slugs[0]
+        mirror_root = self.tmp / "served"
+        with StandInServer(self.corpus) as upstream:
+            endpoints.sync_mirror([endpoints.zip_url(slug)], mirror_root,
+                                  session=route_session(requests.Session(), upstream.base_url),
+                                  progress_cb=lambda msg: None)
+        handler = functools.partial(SimpleHTTPRequestHandler, directory=str(mirror_root))
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            endpoints.configure(url=f"http://127.0.0.1:{server.server_address[1]}", fallback=False)
+            session = endpoints.configure_session(requests.Session())
+            self.assertEqual(session.get(endpoints.zip_url(slug)).content, self.corpus.zip_path(slug).read_bytes())
+            self.assertEqual(session.get(endpoints.zip_url(self.corpus.slugs[1])).status_code, 404)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == "__main__":
+    unittest.main()
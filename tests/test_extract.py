@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from wp_plugin_scanner.extract import ExtractionStore, scan_all_true_plugins
+from wp_plugin_scanner.models import PluginResult
+from wp_plugin_scanner.reporter import SqliteReporter
+from wp_plugin_scanner.source_store import SourceStore
+
+
+class TestExtract(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp)  # SAVE_SOURCE is relative
+        self.reporter = SqliteReporter(self.tmp / "audit.db")
+        self.reporter.add_results([PluginResult("a", "True"), PluginResult("b", "True"),
+                                   PluginResult("c", "False"), PluginResult("gone", "True")])
+        for slug in ("a", "b", "c"):
+            root = Path("saved_sources") / slug / "inc"
+            root.mkdir(parents=True)
+            (root / "up.php").write_text(f"<?php\n// {slug}\nwp_handle_upload($f);\n")
+        self.output = ExtractionStore(self.tmp / "matches.db")
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _run(self, **kwargs):
+        return scan_all_true_plugins(reporter=self.reporter, output=self.output, max_workers=2, **kwargs)
+
+    def test_incremental_extraction(self):
+        self.assertEqual(self._run(), {"extracted": 2, "unchanged": 0, "missing": 1, "failed": 0})
+        self.assertEqual(self.output.matches("a"), [("inc/up.php", 3, "wp_handle_upload($f);")])
+        self.assertEqual(self.output.slugs(), ["a", "b"])
+
+        self.assertEqual(self._run(), {"extracted": 0, "unchanged": 2, "missing": 1, "failed": 0})
+        (Path("saved_sources/b/inc/more.js")).write_text("x = $_FILES;\n")
+        self.assertEqual(self._run(), {"extracted": 1, "unchanged": 1, "missing": 1, "failed": 0})
+        self.assertEqual(len(self.output.matches("b")), 2)
+        self.assertEqual(self._run(force=True)["extracted"], 2)
+
+        # slugs that are no longer flagged drop out
+        self.reporter.add_results([PluginResult("a", "False")])
+        self._run()
+        self.assertEqual(self.output.slugs(), ["b"])
+
+    def test_extraction_from_source_store(self):
+        store = SourceStore(self.tmp / "store")
+        store.put_plugin("a", Path("saved_sources/a"), list(Path("saved_sources/a").rglob("*.php")))
+        counts = scan_all_true_plugins(store, self.reporter, output=self.output, max_workers=2)
+        self.assertEqual(counts, {"extracted": 1, "unchanged": 0, "missing": 2, "failed": 0})
+        self.assertEqual(self.output.matches("a"), [("inc/up.php", 3, "wp_handle_upload($f);")])
+        counts = scan_all_true_plugins(store, self.reporter, output=self.output, max_workers=2)
+        self.assertEqual(counts["unchanged"], 1)
+
+        # unreadable sources count as failed, not as missing
+        for pack in store.root.glob("pack-*.pack"):
+            pack.unlink()
+        counts = scan_all_true_plugins(store, self.reporter, output=self.output, max_workers=2, force=True)
+        self.assertEqual((counts["failed"], counts["missing"]), (1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
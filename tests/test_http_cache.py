@@ -0,0 +1,119 @@
+import unittest
+from unittest import mock
+from pathlib import Path
+import tempfile
+import shutil
+import threading
+
+from wp_plugin_scanner.http_cache import HttpResponseCache
+from wp_plugin_scanner.plugin_fetcher import PluginDetailFetcher
+
+
+def _response(status=200, content=b"{}", headers=None):
+    r = mock.Mock()
+    r.status_code = status
+    r.content = content
+    r.headers = headers or {}
+    return r
+
+
+class TestHttpResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.cache = HttpResponseCache(self.tmp / "cache.db", ttl=60)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_fresh_entry_skips_network(self):
+        session = mock.Mock()
+        session.get.return_value = _response(content=b'{"name": "Foo"}')
+        self.cache.get(session, "http://x/foo", timeout=1)
+        cached = self.cache.get(session, "http://x/foo", timeout=1)
+        self.assertEqual(session.get.call_count, 1)
+        self.assertEqual(cached.json(), {"name": "Foo"})
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_stale_entry_revalidates_with_etag(self):
+        session = mock.Mock()
+        session.get.return_value = _response(content=b"body", headers={"ETag": '"abc"'})
+        self.cache.get(session, "http://x/foo", timeout=1, ttl=0)
+        session.get.return_value = _response(status=304, content=b"")
+        r = self.cache.get(session, "http://x/foo", timeout=1)
+        self.assertEqual(r.content, b"body")
+        self.assertEqual(session.get.call_args.kwargs["headers"], {"If-None-Match": '"abc"'})
+        self.assertEqual(self.cache.revalidated, 1)
+
+    def test_revalidation_takes_new_validators_and_max_age(self):
+        session = mock.Mock()
+        session.get.return_value = _response(content=b"body", headers={"ETag": '"v1"', "Cache-Control": "max-age=0"})
+        self.cache.get(session, "http://x/foo", timeout=1)
+        session.get.return_value = _response(status=304, content=b"", headers={"ETag": '"v2"', "Cache-Control": "max-age=0"})
+        r = self.cache.get(session, "http://x/foo", timeout=1)
+        self.assertEqual((r.content, r.headers["ETag"]), (b"body", '"v2"'))
+        session.get.return_value = _response(status=304, content=b"", headers={"Cache-Control": "max-age=600"})
+        self.cache.get(session, "http://x/foo", timeout=1)
+        self.assertEqual(session.get.call_args.kwargs["headers"], {"If-None-Match": '"v2"'})
+        # max-age=600 from the last 304 keeps the entry fresh
+        self.cache.get(session, "http://x/foo", timeout=1)
+        self.assertEqual(session.get.call_count, 3)
+        self.assertEqual(self.cache.revalidated, 2)
+
+    def test_cache_control_no_store_and_no_cache(self):
+        session = mock.Mock()
+        session.get.return_value = _response(content=b"secret", headers={"Cache-Control": "no-store"})
+        self.cache.get(session, "http://x/a", timeout=1)
+        self.cache.get(session, "http://x/a", timeout=1)
+        self.assertEqual(session.get.call_count, 2)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+        for headers in ({"ETag": '"v1"', "Cache-Control": "no-cache, max-age=600"}, {"ETag": '"v1"', "Cache-Control": "private"}):
+            session.get.reset_mock()
+            session.get.return_value = _response(content=b"body", headers=headers)
+            self.cache.get(session, "http://x/b", timeout=1)
+            session.get.return_value = _response(status=304, content=b"", headers=headers)
+            r = self.cache.get(session, "http://x/b", timeout=1)
+            self.assertEqual(r.content, b"body")
+            # stored, but never served without asking the server first
+            self.assertEqual(session.get.call_count, 2)
+            self.assertEqual(session.get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+
+    def test_counters_are_thread_safe(self):
+        session = mock.Mock()
+        session.get.return_value = _response(content=b"body")
+        self.cache.get(session, "http://x/foo", timeout=1)
+        workers = [
+            threading.Thread(target=lambda: [self.cache.get(session, "http://x/foo", timeout=1) for _ in range(25)])
+            for _ in range(8)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(self.cache.stats()["hits"], 200)
+
+    def test_evicts_least_recently_used(self):
+        cache = HttpResponseCache(self.tmp / "small.db", max_bytes=10)
+        session = mock.Mock()
+        session.get.return_value = _response(content=b"123456")
+        cache.get(session, "http://x/a", timeout=1)
+        cache.get(session, "http://x/b", timeout=1)
+        stats = cache.stats()
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["evicted"], 1)
+
+    def test_fetcher_uses_cache(self):
+        session = mock.Mock()
+        session.headers = {}
+        session.get.return_value = _response(content=b'{"name": "Foo", "version": "1.0"}')
+        session.get.return_value.json.return_value = {"name": "Foo", "version": "1.0"}
+        fetcher = PluginDetailFetcher(session=session, cache=self.cache)
+        first = fetcher.fetch_plugin_details("foo")
+        second = fetcher.fetch_plugin_details("foo")
+        self.assertEqual(session.get.call_count, 1)
+        self.assertEqual(first.version, second.version)
+
+
+if __name__ == "__main__":
+    unittest.main()
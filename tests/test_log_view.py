@@ -0,0 +1,37 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from wp_plugin_scanner.log_view import RotatingLogFile
+
+
+class TestRotatingLogFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.log = RotatingLogFile(self.tmp / "logs" / "gui.log", max_bytes=200, backups=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_rotation_keeps_bounded_backups(self):
+        for i in range(100):
+            self.log.write_lines([f"[{i:03d}] scanning plugin-{i}"])
+        files = self.log.files()
+        self.assertEqual([p.name for p in files], ["gui.log.2", "gui.log.1", "gui.log"])
+        self.assertTrue(all(p.stat().st_size < 250 for p in files))
+        # the newest line is in the live file, the oldest ones are gone
+        self.assertEqual(self.log.search("[099]")[0][0].name, "gui.log")
+        self.assertEqual(self.log.search("[000]"), [])
+
+    def test_search_and_context(self):
+        log = RotatingLogFile(self.tmp / "big.log")
+        log.write_lines([f"line {i}" for i in range(100)] + ["ERROR upload found"])
+        hits = log.search("error")
+        self.assertEqual([(lineno, line) for _, lineno, line in hits], [(101, "ERROR upload found")])
+        context = log.context(hits[0][0], 101, radius=2)
+        self.assertEqual([n for n, _ in context], [99, 100, 101])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,238 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import zipfile
+from pathlib import Path
+
+from wp_plugin_scanner.archive_memo import ArchiveMemo
+from wp_plugin_scanner.downloader import IPluginDownloader, LocalZipDownloader
+from wp_plugin_scanner.job_journal import JobJournal, RetryPolicy
+from wp_plugin_scanner.manager import AuditManager
+from wp_plugin_scanner.path_rules import VENDORED_RULES, PathRules
+from wp_plugin_scanner.reporter import IReporter
+from wp_plugin_scanner.scanner import UploadScanner
+
+
+class FakeDownloader(IPluginDownloader):
+    """Writes a one-file plugin; slugs in ``failures`` fail that many times."""
+
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def download(self, slug):
+        with self._lock:
+            self.calls.append(slug)
+            if self.failures.get(slug, 0) > 0:
+                self.failures[slug] -= 1
+                raise RuntimeError(f"Download failed for {slug}")
+        root = Path(tempfile.mkdtemp()) / slug
+        root.mkdir()
+        body = "<?php wp_handle_upload($f);" if "upload" in slug else "<?php echo 1;"
+        (root / "main.php").write_text(body)
+        return root
+
+
+class MemoryReporter(IReporter):
+    def __init__(self):
+        self.results = {}
+
+    def already_done(self, slug):
+        return slug in self.results
+
+    def add_result(self, result):
+        self.results[result.slug] = result
+
+
+class TestAuditManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp)
+        self.journal = JobJournal(self.tmp / "jobs.db")
+        self.reporter = MemoryReporter()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _manager(self, downloader, **kwargs):
+        return AuditManager(downloader, UploadScanner(), self.reporter, save_zip=False,
+                            journal=self.journal, max_workers=2, **kwargs)
+
+    def test_run_records_journal_states(self):
+        manager = self._manager(FakeDownloader({"broken": 5}), retry_policy=RetryPolicy(max_attempts=2, backoff=0))
+        manager.run(["with-upload", "plain", "broken"], progress_cb=lambda msg: None)
+        self.assertEqual(self.reporter.results["with-upload"].status, "True")
+        self.assertEqual(self.reporter.results["plain"].status, "False")
+        summary = self.journal.summary(manager.job_id)
+        self.assertEqual(summary["reported"], 2)
+        self.assertEqual(summary["error"], 1)
+        self.assertEqual(self.journal.attempts(manager.job_id, 2), 2)
+
+    def test_retry_recovers_transient_failure(self):
+        downloader = FakeDownloader({"flaky": 1})
+        manager = self._manager(downloader, retry_policy=RetryPolicy(max_attempts=3, backoff=0))
+        manager.run(["flaky"], progress_cb=lambda msg: None)
+        self.assertEqual(self.reporter.results["flaky"].status, "False")
+        self.assertEqual(downloader.calls, ["flaky", "flaky"])
+
+    def test_failed_scan_is_retried_with_a_fresh_download(self):
+        scanner = UploadScanner()
+        scan, failures = scanner.scan, [1]
+
+        def flaky_scan(path):
+            if failures[0]:
+                failures[0] -= 1
+                raise OSError("disk hiccup")
+            return scan(path)
+
+        scanner.scan = flaky_scan
+        downloader = FakeDownloader()
+        manager = AuditManager(downloader, scanner, self.reporter, save_zip=False, journal=self.journal,
+                               max_workers=2, retry_policy=RetryPolicy(max_attempts=2, backoff=0))
+        manager.run(["with-upload"], progress_cb=lambda msg: None)
+        self.assertEqual(self.reporter.results["with-upload"].status, "True")
+        self.assertEqual(downloader.calls, ["with-upload", "with-upload"])
+        self.assertEqual(self.journal.attempts(manager.job_id, 0), 2)
+
+    def test_generator_input_is_consumed_with_backpressure(self):
+        pulled, lines = [0], []
+        max_ahead = [0]
+
+        def slugs():
+            for i in range(50):
+                pulled[0] += 1
+                max_ahead[0] = max(max_ahead[0], pulled[0] - len(self.reporter.results))
+                yield f"plugin-{i}"
+
+        manager = self._manager(FakeDownloader(), queue_size=2)
+        manager.run(slugs(), progress_cb=lines.append)
+        self.assertEqual(len(self.reporter.results), 50)
+        self.assertEqual(self.journal.summary(manager.job_id)["reported"], 50)
+        # at most the queued and in-flight items run ahead of the reporter
+        self.assertLessEqual(max_ahead[0], 3 * 2 + manager.max_workers + manager.scan_workers + 2)
+        self.assertFalse(any("/50]" in line for line in lines))
+
+    def test_run_collects_stage_metrics(self):
+        snapshots = []
+        manager = self._manager(FakeDownloader(), metrics_cb=snapshots.append,
+                                metrics_json=self.tmp / "metrics.json")
+        manager.run(["with-upload", "plain"], progress_cb=lambda msg: None)
+        stages = snapshots[-1]["stages"]
+        for name in ("download", "scan", "add_result"):
+            self.assertEqual(stages[name]["count"], 2)
+        self.assertEqual(snapshots[-1]["files_scanned"], 2)
+        self.assertGreater(snapshots[-1]["bytes"]["scan"], 0)
+        self.assertTrue((self.tmp / "metrics.json").exists())
+
+    def test_local_zip_directory(self):
+        zips = self.tmp / "zips"
+        zips.mkdir()
+        with zipfile.ZipFile(zips / "remote.1.2.zip", "w") as zf:
+            zf.writestr("remote/main.php", "<?php media_handle_upload('f', 0);")
+        with zipfile.ZipFile(zips / "saved.zip", "w") as zf:  # AuditManager._save_zip_archive layout
+            zf.writestr("inc/a.php", "<?php echo 1;")
+            zf.writestr("main.php", "<?php echo 2;")
+        (zips / "broken.zip").write_bytes(b"not a zip")
+        downloader = LocalZipDownloader(zips)
+        self.assertEqual(downloader.slugs(), ["broken", "remote", "saved"])
+
+        self.reporter.results["saved"] = None  # already audited
+        manager = self._manager(downloader, skip_done=False, retry_policy=RetryPolicy(max_attempts=1))
+        manager.run(downloader.slugs(), progress_cb=lambda msg: None)
+        self.assertEqual(self.reporter.results["remote"].status, "True")
+        self.assertEqual(self.reporter.results["saved"].files_scanned, 2)
+        self.assertTrue(self.reporter.results["broken"].status.startswith("error:Broken ZIP"))
+
+    def test_archive_memo_skips_known_archives(self):
+        zips = self.tmp / "zips"
+        zips.mkdir()
+        for slug in ("first", "copy"):  # same bytes under two slugs
+            with zipfile.ZipFile(zips / f"{slug}.zip", "w") as zf:
+                zf.writestr("plugin/main.php", "<?php wp_handle_upload($f);")
+                zf.writestr("plugin/lib.php", "<?php echo 1;")
+        downloader = LocalZipDownloader(zips)
+        memo = ArchiveMemo(self.tmp / "memo.db")
+        scanner = UploadScanner()
+        scanned = []
+        scan = scanner.scan
+        scanner.scan = lambda path: scanned.append(path) or scan(path)
+
+        manager = AuditManager(downloader, scanner, self.reporter, save_zip=False, max_workers=1,
+                               archive_memo=memo)
+        manager.run(["first"], progress_cb=lambda msg: None)
+        manager.run(["copy"], progress_cb=lambda msg: None)
+        self.assertEqual(len(scanned), 1)
+        copy = self.reporter.results["copy"]
+        self.assertEqual((copy.status, copy.files_scanned), ("True", 2))
+        self.assertEqual(copy.upload_matches, self.reporter.results["first"].upload_matches)
+        self.assertEqual(manager.metrics.snapshot()["bytes"]["memo_hit"], (zips / "copy.zip").stat().st_size)
+
+        # a different rule set misses the memo
+        scanner.ruleset = "other"
+        manager.skip_done = False
+        manager.run(["first"], progress_cb=lambda msg: None)
+        self.assertEqual(len(scanned), 2)
+
+    def test_path_rules_skip_archive_members(self):
+        zips = self.tmp / "zips"
+        zips.mkdir()
+        with zipfile.ZipFile(zips / "bundled.zip", "w") as zf:
+            zf.writestr("bundled/main.php", "<?php echo 1;")
+            zf.writestr("bundled/vendor/lib/upload.php", "<?php wp_handle_upload($f);")
+            zf.writestr("bundled/js/app.min.js", "x" * 100)
+        scanner = UploadScanner(rules=PathRules(VENDORED_RULES))
+        self.assertNotEqual(scanner.ruleset, UploadScanner().ruleset)
+        manager = AuditManager(LocalZipDownloader(zips), scanner, self.reporter, save_zip=True, max_workers=1)
+        manager.run(["bundled"], progress_cb=lambda msg: None)
+        result = self.reporter.results["bundled"]
+        self.assertEqual((result.status, result.files_scanned), ("False", 1))
+        self.assertEqual((result.files_skipped, result.bytes_skipped), (2, 127))
+        # the saved ZIP is the original archive, not the filtered tree
+        with zipfile.ZipFile(self.tmp / "saved_zips" / "bundled.zip") as zf:
+            self.assertEqual(len(zf.namelist()), 3)
+
+    def test_resume_continues_in_order(self):
+        job_id = self.journal.create_job(["a", "b", "c", "d", "e"])
+        # simulate a crash: a reported, b in flight, c errored once, d and e pending
+        self.journal.set_state(job_id, 0, "reported")
+        self.journal.set_state(job_id, 1, "downloading")
+        self.journal.set_state(job_id, 2, "downloading")
+        self.journal.set_state(job_id, 2, "error", "timeout")
+        self.assertEqual([slug for _, slug in self.journal.remaining(job_id)], ["b", "c", "d", "e"])
+
+        downloader = FakeDownloader()
+        manager = AuditManager(downloader, UploadScanner(), self.reporter, save_zip=False,
+                               journal=self.journal, max_workers=1)
+        manager.resume(job_id, progress_cb=lambda msg: None)
+        self.assertEqual(downloader.calls, ["b", "c", "d", "e"])
+        self.assertEqual(self.journal.summary(job_id)["reported"], 5)
+        self.assertEqual(list(self.journal.remaining(job_id)), [])
+
+    def test_resume_retries_reported_errors(self):
+        downloader = FakeDownloader({"flaky": 1})
+        manager = self._manager(downloader, retry_policy=RetryPolicy(max_attempts=1))
+        manager.run(["flaky", "plain"], progress_cb=lambda msg: None)
+        self.assertTrue(self.reporter.results["flaky"].status.startswith("error:"))
+
+        manager.retry_policy = RetryPolicy(max_attempts=2, backoff=0)
+        manager.resume(manager.job_id, progress_cb=lambda msg: None)
+        self.assertEqual(downloader.calls.count("flaky"), 2)
+        self.assertEqual(self.reporter.results["flaky"].status, "False")
+        self.assertEqual(self.journal.summary(manager.job_id)["reported"], 2)
+
+    def test_resume_skips_exhausted_errors(self):
+        job_id = self.journal.create_job(["x"])
+        for _ in range(3):
+            self.journal.set_state(job_id, 0, "downloading")
+        self.journal.set_state(job_id, 0, "error", "404")
+        self.assertEqual(list(self.journal.remaining(job_id, RetryPolicy(max_attempts=3))), [])
+        self.assertEqual(list(self.journal.remaining(job_id, RetryPolicy(max_attempts=4))), [(0, "x")])
+
+
+if __name__ == "__main__":
+    unittest.main()
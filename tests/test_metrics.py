@@ -0,0 +1,55 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from wp_plugin_scanner import metrics
+from wp_plugin_scanner.metrics import RunMetrics, SlugTimings
+
+
+class TestRunMetrics(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_stage_calls_only_record_while_tracking(self):
+        with metrics.stage("scan"):
+            metrics.add_bytes("scan", 10)  # no active record: ignored
+        timings = SlugTimings("demo")
+        with metrics.tracking(timings):
+            with metrics.stage("scan"):
+                metrics.add_bytes("scan", 10)
+            with metrics.stage("scan"):
+                metrics.add_bytes("scan", 5)
+        self.assertIsNone(metrics.current())
+        self.assertEqual(timings.bytes, {"scan": 15})
+        self.assertEqual(list(timings.stages), ["scan"])
+
+    def test_percentiles_and_exports(self):
+        run = RunMetrics()
+        for i in range(1, 101):
+            run.observe(SlugTimings(f"p{i}", stages={"download": i / 100, "scan": 0.01},
+                                    bytes={"download": 1000}, files_scanned=2, status="False"))
+        run.observe(SlugTimings("bad", status="error:404"))
+        snap = run.snapshot()
+        self.assertEqual(snap["slugs"], 101)
+        self.assertEqual(snap["status"], {"False": 100, "error": 1})
+        self.assertEqual(snap["files_scanned"], 200)
+        self.assertEqual(snap["bytes"]["download"], 100000)
+        self.assertAlmostEqual(snap["stages"]["download"]["p50"], 0.5, places=2)
+        self.assertAlmostEqual(snap["stages"]["download"]["p99"], 0.99, places=2)
+
+        run.write_json(self.tmp / "metrics.json")
+        self.assertEqual(json.loads((self.tmp / "metrics.json").read_text())["slugs"], 101)
+        run.write_prometheus(self.tmp / "audit.prom")
+        text = (self.tmp / "audit.prom").read_text()
+        self.assertIn('wp_audit_stage_seconds_count{stage="download"} 100', text)
+        self.assertIn('wp_audit_slugs_total{status="error"} 1', text)
+        self.assertFalse((self.tmp / "audit.prom.tmp").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
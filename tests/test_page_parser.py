@@ -0,0 +1,54 @@
+import dataclasses
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from wp_plugin_scanner.page_parser import extract_page_fields, extract_page_fields_soup
+from wp_plugin_scanner.plugin_fetcher import PluginDetailFetcher
+
+PAGES = Path(__file__).parent / "fixtures" / "plugin_pages"
+
+
+def _details(html: str, parser: str) -> dict:
+    session = mock.Mock()
+    session.headers = {}
+    session.get.return_value.text = html
+    fetcher = PluginDetailFetcher(session=session, page_parser=parser)
+    details = fetcher._fetch_from_page("sample")
+    data = dataclasses.asdict(details)
+    data.pop("fetched_at")
+    return data
+
+
+class TestPageParser(unittest.TestCase):
+    def test_fields_match_soup_on_sample_pages(self):
+        pages = sorted(PAGES.glob("*.html"))
+        self.assertTrue(pages)
+        for page in pages:
+            html = page.read_text(encoding="utf-8")
+            with self.subTest(page=page.name):
+                self.assertEqual(extract_page_fields(html), extract_page_fields_soup(html))
+                self.assertEqual(_details(html, "fast"), _details(html, "soup"))
+
+    def test_extracts_meta_list(self):
+        html = (PAGES / "contact-form-7.html").read_text(encoding="utf-8")
+        details = _details(html, "fast")
+        self.assertEqual(details["name"], "Contact Form 7")
+        self.assertEqual(details["version"], "5.9.8")
+        self.assertEqual(details["requires_wp"], "6.3")
+        self.assertEqual(details["tested_up_to"], "6.6.2")
+        self.assertEqual(details["downloaded"], 112345678)
+        self.assertEqual(details["rating"], 4.1)
+        self.assertEqual(details["tags"], "captcha, contact, contact form, email")
+
+    def test_string_match_requires_single_child(self):
+        html = "<ul><li>Version: <strong>1.0</strong></li><li><span>Version: 2.0</span></li></ul>"
+        self.assertEqual(extract_page_fields(html)["version"], "Version: 2.0")
+
+    def test_void_element_quirks(self):
+        html = '<div class="plugin-description">a<br>b<br/>c</br>d</div><li>Version: 3</li>'
+        self.assertEqual(extract_page_fields(html), extract_page_fields_soup(html))
+
+
+if __name__ == "__main__":
+    unittest.main()
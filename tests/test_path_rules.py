@@ -0,0 +1,70 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from wp_plugin_scanner.path_rules import VENDORED_RULES, PathRules, SkipStats
+from wp_plugin_scanner.scanner import UploadScanner
+
+EXTS = (".php", ".js")
+
+
+class TestPathRules(unittest.TestCase):
+    def test_gitignore_semantics(self):
+        rules = PathRules([
+            "# comment",
+            "*.min.js",
+            "/build/",
+            "assets/**/*.js",
+            "!assets/js/upload.js",
+            "vendor/",
+        ])
+        self.assertTrue(rules.excludes("js/app.min.js"))
+        self.assertTrue(rules.excludes("build/out.php"))
+        self.assertFalse(rules.excludes("src/build/out.php"))  # anchored
+        self.assertTrue(rules.excludes("assets/js/deep/x.js"))
+        self.assertFalse(rules.excludes("assets/js/upload.js"))
+        self.assertTrue(rules.excludes("lib/vendor/a.php"))  # unanchored dir at any depth
+        self.assertFalse(rules.excludes("vendor.php"))  # dir-only pattern
+        self.assertFalse(rules.excludes("main.php"))
+
+    def test_size_cap_and_fingerprint(self):
+        rules = PathRules(max_file_bytes=10)
+        self.assertTrue(rules)
+        self.assertFalse(PathRules(["# only a comment"]))
+        self.assertTrue(rules.excludes("a.php", 11))
+        self.assertFalse(rules.excludes("a.php", 10))
+        self.assertNotEqual(rules.fingerprint(), PathRules(max_file_bytes=20).fingerprint())
+
+
+class TestScannerWithRules(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        root = self.tmp / "plugin"
+        (root / "node_modules" / "pkg").mkdir(parents=True)
+        (root / "node_modules" / "pkg" / "index.js").write_text("upload_files();" * 10)
+        (root / "node_modules" / "pkg" / "README.md").write_text("ignored: not a target file")
+        (root / "js").mkdir()
+        (root / "js" / "app.min.js").write_text("wp_handle_upload();")
+        (root / "main.php").write_text("<?php wp_handle_upload($f);")
+        self.root = root
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_walk_prunes_and_counts_skipped(self):
+        skipped = SkipStats()
+        kept = list(PathRules(VENDORED_RULES).walk(self.root, EXTS, skipped))
+        self.assertEqual(kept, [self.root / "main.php"])
+        self.assertEqual((skipped.files, skipped.bytes), (2, 150 + 19))
+
+    def test_scan_reports_skipped_files(self):
+        outcome = UploadScanner(rules=PathRules(VENDORED_RULES)).scan(self.root)
+        self.assertEqual([m.file_path for m in outcome.matches], ["main.php"])
+        self.assertEqual((outcome.files_scanned, outcome.files_skipped, outcome.bytes_skipped), (1, 2, 169))
+        unfiltered = UploadScanner().scan(self.root)
+        self.assertEqual((unfiltered.files_scanned, unfiltered.files_skipped), (3, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import queue
+import sqlite3
+import threading
+import time
+import unittest
+
+from wp_plugin_scanner.query_scheduler import QueryScheduler
+
+SLOW_QUERY = '''
+    WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n)
+    SELECT COUNT(*) FROM n
+'''
+
+
+class FakeRoot:
+    """Collects ``after`` callbacks so the test plays the Tk event loop."""
+
+    def __init__(self):
+        self.callbacks = queue.Queue()
+        self.cancelled = set()
+        self._ids = 0
+
+    def after(self, ms, func, *args):
+        self._ids += 1
+        self.callbacks.put((self._ids, func, args))
+        return self._ids
+
+    def after_cancel(self, after_id):
+        self.cancelled.add(after_id)
+
+    def pump(self, timeout=5.0):
+        after_id, func, args = self.callbacks.get(timeout=timeout)
+        if after_id not in self.cancelled:
+            func(*args)
+
+
+class TestQueryScheduler(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.scheduler = QueryScheduler(self.root, lambda: sqlite3.connect(":memory:"))
+
+    def tearDown(self):
+        self.scheduler.close()
+
+    def test_delivers_result_on_root(self):
+        results = []
+        self.scheduler.submit(lambda conn: conn.execute("SELECT 42").fetchone()[0], results.append, delay_ms=0)
+        self.root.pump()
+        self.assertEqual(results, [42])
+
+    def test_debounce_coalesces_requests(self):
+        calls, results = [], []
+
+        def query(value):
+            def run(conn):
+                calls.append(value)
+                return value
+            return run
+
+        for value in range(3):
+            self.scheduler.submit(query(value), results.append)
+        # the first two debounce timers are cancelled; only the last one fires
+        for _ in range(3):
+            self.root.pump()
+        self.root.pump()
+        self.assertEqual(calls, [2])
+        self.assertEqual(results, [2])
+
+    def test_new_submit_interrupts_running_query(self):
+        started = threading.Event()
+        results, errors = [], []
+
+        def slow(conn):
+            started.set()
+            return conn.execute(SLOW_QUERY).fetchone()
+
+        self.scheduler.submit(slow, results.append, errors.append, delay_ms=0)
+        self.assertTrue(started.wait(5))
+        began = time.monotonic()
+        self.scheduler.submit(lambda conn: "fresh", results.append, delay_ms=0)
+        # the interrupted query's error belongs to a stale generation and is dropped
+        self.root.pump()
+        self.assertLess(time.monotonic() - began, 5)
+        self.assertEqual(results, ["fresh"])
+        self.assertEqual(errors, [])
+
+    def test_follow_reuses_generation_connection(self):
+        conns = []
+        self.scheduler.submit(lambda conn: conns.append(conn), lambda _: None, delay_ms=0)
+        self.scheduler.follow(lambda conn: conns.append(conn), lambda _: None)
+        self.root.pump()
+        self.root.pump()
+        self.assertIs(conns[0], conns[1])
+        self.scheduler.submit(lambda conn: conns.append(conn), lambda _: None, delay_ms=0)
+        self.root.pump()
+        self.assertIsNot(conns[2], conns[0])
+
+    def test_follow_is_dropped_with_its_generation(self):
+        results = []
+        self.scheduler.submit(lambda conn: time.sleep(0.1), lambda _: None, delay_ms=0)
+        self.scheduler.follow(lambda conn: "stale", results.append)
+        self.scheduler.submit(lambda conn: "fresh", results.append, delay_ms=0)
+        self.root.pump()
+        self.assertEqual(results, ["fresh"])
+        self.assertTrue(self.root.callbacks.empty())
+
+    def test_stream_delivers_batches_then_done(self):
+        batches, done = [], []
+        generation = self.scheduler.submit(lambda conn: iter([[1, 2], [3]]), batches.append, delay_ms=0,
+                                           on_done=lambda: done.append(True))
+        for _ in range(3):
+            self.root.pump()
+            self.scheduler.more(generation)
+        self.assertEqual(batches, [[1, 2], [3]])
+        self.assertEqual(done, [True])
+
+    def test_stream_waits_for_consumer(self):
+        pulled, batches, done = [], [], []
+
+        def produce(conn):
+            for batch in range(3):
+                pulled.append(batch)
+                yield [batch]
+
+        generation = self.scheduler.submit(produce, batches.append, delay_ms=0, on_done=lambda: done.append(True))
+        self.root.pump()
+        time.sleep(0.1)
+        # nothing beyond the first batch is read until the consumer asks
+        self.assertEqual(pulled, [0])
+        self.assertTrue(self.root.callbacks.empty())
+        self.scheduler.more(generation)
+        self.root.pump()
+        self.assertEqual(batches, [[0], [1]])
+        self.assertEqual(pulled, [0, 1])
+
+    def test_cancel_releases_waiting_stream(self):
+        results = []
+        self.scheduler.submit(lambda conn: iter([[1], [2]]), results.append, delay_ms=0, on_done=lambda: None)
+        self.root.pump()
+        self.scheduler.submit(lambda conn: "fresh", results.append, delay_ms=0)
+        self.root.pump()
+        self.assertEqual(results, [[1], "fresh"])
+
+
+if __name__ == "__main__":
+    unittest.main()
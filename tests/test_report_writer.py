@@ -0,0 +1,70 @@
+import threading
+import unittest
+
+from wp_plugin_scanner.models import PluginResult
+from wp_plugin_scanner.report_writer import ReportWriter
+from wp_plugin_scanner.reporter import CombinedReporter, IReporter
+
+
+class BatchReporter(IReporter):
+    """Records each add_results call; blocks writes until ``gate`` is set."""
+
+    def __init__(self, fail_slug=None):
+        self.batches = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail_slug = fail_slug
+
+    def already_done(self, slug):
+        return any(r.slug == slug for batch in self.batches for r in batch)
+
+    def add_result(self, result):
+        if result.slug == self.fail_slug:
+            raise ValueError("bad row")
+        self.batches.append([result])
+
+    def add_results(self, results):
+        self.gate.wait()
+        if any(r.slug == self.fail_slug for r in results):
+            raise ValueError("bad batch")
+        self.batches.append(list(results))
+
+
+class TestReportWriter(unittest.TestCase):
+    def test_waiting_results_are_group_committed(self):
+        reporter = BatchReporter()
+        reporter.gate.clear()
+        written = []
+        writer = ReportWriter(reporter, on_written=written.extend).start()
+        writer.add_result(PluginResult("first", "False"))
+        for i in range(20):
+            writer.add_result(PluginResult(f"p{i}", "False"))
+        self.assertTrue(writer.already_done("p19"))
+        reporter.gate.set()
+        writer.close()
+        self.assertEqual(sum(len(b) for b in reporter.batches), 21)
+        self.assertLessEqual(len(reporter.batches), 3)
+        self.assertEqual(len(written), 21)
+
+    def test_failed_batch_falls_back_to_single_writes(self):
+        reporter = BatchReporter(fail_slug="bad")
+        with ReportWriter(reporter) as writer:
+            for slug in ("a", "bad", "b"):
+                writer.add_result(PluginResult(slug, "False"))
+        self.assertEqual(sorted(r.slug for b in reporter.batches for r in b), ["a", "b"])
+        self.assertEqual((writer.written, writer.failed), (2, 1))
+        # the unwritten slug is not reported as done
+        self.assertFalse(writer.already_done("bad"))
+
+    def test_combined_reporter_receives_batches(self):
+        first, second = BatchReporter(), BatchReporter()
+        writer = ReportWriter(CombinedReporter([first, second]))
+        writer.add_result(PluginResult("x", "True"))
+        writer.flush()
+        self.assertTrue(first.already_done("x") and second.already_done("x"))
+        writer.close()
+        writer.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
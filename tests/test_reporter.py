@@ -0,0 +1,295 @@
+import os
+import unittest
+from pathlib import Path
+import tempfile
+import shutil
+import sqlite3
+
+from wp_plugin_scanner.models import PluginDetails, PluginResult, UploadMatch
+from wp_plugin_scanner.reporter import AUDIT_RESULT_COLUMNS, CsvReporter, PluginDetailsSqliteReporter, SqliteReporter
+
+
+class TestPluginDetailsSqliteReporter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        # audit lookups also open databases relative to the working directory
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp)
+        self.reporter = PluginDetailsSqliteReporter(self.tmp / "details.db")
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _count(self) -> int:
+        with sqlite3.connect(self.reporter.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM plugin_details").fetchone()[0]
+
+    def test_save_many_streams_generator_in_chunks(self):
+        details = (PluginDetails(slug=f"p{i}", name=f"Plugin {i}") for i in range(25))
+        saved = self.reporter.save_many_plugin_details(details, chunk_size=10)
+        self.assertEqual(saved, 25)
+        self.assertEqual(self._count(), 25)
+
+    def test_save_many_upserts(self):
+        self.reporter.save_many_plugin_details([PluginDetails(slug="foo", name="Old")])
+        self.reporter.save_many_plugin_details([PluginDetails(slug="foo", name="New", version="2.0")])
+        self.assertEqual(self._count(), 1)
+        self.assertEqual(self.reporter.get_plugin_details("foo").version, "2.0")
+
+    def test_save_plugin_details_wrapper(self):
+        self.assertTrue(self.reporter.save_plugin_details(PluginDetails(slug="foo", name="Foo")))
+        self.assertTrue(self.reporter.plugin_exists("foo"))
+
+    def _seed(self):
+        self.reporter.save_many_plugin_details([
+            PluginDetails(slug="cf7", name="Contact Form 7", author="Takayuki", description="Simple contact forms"),
+            PluginDetails(slug="wpforms", name="WPForms", author="Syed", description="Drag and drop form builder"),
+            PluginDetails(slug="seo", name="Yoast SEO", author="Team Yoast", description="Search engine optimization"),
+        ])
+
+    def test_fts_substring_search_ranks_name_first(self):
+        self._seed()
+        self.reporter.save_plugin_details(PluginDetails(slug="pb", name="Page Builder", description="Layouts"))
+        self.assertTrue(self.reporter.fts_enabled)
+        self.assertEqual([p.slug for p in self.reporter.search_plugins("builder")], ["pb", "wpforms"])
+        self.assertEqual(sorted(p.slug for p in self.reporter.search_plugins("form")), ["cf7", "wpforms"])
+        self.assertEqual([p.slug for p in self.reporter.search_plugins("ptimiz")], ["seo"])
+
+    def test_search_matches_cjk_and_short_terms(self):
+        self._seed()
+        self.reporter.save_plugin_details(PluginDetails(slug="toiawase", name="お問い合わせフォーム"))
+        for term in ("合わせフ", "フォ", "7"):
+            rows = self.reporter.get_plugins_with_audit_results(search_term=term)
+            expected = ["cf7"] if term == "7" else ["toiawase"]
+            self.assertEqual([r["plugin"].slug for r in rows], expected, term)
+            self.assertEqual([p.slug for p in self.reporter.search_plugins(term)], expected, term)
+
+    def test_fts_index_survives_vacuum(self):
+        self._seed()
+        with sqlite3.connect(self.reporter.db_path) as conn:
+            conn.execute("DELETE FROM plugin_details WHERE slug = 'cf7'")
+        with sqlite3.connect(self.reporter.db_path) as conn:
+            conn.execute("VACUUM")
+        self.assertEqual([p.slug for p in self.reporter.search_plugins("drag")], ["wpforms"])
+        self.assertEqual([p.slug for p in self.reporter.search_plugins("yoast")], ["seo"])
+
+    def test_fts_index_follows_updates_and_deletes(self):
+        self._seed()
+        self.reporter.save_plugin_details(PluginDetails(slug="seo", name="Rank Booster"))
+        self.assertEqual(self.reporter.search_plugins("yoast"), [])
+        self.assertEqual([p.slug for p in self.reporter.search_plugins("booster")], ["seo"])
+        with sqlite3.connect(self.reporter.db_path) as conn:
+            conn.execute("DELETE FROM plugin_details WHERE slug = 'cf7'")
+        self.assertEqual([p.slug for p in self.reporter.search_plugins("contact")], [])
+
+    def test_audit_results_search_uses_index(self):
+        self._seed()
+        rows = self.reporter.get_plugins_with_audit_results(search_term="drag")
+        self.assertEqual([r["plugin"].slug for r in rows], ["wpforms"])
+
+    def test_like_fallback_without_fts(self):
+        self._seed()
+        self.reporter.fts_enabled = False
+        self.assertEqual([p.slug for p in self.reporter.search_plugins("ptimiz")], ["seo"])
+
+    def test_slug_keyed_table_is_migrated(self):
+        path = self.tmp / "old.db"
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE plugin_details (slug TEXT PRIMARY KEY, name TEXT NOT NULL, author TEXT, description TEXT)")
+            conn.execute(
+                "CREATE VIRTUAL TABLE plugin_details_fts USING fts5("
+                "name, author, description, content='plugin_details', content_rowid='rowid')"
+            )
+            conn.execute("INSERT INTO plugin_details (slug, name, description) VALUES ('wpforms', 'WPForms', 'Form builder')")
+            conn.execute(
+                "CREATE TABLE upload_scan_results (slug TEXT PRIMARY KEY, has_upload BOOLEAN NOT NULL, "
+                "scan_status TEXT NOT NULL, FOREIGN KEY (slug) REFERENCES plugin_details (slug))"
+            )
+            conn.execute(
+                "CREATE TABLE search_result_plugins (search_id INTEGER, plugin_slug TEXT, position INTEGER, "
+                "FOREIGN KEY (plugin_slug) REFERENCES plugin_details (slug), PRIMARY KEY (search_id, plugin_slug))"
+            )
+        reporter = PluginDetailsSqliteReporter(path)
+        with sqlite3.connect(path) as conn:
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("INSERT INTO upload_scan_results (slug, has_upload, scan_status) VALUES ('wpforms', 1, 'ok')")
+            conn.execute("INSERT INTO search_result_plugins VALUES (1, 'wpforms', 0)")
+            self.assertEqual(conn.execute("PRAGMA foreign_key_check").fetchall(), [])
+            leftovers = conn.execute(
+                "SELECT name FROM sqlite_master WHERE sql LIKE '%plugin_details_old%' OR sql LIKE '%plugin_details_new%'"
+            ).fetchall()
+            self.assertEqual(leftovers, [])
+        self.assertEqual([p.slug for p in reporter.search_plugins("builder")], ["wpforms"])
+        self.assertEqual(reporter.get_plugin_details("wpforms").name, "WPForms")
+        self.assertTrue(reporter.save_plugin_details(PluginDetails(slug="wpforms", name="WPForms Lite")))
+        self.assertEqual([p.name for p in reporter.search_plugins("lite")], ["WPForms Lite"])
+
+    def test_existing_rows_indexed_on_upgrade(self):
+        with sqlite3.connect(self.reporter.db_path) as conn:
+            conn.execute("DROP TABLE plugin_details_fts")
+            for trigger in ("ai", "ad", "au"):
+                conn.execute(f"DROP TRIGGER plugin_details_fts_{trigger}")
+        self._seed()
+        reporter = PluginDetailsSqliteReporter(self.reporter.db_path)
+        self.assertEqual([p.slug for p in reporter.search_plugins("builder")], ["wpforms"])
+
+    def test_audit_filter_and_sort_run_in_sql(self):
+        self.reporter.save_many_plugin_details(
+            PluginDetails(slug=f"p{i}", name=f"Plugin {i}") for i in range(10)
+        )
+        audit = SqliteReporter(self.tmp / "plugin_upload_audit.db")
+        match = UploadMatch("a.php", 1, "wp_handle_upload();", "wp_handle_upload")
+        for i in range(0, 10, 2):
+            status = "True" if i % 4 == 0 else "False"
+            matches = [match, match] if status == "True" else []
+            audit.add_result(PluginResult(f"p{i}", status, timestamp=1_700_000_000 + i, upload_matches=matches))
+
+        true_rows = self.reporter.get_plugins_with_audit_results(audit_filter="true", limit=2)
+        self.assertEqual([r["plugin"].slug for r in true_rows], ["p0", "p4"])
+        self.assertEqual(true_rows[0]["matches_count"], 2)
+
+        no_audit = self.reporter.get_plugins_with_audit_results(audit_filter="no_audit")
+        self.assertEqual(len(no_audit), 5)
+        self.assertTrue(all(r["audit_status"] == "no_audit" for r in no_audit))
+
+        latest = self.reporter.get_plugins_with_audit_results(sort_by="audit_timestamp", sort_desc=True, limit=3)
+        self.assertEqual([r["plugin"].slug for r in latest], ["p8", "p6", "p4"])
+
+        page = self.reporter.get_plugins_with_audit_results(sort_by="slug", limit=3, offset=3)
+        self.assertEqual([r["plugin"].slug for r in page], ["p3", "p4", "p5"])
+
+    def test_keyset_pages_match_offset_pages(self):
+        self.reporter.save_many_plugin_details(
+            PluginDetails(slug=f"p{i:02d}", name=f"Plugin {i % 4}", rating=(i % 3) or None) for i in range(20)
+        )
+        for sort_by in ("name", "rating"):
+            for desc in (False, True):
+                expected = [r["plugin"].slug for r in self.reporter.get_plugins_with_audit_results(
+                    sort_by=sort_by, sort_desc=desc)]
+                walked, after = [], None
+                while True:
+                    page = self.reporter.get_plugins_with_audit_results(
+                        sort_by=sort_by, sort_desc=desc, limit=3, after=after)
+                    if not page:
+                        break
+                    walked.extend(r["plugin"].slug for r in page)
+                    after = page[-1]["sort_key"]
+                self.assertEqual(walked, expected, (sort_by, desc))
+
+    def test_count_plugins_with_audit_results(self):
+        self._seed()
+        self.reporter.save_upload_scan_result(PluginResult("cf7", "True"))
+        self.assertEqual(self.reporter.count_plugins_with_audit_results(),
+                         {"true": 1, "false": 0, "no_audit": 2})
+        self.assertEqual(self.reporter.count_plugins_with_audit_results("form", "no_audit"),
+                         {"true": 0, "false": 0, "no_audit": 1})
+
+    def test_audit_database_takes_precedence(self):
+        self._seed()
+        self.reporter.save_upload_scan_result(PluginResult("cf7", "False"))
+        rows = self.reporter.get_plugins_with_audit_results(audit_filter="false")
+        self.assertEqual([r["plugin"].slug for r in rows], ["cf7"])
+
+        audit = SqliteReporter(self.tmp / "plugin_upload_audit.db")
+        audit.add_result(PluginResult("cf7", "True"))
+        rows = self.reporter.get_plugins_with_audit_results(audit_filter="true")
+        self.assertEqual([r["plugin"].slug for r in rows], ["cf7"])
+
+
+class TestSqliteReporterAuditRows(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp)
+        self.reporter = SqliteReporter(self.tmp / "audit.db")
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_iter_audit_rows_filters_and_sorts_in_sql(self):
+        for i, pattern in enumerate(["move_uploaded_file", "wp_handle_upload", "100%_upload"]):
+            match = UploadMatch(f"f{i}.php", 10 - i, "x", pattern)
+            self.reporter.add_result(PluginResult(f"p{i}", "True", upload_matches=[match]))
+        self.reporter.add_result(PluginResult("none", "False"))
+
+        rows = [r for batch in self.reporter.iter_audit_rows(sort_by="line_number", batch_size=2) for r in batch]
+        self.assertEqual([r[0] for r in rows], ["none", "p2", "p1", "p0"])
+
+        batches = list(self.reporter.iter_audit_rows("matched_pattern", "UPLOAD", sort_by="slug", sort_desc=True))
+        self.assertEqual([r[0] for r in batches[0]], ["p2", "p1", "p0"])
+        # LIKE wildcards in the keyword are matched literally
+        batches = list(self.reporter.iter_audit_rows("matched_pattern", "0%_"))
+        self.assertEqual([r[0] for r in batches[0]], ["p2"])
+
+    def test_import_csv(self):
+        csv_reporter = CsvReporter(self.tmp / "audit.csv")
+        match = UploadMatch("a.php", 3, "move_uploaded_file($f)", "move_uploaded_file")
+        csv_reporter.add_result(PluginResult("foo", "True", upload_matches=[match, match]))
+        csv_reporter.add_result(PluginResult("bar", "False"))
+
+        self.assertFalse(self.reporter.has_results())
+        self.assertEqual(self.reporter.import_csv(self.tmp / "audit.csv"), 3)
+        rows = [r for batch in self.reporter.iter_audit_rows(sort_by="slug") for r in batch]
+        self.assertEqual([r[0] for r in rows], ["bar", "foo", "foo"])
+        self.assertEqual(rows[1][6], 3)
+
+    def test_import_bool_typed_csv(self):
+        # every value is True/False, so pandas would read the column as bool
+        (self.tmp / "audit.csv").write_text("slug,upload,timestamp\nfoo,True,t\nbar,False,t\n")
+        self.assertEqual(self.reporter.import_csv(self.tmp / "audit.csv"), 2)
+        self.assertEqual(self.reporter.flagged_slugs(), {"foo"})
+        batches = list(self.reporter.iter_audit_rows("upload", "True"))
+        self.assertEqual([r[0] for r in batches[0]], ["foo"])
+
+    def test_bool_upload_repair_runs_once(self):
+        legacy = self.tmp / "bool.db"
+        with sqlite3.connect(legacy) as conn:
+            conn.execute("CREATE TABLE plugin_audit_results (id INTEGER PRIMARY KEY, slug TEXT, upload TEXT, timestamp TEXT)")
+            conn.execute("INSERT INTO plugin_audit_results (slug, upload, timestamp) VALUES ('foo', '1', 't')")
+        self.assertEqual(SqliteReporter(legacy).flagged_slugs(), {"foo"})
+        with sqlite3.connect(legacy) as conn:
+            conn.execute("INSERT INTO plugin_audit_results (slug, upload, timestamp) VALUES ('bar', '0', 't')")
+        SqliteReporter(legacy)
+        with sqlite3.connect(legacy) as conn:
+            self.assertEqual(conn.execute("SELECT upload FROM plugin_audit_results WHERE slug = 'bar'").fetchone(), ("0",))
+
+    def test_match_context_round_trips(self):
+        match = UploadMatch("a.php", 4, "$f = $_FILES['x'];", "$_FILES",
+                            context_before="<?php\n// before", context_after="// after")
+        csv_reporter = CsvReporter(self.tmp / "audit.csv")
+        csv_reporter.add_result(PluginResult("foo", "True", upload_matches=[match], files_skipped=2, bytes_skipped=50))
+        self.reporter.import_csv(self.tmp / "audit.csv")
+        row = dict(zip(AUDIT_RESULT_COLUMNS, next(self.reporter.iter_audit_rows())[0]))
+        self.assertEqual((row["context_before"], row["context_after"]), ("<?php\n// before", "// after"))
+        self.assertEqual((row["files_skipped"], row["bytes_skipped"]), (2, 50))
+
+    def test_old_database_gains_new_columns(self):
+        legacy = self.tmp / "legacy.db"
+        with sqlite3.connect(legacy) as conn:
+            conn.execute("""CREATE TABLE plugin_audit_results (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                slug TEXT NOT NULL, upload TEXT NOT NULL, timestamp TEXT NOT NULL, files_scanned INTEGER DEFAULT 0,
+                matches_count INTEGER DEFAULT 0, file_path TEXT DEFAULT '', line_number INTEGER DEFAULT 0,
+                line_content TEXT DEFAULT '', matched_pattern TEXT DEFAULT '')""")
+        reporter = SqliteReporter(legacy)
+        reporter.add_result(PluginResult("foo", "True", upload_matches=[
+            UploadMatch("a.php", 1, "x", "wp_handle_upload", context_after="y")]))
+        row = dict(zip(AUDIT_RESULT_COLUMNS, next(reporter.iter_audit_rows())[0]))
+        self.assertEqual(row["context_after"], "y")
+
+    def test_add_results_replaces_slugs_in_one_batch(self):
+        match = UploadMatch("a.php", 1, "x", "wp_handle_upload")
+        self.reporter.add_result(PluginResult("foo", "False"))
+        batch = [PluginResult("foo", "True", upload_matches=[match, match]), PluginResult("bar", "False")]
+        for reporter in (self.reporter, CsvReporter(self.tmp / "audit.csv")):
+            reporter.add_results(batch)
+            self.assertTrue(reporter.already_done("bar"))
+        rows = [r for b in self.reporter.iter_audit_rows(sort_by="slug") for r in b]
+        self.assertEqual([(r[0], r[1]) for r in rows], [("bar", "False"), ("foo", "True"), ("foo", "True")])
+        csv_rows = CsvReporter(self.tmp / "audit.csv").df
+        self.assertEqual(sorted(csv_rows["slug"]), ["bar", "foo", "foo"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import re
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from wp_plugin_scanner.scan_cache import ScanCache
+from wp_plugin_scanner.scanner import UploadScanner
+
+VENDORED = "<?php\n// vendored mailer\n$f = $_FILES['attachment'];\n"
+
+
+class TestScanCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        for slug in ("one", "two", "three"):
+            vendor = self.tmp / slug / "vendor" / "mailer"
+            vendor.mkdir(parents=True)
+            (vendor / "mailer.php").write_text(VENDORED)
+            (self.tmp / slug / f"{slug}.php").write_text(f"<?php echo '{slug}';\n")
+        self.cache = ScanCache(self.tmp / "scan_cache.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_duplicate_files_are_scanned_once(self):
+        plain = UploadScanner()
+        cached = UploadScanner(cache=self.cache)
+        for slug in ("one", "two", "three"):
+            self.assertEqual(cached.scan_for_upload_features(self.tmp / slug),
+                             plain.scan_for_upload_features(self.tmp / slug))
+        # the vendored file is shared; each plugin's own file is unique
+        self.assertEqual(self.cache.misses, 4)
+        self.assertEqual(self.cache.hits, 2)
+        matches, files = UploadScanner(cache=ScanCache(self.tmp / "scan_cache.db")).scan_for_upload_features(self.tmp / "two")
+        self.assertEqual([(m.file_path, m.line_number) for m in matches], [(str(Path("vendor/mailer/mailer.php")), 3)])
+        self.assertEqual(files, 2)
+
+    def test_counters_are_thread_safe(self):
+        self.cache.put_many([(b"known", [])])
+        workers = [
+            threading.Thread(target=lambda: [self.cache.get(digest) for _ in range(50) for digest in (b"known", b"new")])
+            for _ in range(8)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual((self.cache.hits, self.cache.misses), (400, 400))
+
+    def test_rule_set_change_invalidates(self):
+        UploadScanner(cache=self.cache).scan_for_upload_features(self.tmp / "one")
+        self.assertEqual(self.cache.stats()["entries"], 2)
+        echo_scanner = UploadScanner(re.compile(rb"echo"), cache=self.cache)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+        matches, _ = echo_scanner.scan_for_upload_features(self.tmp / "one")
+        self.assertEqual([m.matched_pattern for m in matches], ["echo"])
+
+
+if __name__ == "__main__":
+    unittest.main()
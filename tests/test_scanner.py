@@ -0,0 +1,45 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from wp_plugin_scanner.scan_cache import ScanCache
+from wp_plugin_scanner.scanner import UploadScanner
+
+SOURCE = "<?php\n// line 2\n// line 3\n$f = $_FILES['upload'];\n// line 5\n// line 6\n// line 7\n"
+
+
+class TestMatchContext(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        (self.tmp / "plugin").mkdir()
+        (self.tmp / "plugin" / "main.php").write_text(SOURCE)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_context_lines_are_captured_in_the_scan(self):
+        matches, _ = UploadScanner(context_lines=2).scan_for_upload_features(self.tmp / "plugin")
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(matches[0].line_number, 4)
+        self.assertEqual(matches[0].context_before, "// line 2\n// line 3")
+        self.assertEqual(matches[0].context_after, "// line 5\n// line 6")
+
+        matches, _ = UploadScanner(context_lines=5).scan_for_upload_features(self.tmp / "plugin")
+        self.assertEqual(matches[0].context_before, "<?php\n// line 2\n// line 3")  # clipped at the file start
+        matches, _ = UploadScanner(context_lines=0).scan_for_upload_features(self.tmp / "plugin")
+        self.assertEqual((matches[0].context_before, matches[0].context_after), ("", ""))
+
+    def test_cached_matches_keep_context(self):
+        cache = ScanCache(self.tmp / "scan_cache.db")
+        first, _ = UploadScanner(cache=cache).scan_for_upload_features(self.tmp / "plugin")
+        again, _ = UploadScanner(cache=cache).scan_for_upload_features(self.tmp / "plugin")
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(again, first)
+        # a different context size is a different rule set
+        UploadScanner(cache=cache, context_lines=1)
+        self.assertEqual(cache.stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
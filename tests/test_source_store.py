@@ -0,0 +1,51 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from wp_plugin_scanner.source_store import SourceStore
+
+VENDORED = b"<?php\n// vendored mailer\n" + b"$x = 1;\n" * 2000
+
+
+class TestSourceStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.store = SourceStore(self.tmp / "store", pack_max_bytes=4096)
+        for slug in ("one", "two"):
+            root = self.tmp / "src" / slug
+            (root / "vendor").mkdir(parents=True)
+            (root / "vendor" / "mailer.php").write_bytes(VENDORED)
+            (root / f"{slug}.php").write_bytes(f"<?php echo '{slug}';\n".encode() * 500)
+            self.store.put_plugin(slug, root, sorted(root.rglob("*.php")))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_blobs_are_deduplicated_and_readable(self):
+        stats = self.store.stats()
+        self.assertEqual((stats["plugins"], stats["files"], stats["blobs"]), (2, 4, 3))
+        self.assertLess(stats["pack_bytes"], stats["unique_bytes"])
+        self.assertEqual(self.store.slugs(), ["one", "two"])
+        self.assertEqual(self.store.read("two", "vendor/mailer.php"), VENDORED)
+        self.assertIsNone(self.store.read("two", "missing.php"))
+        exported = self.store.export("one", self.tmp / "out")
+        self.assertEqual((exported / "vendor" / "mailer.php").read_bytes(), VENDORED)
+        self.assertEqual(dict(self.store.iter_files("one"))["one.php"], (exported / "one.php").read_bytes())
+
+    def test_delete_and_repack_reclaims_space(self):
+        before = self.store.stats()["pack_bytes"]
+        self.assertEqual(self.store.delete(["one", "missing"]), 1)
+        self.assertNotIn("one", self.store)
+        self.assertGreater(self.store.repack(min_garbage=0.1), 0)
+        self.assertLess(self.store.stats()["pack_bytes"], before)
+        self.assertEqual(self.store.read("two", "vendor/mailer.php"), VENDORED)
+        # reopening finds the packs written after the repack
+        reopened = SourceStore(self.tmp / "store", pack_max_bytes=4096)
+        reopened.put_plugin("three", self.tmp / "src" / "one", [self.tmp / "src" / "one" / "one.php"])
+        self.assertEqual(reopened.read("two", "two.php"), (self.tmp / "src" / "two" / "two.php").read_bytes())
+        self.assertEqual(reopened.read("three", "one.php"), (self.tmp / "src" / "one" / "one.php").read_bytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
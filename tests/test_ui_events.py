@@ -0,0 +1,56 @@
+import threading
+import unittest
+
+from wp_plugin_scanner.ui_events import UiEventQueue
+
+
+class FakeVar:
+    def __init__(self):
+        self.history = []
+
+    def set(self, value):
+        self.history.append(value)
+
+
+class TestUiEventQueue(unittest.TestCase):
+    def setUp(self):
+        self.batches = []
+        self.events = UiEventQueue(root=None, log_sink=self.batches.append)
+
+    def test_status_updates_are_coalesced(self):
+        var = FakeVar()
+        for i in range(1000):
+            self.events.set_var(var, f"{i}/1000")
+        self.events.drain()
+        self.assertEqual(var.history, ["999/1000"])
+
+    def test_posted_calls_keep_order_with_status(self):
+        var, calls = FakeVar(), []
+        self.events.set_var(var, "working 1")
+        self.events.set_var(var, "working 2")
+        self.events.post(calls.append, "finished")
+        self.events.set_var(var, "done")
+        self.events.post(lambda: calls.append(var.history[-1]))
+        self.events.drain()
+        self.assertEqual(var.history, ["working 2", "done"])
+        self.assertEqual(calls, ["finished", "done"])
+
+    def test_log_lines_are_batched_across_threads(self):
+        def worker(n):
+            for i in range(500):
+                self.events.log(f"{n}:{i}")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.events.drain()
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual(len(self.batches[0]), 2000)
+        self.events.drain()
+        self.assertEqual(len(self.batches), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
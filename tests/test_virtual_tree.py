@@ -0,0 +1,160 @@
+import unittest
+from unittest import mock
+
+from wp_plugin_scanner.virtual_tree import ChunkedTreeFiller, PagedRows, VirtualTreeview
+
+
+class TestPagedRows(unittest.TestCase):
+    def setUp(self):
+        self.data = [{"slug": f"p{i}", "sort_key": (i, f"p{i}")} for i in range(25)]
+        self.calls = []
+
+    def fetch(self, after, offset, limit):
+        self.calls.append((after, offset))
+        start = after[0] + 1 if after else offset
+        return self.data[start:start + limit]
+
+    def test_sequential_pages_use_keyset_cursor(self):
+        rows = PagedRows(self.fetch, len(self.data), page_size=10)
+        self.assertEqual(rows.page_count, 3)
+        self.assertEqual([r["slug"] for r in rows.page(1)], [f"p{i}" for i in range(10, 20)])
+        rows.page(0)
+        rows.page(1)
+        self.assertEqual(self.calls, [(None, 10), (None, 0)])
+        self.assertEqual(rows.page(2)[-1]["slug"], "p24")
+        self.assertEqual(self.calls[-1], ((19, "p19"), 0))
+        self.assertEqual(rows.page(3), [])
+
+    def test_page_cache_is_bounded(self):
+        rows = PagedRows(self.fetch, len(self.data), page_size=5, max_pages=2)
+        for index in range(5):
+            rows.page(index)
+        rows.page(0)
+        self.assertEqual(self.calls[-1], (None, 0))
+        self.assertEqual(len(self.calls), 6)
+
+    def test_scheduled_pages_load_in_background(self):
+        jobs = []
+        rows = PagedRows(lambda after, offset, limit, conn: self.fetch(after, offset, limit), len(self.data),
+                         page_size=10, schedule=lambda job, on_rows, on_error: jobs.append((job, on_rows)))
+        got = []
+        rows.request(1, got.append)
+        rows.request(1, got.append)
+        rows.request(2, got.append)
+        self.assertEqual((got, len(jobs)), ([], 2))
+        # the worker runs jobs in order, so page 2 finds page 1's cursor
+        results = [job("conn") for job, _ in jobs]
+        self.assertEqual(self.calls, [(None, 10), ((19, "p19"), 0)])
+        for (_, on_rows), result in zip(jobs, results):
+            on_rows(result)
+        self.assertEqual([len(r) for r in got], [10, 10, 5])
+        rows.request(1, got.append)
+        self.assertEqual(len(jobs), 2)
+
+    def test_iter_rows_walks_everything(self):
+        rows = PagedRows(self.fetch, len(self.data), page_size=10)
+        self.assertEqual([r["slug"] for r in rows.iter_rows()], [r["slug"] for r in self.data])
+
+
+class FakeTree:
+    """Just enough of ``ttk.Treeview`` for ``ChunkedTreeFiller``."""
+
+    def __init__(self):
+        self.rows = []
+        self.callbacks = []
+
+    def insert(self, parent, index, values):
+        self.rows.append(values)
+
+    def get_children(self):
+        return ()
+
+    def delete(self, *items):
+        pass
+
+    def after(self, ms, func):
+        self.callbacks.append(func)
+        return len(self.callbacks)
+
+    def after_cancel(self, after_id):
+        pass
+
+    def run(self):
+        while self.callbacks:
+            self.callbacks.pop(0)()
+
+
+class FakeViewTree:
+    """Just enough of ``ttk.Treeview`` for ``VirtualTreeview``."""
+
+    def __init__(self):
+        self.items = {}
+        self.order = []
+
+    def configure(self, **kwargs):
+        pass
+
+    def insert(self, parent, index, text, values):
+        item = f"I{len(self.items)}"
+        self.items[item] = (text, values)
+        self.order.insert(len(self.order) if index == "end" else index, item)
+        return item
+
+    def item(self, item, text, values):
+        self.items[item] = (text, values)
+
+    def exists(self, item):
+        return item in self.order
+
+    def get_children(self):
+        return tuple(self.order)
+
+    def delete(self, *items):
+        for item in items:
+            self.order.remove(item)
+
+    def yview(self):
+        return (0.0, 0.5)
+
+    def yview_moveto(self, fraction):
+        pass
+
+    def after_idle(self, func):
+        pass
+
+
+class TestVirtualTreeview(unittest.TestCase):
+    def test_placeholders_until_page_arrives(self):
+        data = [{"slug": f"p{i}", "sort_key": (i, f"p{i}")} for i in range(25)]
+        jobs = []
+        rows = PagedRows(lambda after, offset, limit, conn: data[(after[0] + 1 if after else offset):][:limit],
+                         len(data), page_size=10, schedule=lambda job, on_rows, on_error: jobs.append((job, on_rows)))
+        rows.store(0, data[:10])
+        tree = FakeViewTree()
+        view = VirtualTreeview(tree, mock.Mock(), lambda row: (row["slug"], (row["slug"],)))
+        view.set_rows(rows)
+        texts = [tree.items[item][0] for item in tree.order]
+        self.assertEqual(texts[:10], [f"p{i}" for i in range(10)])
+        self.assertEqual(texts[10:], [""] * 15)
+        for job, on_rows in jobs:
+            on_rows(job(None))
+        self.assertEqual([tree.items[item][0] for item in tree.order], [r["slug"] for r in data])
+
+
+class TestChunkedTreeFiller(unittest.TestCase):
+    def test_asks_for_more_once_drained(self):
+        tree, wanted = FakeTree(), []
+        filler = ChunkedTreeFiller(tree, on_empty=lambda: wanted.append(len(tree.rows)))
+        filler.feed([(1,), (2,)])
+        self.assertEqual(wanted, [])
+        tree.run()
+        filler.feed([(3,)])
+        tree.run()
+        self.assertEqual(wanted, [2, 3])
+        done = []
+        filler.finish(lambda: done.append(filler.inserted))
+        self.assertEqual(done, [3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Scan results memoized per plugin archive.
+
+``ArchiveMemo`` maps (SHA-256 of the plugin ZIP, scanner rule-set
+fingerprint) to the scan outcome (status, file counts and matches).
+When AuditManager sees an archive it has scanned before with the same rules
+- after a database reset, on another host, or for a fresh reporter - the
+result is returned without extracting or scanning. The store is a plain
+SQLite file; copy it between hosts or combine copies with ``merge``.
+"""
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+
+from .config import ARCHIVE_MEMO_PATH
+from .models import PluginResult, UploadMatch
+
+_COLUMNS = ("sha256", "ruleset", "slug", "status", "files_scanned", "matches", "created_at",
+            "files_skipped", "bytes_skipped")
+
+
+class ArchiveMemo:
+    """SQLite-backed ``(archive sha256, ruleset) -> PluginResult`` store."""
+
+    def __init__(self, db_path: Path = ARCHIVE_MEMO_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._init_db()
+
+    def _init_db(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS archive_results (
+                    sha256 TEXT NOT NULL,
+                    ruleset TEXT NOT NULL,
+                    slug TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    files_scanned INTEGER NOT NULL DEFAULT 0,
+                    matches TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    files_skipped INTEGER NOT NULL DEFAULT 0,
+                    bytes_skipped INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (sha256, ruleset)
+                ) WITHOUT ROWID
+            ''')
+            existing = {row[1] for row in conn.execute('PRAGMA table_info(archive_results)')}
+            for col in ("files_skipped", "bytes_skipped"):
+                if col not in existing:
+                    conn.execute(f'ALTER TABLE archive_results ADD COLUMN {col} INTEGER NOT NULL DEFAULT 0')
+            conn.commit()
+
+    def get(self, sha256: str, ruleset: str, slug: str) -> Optional[PluginResult]:
+        """A fresh PluginResult for ``slug`` if this archive was scanned with ``ruleset``."""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                'SELECT status, files_scanned, matches, files_skipped, bytes_skipped FROM archive_results '
+                'WHERE sha256 = ? AND ruleset = ?',
+                (sha256, ruleset),
+            ).fetchone()
+        # counters are shared by the download workers
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if row is None:
+            return None
+        status, files_scanned, matches, files_skipped, bytes_skipped = row
+        return PluginResult(
+            slug,
+            status,
+            upload_matches=[UploadMatch(**m) for m in json.loads(matches)],
+            files_scanned=files_scanned,
+            files_skipped=files_skipped,
+            bytes_skipped=bytes_skipped,
+        )
+
+    def put(self, sha256: str, ruleset: str, result: PluginResult) -> None:
+        if result.status.startswith("error:"):
+            return  # errors are not a property of the archive
+        matches = json.dumps([asdict(m) for m in result.upload_matches])
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    f'INSERT OR REPLACE INTO archive_results ({", ".join(_COLUMNS)}) '
+                    f'VALUES ({", ".join("?" * len(_COLUMNS))})',
+                    (sha256, ruleset, result.slug, result.status, result.files_scanned, matches, time.time(),
+                     result.files_skipped, result.bytes_skipped),
+                )
+                conn.commit()
+
+    def merge(self, other_path: Path) -> int:
+        """Import entries from another memo file; return the number added."""
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('ATTACH DATABASE ? AS other', (str(other_path),))
+                try:
+                    # older memo files may lack the newer columns
+                    theirs = {row[1] for row in conn.execute('PRAGMA other.table_info(archive_results)')}
+                    cols = ", ".join(c for c in _COLUMNS if c in theirs)
+                    before = conn.total_changes
+                    conn.execute(f'INSERT OR IGNORE INTO archive_results ({cols}) '
+                                 f'SELECT {cols} FROM other.archive_results')
+                    conn.commit()
+                    return conn.total_changes - before
+                finally:
+                    conn.execute('DETACH DATABASE other')
+
+    def __len__(self) -> int:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute('SELECT COUNT(*) FROM archive_results').fetchone()[0]
@@ -1,38 +1,145 @@
+"""保存済みプラグインの削除とディスク容量制限。
+
+Flagged (upload=True) slugs come from the active reporter in one query
+(or from the slug/upload columns of the CSV), and directories are
+removed in parallel. ``DiskQuota`` keeps ``SAVE_SOURCE``/``SAVE_ZIP`` and an
+optional ``SourceStore`` under a size limit by evicting whole slugs.
+"""
+import os
+import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterable, Optional
 import pandas as pd
-import shutil
 
-from .config import SAVE_SOURCE, CSV_PATH
+from .config import SAVE_SOURCE, SAVE_ZIP, CSV_PATH, DEFAULT_WORKERS, DISK_QUOTA_LOW_WATERMARK
+from .reporter import IReporter
+from .source_store import SourceStore
 
-def clean_saved_plugins_only_true():
-    """plugin_upload_audit.csv を読み込み、upload=True 以外の保存済みプラグインを削除。"""
+QUOTA_POLICIES = ("lru", "oldest-audit")
+
+
+def flagged_slugs(reporter: Optional[IReporter] = None) -> Optional[set[str]]:
+    """upload=True のslug。reporter がなければ CSV の slug/upload 列だけを読む（無ければ None）。"""
+    if reporter is not None:
+        try:
+            return reporter.flagged_slugs()
+        except NotImplementedError:
+            pass
     if not CSV_PATH.exists():
-        print("[!] CSV file not found; skipping cleanup.")
-        return
+        return None
+    try:
+        df = pd.read_csv(CSV_PATH, usecols=["slug", "upload"], dtype=str)
+    except Exception as e:
+        print(f"[!] Failed to read CSV: {e}")
+        return None
+    return set(df.loc[df["upload"] == "True", "slug"])
 
+
+def audit_times(reporter: Optional[IReporter] = None) -> dict[str, str]:
+    """slug -> latest audit timestamp, from the reporter or the CSV."""
+    if reporter is not None:
+        try:
+            return reporter.audit_times()
+        except NotImplementedError:
+            pass
+    if not CSV_PATH.exists():
+        return {}
     try:
-        df = pd.read_csv(CSV_PATH)
+        df = pd.read_csv(CSV_PATH, usecols=["slug", "timestamp"], dtype=str)
     except Exception as e:
         print(f"[!] Failed to read CSV: {e}")
+        return {}
+    return df.groupby("slug")["timestamp"].max().to_dict()
+
+
+def _remove(path: Path) -> bool:
+    try:
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+        return True
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        print(f"[!] Failed to delete {path}: {e}")
+        return False
+
+
+def _remove_paths(paths: Iterable[Path], max_workers: int = DEFAULT_WORKERS) -> int:
+    """Delete files/directories in parallel; return how many were removed."""
+    paths = list(paths)
+    if not paths:
+        return 0
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        return sum(ex.map(_remove, paths))
+
+
+def _tree_size(path: Path) -> tuple[int, float]:
+    """(total bytes, latest access/modification time) of a file or directory tree."""
+    st = path.stat()
+    size, used = (st.st_size, max(st.st_atime, st.st_mtime)) if path.is_file() else (0, st.st_mtime)
+    stack = [path] if path.is_dir() else []
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                else:
+                    est = entry.stat(follow_symlinks=False)
+                    size += est.st_size
+                    used = max(used, est.st_atime, est.st_mtime)
+    return size, used
+
+
+def parse_size(text: str) -> int:
+    """'500M', '20G', '1.5T' or plain bytes -> bytes."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*", text, re.I)
+    if not m:
+        raise ValueError(f"invalid size: {text}")
+    return int(float(m.group(1)) * 1024 ** " KMGT".index(m.group(2).upper() or " "))
+
+
+def clean_saved_plugins_only_true(
+    store: Optional[SourceStore] = None,
+    reporter: Optional[IReporter] = None,
+    max_workers: int = DEFAULT_WORKERS,
+):
+    """upload=True 以外の保存済みプラグインを削除。
+
+    flagged slug は reporter（無ければ CSV）から取得する。``store`` が指定された
+    場合は SourceStore から削除し、不要になったパックを再構成する。
+    """
+    true_slugs = flagged_slugs(reporter)
+    if true_slugs is None:
+        print("[!] No audit results found; skipping cleanup.")
         return
 
-    true_slugs = set(df[df["upload"] == "True"]["slug"].astype(str))
-    all_dirs = list(SAVE_SOURCE.glob("*"))
+    if store is not None:
+        removed = store.delete(s for s in store.slugs() if s not in true_slugs)
+        freed = store.repack()
+        print(f"[i] Cleanup complete. Removed {removed} plugin(s) not marked as upload=True "
+              f"({freed / 1e6:.1f} MB freed).")
+        return
 
-    removed = 0
-    for d in all_dirs:
-        if d.is_dir() and d.name not in true_slugs:
-            try:
-                shutil.rmtree(d)
-                removed += 1
-            except Exception as e:
-                print(f"[!] Failed to delete {d}: {e}")
+    if not SAVE_SOURCE.exists():
+        return
+    with os.scandir(SAVE_SOURCE) as entries:
+        doomed = [Path(e.path) for e in entries if e.is_dir() and e.name not in true_slugs]
+    removed = _remove_paths(doomed, max_workers)
 
     print(f"[i] Cleanup complete. Removed {removed} plugin(s) not marked as upload=True.")
-    
 
-def clean_saved_plugins():
+
+def clean_saved_plugins(store: Optional[SourceStore] = None):
     """全ての保存済みプラグインを削除。"""
+    if store is not None:
+        store.clear()
+        print("[i] All stored plugins have been removed.")
+        return
     if not SAVE_SOURCE.exists():
         print("[!] Save root does not exist; skipping cleanup.")
         return
@@ -42,3 +149,114 @@ def clean_saved_plugins():
         print("[i] All saved plugins have been removed.")
     except Exception as e:
         print(f"[!] Failed to remove saved plugins: {e}")
+
+
+class DiskQuota:
+    """Keep saved sources and ZIPs under ``max_bytes`` by evicting whole slugs.
+
+    Slugs that are not upload=True go first; within each group ``policy``
+    decides: "lru" evicts the least recently used files first,
+    "oldest-audit" the slugs with the oldest audit timestamp (slugs not yet
+    reported count as newest). Eviction goes down to
+    ``DISK_QUOTA_LOW_WATERMARK`` of the quota, so it does not run again for
+    the next saved plugin. ``charge`` keeps a running estimate between scans.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        *,
+        policy: str = "lru",
+        reporter: Optional[IReporter] = None,
+        store: Optional[SourceStore] = None,
+        roots: tuple = (SAVE_SOURCE, SAVE_ZIP),
+        max_workers: int = DEFAULT_WORKERS,
+    ):
+        if policy not in QUOTA_POLICIES:
+            raise ValueError(f"unknown quota policy: {policy} (choose from {', '.join(QUOTA_POLICIES)})")
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.reporter = reporter
+        self.store = store
+        self.roots = tuple(Path(r) for r in roots)
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._estimate: Optional[int] = None  # bytes in use; None until measured
+        self._enforcing = False
+
+    def usage(self) -> dict[str, list]:
+        """slug -> [bytes, last used, paths], measured in parallel."""
+        candidates = []
+        for root in self.roots:
+            if not root.exists():
+                continue
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    slug = entry.name[:-4] if entry.is_file() and entry.name.endswith(".zip") else entry.name
+                    candidates.append((slug, Path(entry.path)))
+        usage: dict[str, list] = {}
+
+        def measure(candidate):
+            try:
+                return _tree_size(candidate[1])
+            except OSError:
+                return 0, 0.0  # removed meanwhile
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
+            for (slug, path), (size, used) in zip(candidates, ex.map(measure, candidates)):
+                entry = usage.setdefault(slug, [0, 0.0, []])
+                entry[0] += size
+                entry[1] = max(entry[1], used)
+                entry[2].append(path)
+        if self.store is not None:
+            stats = self.store.stats()
+            # pack bytes shared out in proportion to each slug's raw size
+            ratio = stats["pack_bytes"] / stats["source_bytes"] if stats["source_bytes"] else 0.0
+            for slug, (stored_at, size) in self.store.usage().items():
+                entry = usage.setdefault(slug, [0, 0.0, []])
+                entry[0] += int(size * ratio)
+                entry[1] = max(entry[1], stored_at)
+        return usage
+
+    def _eviction_order(self, usage: dict[str, list]) -> list[str]:
+        flagged = flagged_slugs(self.reporter) or set()
+        if self.policy == "oldest-audit":
+            times = audit_times(self.reporter)
+            return sorted(usage, key=lambda s: (s in flagged, times.get(s, "~")))
+        return sorted(usage, key=lambda s: (s in flagged, usage[s][1]))
+
+    def enforce(self) -> tuple[list[str], int]:
+        """Measure usage and evict slugs if over quota; return (evicted, bytes freed)."""
+        usage = self.usage()
+        total = sum(entry[0] for entry in usage.values())
+        evicted, freed = [], 0
+        if total > self.max_bytes:
+            target = self.max_bytes * DISK_QUOTA_LOW_WATERMARK
+            for slug in self._eviction_order(usage):
+                if total - freed <= target:
+                    break
+                evicted.append(slug)
+                freed += usage[slug][0]
+            _remove_paths([p for slug in evicted for p in usage[slug][2]], self.max_workers)
+            if self.store is not None:
+                self.store.delete(evicted)
+                self.store.repack(min_garbage=0.2)
+            print(f"[i] Disk quota: evicted {len(evicted)} plugin(s), {freed / 1e6:.1f} MB freed")
+        with self._lock:
+            self._estimate = total - freed
+        return evicted, freed
+
+    def charge(self, nbytes: int) -> None:
+        """Account for ``nbytes`` just saved; enforce once the estimate passes the quota."""
+        with self._lock:
+            if self._estimate is not None:
+                self._estimate += nbytes
+            over = self._estimate is None or self._estimate > self.max_bytes
+            if not over or self._enforcing:
+                return
+            self._enforcing = True
+        try:
+            self.enforce()
+        finally:
+            with self._lock:
+                self._enforcing = False
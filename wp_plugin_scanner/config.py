@@ -1,3 +1,4 @@
+import os
 import re
 from pathlib import Path
 
@@ -9,13 +10,40 @@ CSV_PATH = Path("plugin_upload_audit.csv")
 CSV_DETAILS_PATH = Path("plugin_upload_audit_details.csv")
 SAVE_SOURCE = Path("saved_sources")
 SAVE_ZIP = Path("saved_zips")
+SOURCE_STORE_PATH = Path("source_store")  # packed, deduplicated alternative to SAVE_SOURCE
+SOURCE_PACK_MAX_BYTES = 256 * 1024 * 1024  # start a new pack file past this size
+DISK_QUOTA_LOW_WATERMARK = 0.9  # eviction frees space down to this share of --disk-quota
 MAX_SEARCH_RESULTS = 100
+HTTP_CACHE_PATH = Path("http_cache.db")
+HTTP_CACHE_TTL = 24 * 60 * 60  # seconds
+HTTP_CACHE_MAX_BYTES = 256 * 1024 * 1024
+LOG_VIEW_MAX_LINES = 5000  # lines kept in the GUI log box
+LOG_FILE_PATH = Path("logs/audit_gui.log")  # None disables the log file
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUPS = 5
+JOB_JOURNAL_PATH = Path("audit_jobs.db")
+DEFAULT_MAX_ATTEMPTS = 3  # per slug, across resumes
+SCAN_CACHE_PATH = Path("scan_cache.db")  # per-file matches keyed by content hash
+# plugin results keyed by ZIP sha256 + rule set; point several hosts at copies of one file
+ARCHIVE_MEMO_PATH = Path(os.environ.get("WP_SCANNER_ARCHIVE_MEMO", "archive_memo.db"))
+METRICS_INTERVAL = 5.0  # seconds between metrics callbacks / textfile updates
+
+MATCH_CONTEXT_LINES = 2  # lines kept before/after each match in the audit results
+MATCH_CONTEXT_MAX_CHARS = 300  # per context line; minified code can have very long lines
 
 UPLOAD_PATTERN = re.compile(
     rb"(wp_handle_upload|media_handle_upload|\$_FILES\b)",
     re.I | re.S,
 )
 
-ZIP_URL_TMPL = "https://downloads.wordpress.org/plugin/{slug}.latest-stable.zip"
-SEARCH_URL_TMPL = "https://wordpress.org/plugins/search/{kw}/page/{page}/"
+# upstream hosts; see endpoints.py for the local mirror mode
+DOWNLOADS_URL = "https://downloads.wordpress.org"
+API_URL = "https://api.wordpress.org"
+SITE_URL = "https://wordpress.org"
+MIRROR_URL = os.environ.get("WP_SCANNER_MIRROR_URL") or None  # caching mirror server
+MIRROR_DIR = Path(os.environ["WP_SCANNER_MIRROR_DIR"]) if os.environ.get("WP_SCANNER_MIRROR_DIR") else None
+MIRROR_FALLBACK = os.environ.get("WP_SCANNER_UPSTREAM_FALLBACK", "1") != "0"
+
+ZIP_URL_TMPL = DOWNLOADS_URL + "/plugin/{slug}.latest-stable.zip"
+SEARCH_URL_TMPL = SITE_URL + "/plugins/search/{kw}/page/{page}/"
 SLUG_RE = re.compile(r"https://wordpress\.org/plugins/([a-z0-9\-]+)/")
@@ -1,9 +1,16 @@
 from __future__ import annotations
+import glob
 import io
+import os
+import re
 import tempfile
+import threading
+import time
 import zipfile
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Iterator, Optional
 
 import requests
 from requests.adapters import HTTPAdapter, Retry
@@ -11,15 +18,24 @@ from requests.adapters import HTTPAdapter, Retry
 from .config import (
     DEFAULT_RETRIES,
     DEFAULT_TIMEOUT,
+    DEFAULT_WORKERS,
     BACKOFF_FACTOR,
-    ZIP_URL_TMPL,
     CSV_PATH,
 )
+from . import endpoints, metrics
+from .path_rules import PathRules, SkipStats
 
 class IPluginDownloader:
     def download(self, slug: str) -> Path:
         raise NotImplementedError
 
+    def fetch_archive(self, slug: str) -> bytes | Path | None:
+        """The plugin ZIP itself (bytes or a local file), or None if not supported.
+
+        Lets AuditManager identify an archive by its digest before extracting it.
+        """
+        return None
+
 class RequestsDownloader(IPluginDownloader):
     def __init__(self, retries: int = DEFAULT_RETRIES, timeout: int = DEFAULT_TIMEOUT):
         self.timeout = timeout
@@ -32,46 +48,200 @@ class RequestsDownloader(IPluginDownloader):
             raise_on_status=False,
         )
         self.session.mount("https://", HTTPAdapter(max_retries=retry_conf))
+        endpoints.configure_session(self.session, max_retries=retry_conf)
 
-    def download(self, slug: str) -> Path:
-        url = ZIP_URL_TMPL.format(slug=slug)
+    def fetch_archive(self, slug: str) -> bytes:
+        url = endpoints.zip_url(slug)
         try:
-            res = self.session.get(url, timeout=self.timeout)
-            res.raise_for_status()
+            with metrics.stage("download"):
+                res = self.session.get(url, timeout=self.timeout)
+                res.raise_for_status()
         except requests.RequestException as e:
             raise RuntimeError(f"Download failed for {slug}: {e}") from e
-        tmp_root = Path(tempfile.mkdtemp())
-        with zipfile.ZipFile(io.BytesIO(res.content)) as zf:
-            zf.extractall(tmp_root)
-            top = zf.namelist()[0].split("/")[0]
-        return tmp_root / top
-
-def download_true_plugin_zips(destination: Path):
-    """upload=True のプラグインZIPを destination にダウンロード"""
+        metrics.add_bytes("download", len(res.content))
+        return res.content
+
+    def download(self, slug: str) -> Path:
+        data = self.fetch_archive(slug)
+        with metrics.stage("extract"):
+            return extract_plugin_zip(io.BytesIO(data), slug)
+
+
+def extract_plugin_zip(
+    source,
+    slug: str,
+    rules: Optional[PathRules] = None,
+    skipped: Optional[SkipStats] = None,
+    exts: tuple[str, ...] = (),
+) -> Path:
+    """Extract a plugin ZIP into a fresh temp directory and return the plugin root.
+
+    Archives from wordpress.org contain a single ``{slug}/`` folder; archives
+    written by ``AuditManager._save_zip_archive`` have the files at the top
+    level and are extracted into ``{slug}/``. The caller removes the parent.
+    Members excluded by ``rules`` are not extracted; those ending with
+    ``exts`` are counted in ``skipped``.
+    """
+    tmp_root = Path(tempfile.mkdtemp())
+    with zipfile.ZipFile(source) as zf:
+        names = zf.namelist()
+        tops = {name.split("/", 1)[0] for name in names}
+        nested = len(tops) == 1 and any("/" in name for name in names)
+        dest, root = (tmp_root, tmp_root / tops.pop()) if nested else (tmp_root / slug, tmp_root / slug)
+        if not rules:
+            zf.extractall(dest)
+            return root
+        for info in zf.infolist():
+            relpath = info.filename.split("/", 1)[1] if nested else info.filename
+            if info.is_dir() or not relpath:
+                continue
+            if rules.excludes(relpath, info.file_size):
+                if skipped is not None and relpath.lower().endswith(exts):
+                    skipped.add(info.file_size)
+                continue
+            zf.extract(info, dest)
+        root.mkdir(parents=True, exist_ok=True)
+        return root
+
+
+_ZIP_SUFFIX_RE = re.compile(r"(\.latest-stable|\.\d+(\.\d+)*)?\.zip$", re.I)
+
+
+class LocalZipDownloader(IPluginDownloader):
+    """Serve plugins from local ZIP files instead of the network.
+
+    ``source`` is a directory of ``{slug}.zip`` files (as written by
+    ``download_true_plugin_zips`` and the GUI ZIP saver) or a glob pattern.
+    ``slug.latest-stable.zip`` and ``slug.1.2.3.zip`` names map to ``slug``.
+    """
+
+    def __init__(self, source: str | Path):
+        self.source = str(source)
+        self.paths: dict[str, Path] = {}
+        for path in self._iter_files():
+            self.paths.setdefault(self.slug_for(path), path)
+
+    def _iter_files(self) -> Iterator[Path]:
+        if os.path.isdir(self.source):
+            with os.scandir(self.source) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.lower().endswith(".zip"):
+                        yield Path(entry.path)
+        else:
+            for name in glob.iglob(self.source, recursive=True):
+                if name.lower().endswith(".zip") and os.path.isfile(name):
+                    yield Path(name)
+
+    @staticmethod
+    def slug_for(path: Path) -> str:
+        return _ZIP_SUFFIX_RE.sub("", path.name)
+
+    def slugs(self) -> list[str]:
+        return sorted(self.paths)
+
+    def fetch_archive(self, slug: str) -> Path:
+        path = self.paths.get(slug)
+        if path is None:
+            raise RuntimeError(f"No local ZIP for {slug}")
+        metrics.add_bytes("download", path.stat().st_size)
+        return path
+
+    def download(self, slug: str) -> Path:
+        path = self.fetch_archive(slug)
+        try:
+            with metrics.stage("extract"):
+                return extract_plugin_zip(path, slug)
+        except (zipfile.BadZipFile, OSError) as e:
+            raise RuntimeError(f"Broken ZIP for {slug}: {e}") from e
+
+def _is_complete_zip(path: Path, check_crc: bool = False) -> bool:
+    """True if ``path`` is a readable ZIP; a truncated download has no central directory."""
+    try:
+        with zipfile.ZipFile(path) as zf:
+            return not check_crc or zf.testzip() is None
+    except (zipfile.BadZipFile, OSError, EOFError):
+        return False
+
+
+def download_true_plugin_zips(
+    destination: Path,
+    *,
+    max_workers: int = DEFAULT_WORKERS,
+    session: requests.Session | None = None,
+    progress_cb: Callable[[str], None] | None = None,
+) -> dict:
+    """upload=True のプラグインZIPを destination に並列ダウンロード
+
+    Each ZIP is streamed to ``{slug}.zip.part``, verified, and renamed into
+    place, so an interrupted run never leaves a truncated ``{slug}.zip``
+    behind; existing files that fail verification are downloaded again.
+    Returns counts of downloaded, existing and failed slugs plus bytes/sec.
+    """
+    log = progress_cb or print
+    counts = {"downloaded": 0, "existing": 0, "failed": 0, "bytes": 0}
     if not CSV_PATH.exists():
         print("[!] plugin_upload_audit.csv が存在しません")
-        return
+        return counts
 
     try:
-        df = pd.read_csv(CSV_PATH)
+        df = pd.read_csv(CSV_PATH, usecols=["slug", "upload"])
     except Exception as e:
         print(f"[!] CSV読み込み失敗: {e}")
-        return
+        return counts
 
-    true_slugs = df[df["upload"] == "True"]["slug"].astype(str)
+    # pandas reads the column as bool when every row is True/False
+    true_slugs = df[df["upload"].astype(str) == "True"]["slug"].astype(str).drop_duplicates()
     destination.mkdir(parents=True, exist_ok=True)
+    if session is None:
+        session = requests.Session()
+        retry_conf = Retry(
+            total=DEFAULT_RETRIES,
+            backoff_factor=BACKOFF_FACTOR,
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=["GET"],
+            raise_on_status=False,
+        )
+        # one pooled connection per worker
+        adapter_kwargs = {"max_retries": retry_conf, "pool_connections": max_workers, "pool_maxsize": max_workers}
+        session.mount("https://", HTTPAdapter(**adapter_kwargs))
+        endpoints.configure_session(session, **adapter_kwargs)
+    lock = threading.Lock()
+    start = time.perf_counter()
 
-    for slug in true_slugs:
-        zip_url = ZIP_URL_TMPL.format(slug=slug)
+    def fetch(slug: str) -> None:
         out_path = destination / f"{slug}.zip"
-        if out_path.exists():
-            print(f"[=] 既に存在: {out_path}")
-            continue
-        try:
-            print(f"[↓] ダウンロード中: {slug}")
-            res = requests.get(zip_url, timeout=30)
-            res.raise_for_status()
-            out_path.write_bytes(res.content)
-            print(f"[✔] 保存完了: {out_path}")
-        except Exception as e:
-            print(f"[!] ダウンロード失敗: {slug}: {e}")
+        if out_path.exists() and _is_complete_zip(out_path):
+            outcome, size = "existing", 0
+        else:
+            part = out_path.with_name(out_path.name + ".part")
+            size = 0
+            try:
+                with session.get(endpoints.zip_url(slug), timeout=DEFAULT_TIMEOUT, stream=True) as res:
+                    res.raise_for_status()
+                    with open(part, "wb") as f:
+                        for chunk in res.iter_content(chunk_size=1 << 16):
+                            f.write(chunk)
+                            size += len(chunk)
+                if not _is_complete_zip(part, check_crc=True):
+                    raise RuntimeError("壊れたZIP")
+                os.replace(part, out_path)
+                outcome = "downloaded"
+            except Exception as e:
+                part.unlink(missing_ok=True)
+                log(f"[!] ダウンロード失敗: {slug}: {e}")
+                outcome = "failed"
+        with lock:
+            counts[outcome] += 1
+            counts["bytes"] += size
+
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        for done, _ in enumerate(ex.map(fetch, true_slugs), start=1):
+            if done % 100 == 0:
+                elapsed = time.perf_counter() - start
+                log(f"[↓] {done}/{len(true_slugs)} {counts['bytes'] / elapsed / 1e6:.2f} MB/s")
+    seconds = time.perf_counter() - start
+    counts["seconds"] = round(seconds, 3)
+    counts["bytes_per_second"] = round(counts["bytes"] / seconds, 1) if seconds else 0.0
+    log(f"[✔] ZIP保存: {counts['downloaded']} 件新規, {counts['existing']} 件既存, {counts['failed']} 件失敗 "
+        f"({counts['bytes_per_second'] / 1e6:.2f} MB/s) -> {destination}")
+    return counts
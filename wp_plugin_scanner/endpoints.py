@@ -0,0 +1,233 @@
+"""WordPress.org endpoints and the optional local mirror.
+
+All URLs the scanner requests are built here. Sessions passed through
+``configure_session`` get a ``MirrorAdapter`` for the wordpress.org hosts
+while a mirror is configured: a request is answered from a pre-synced
+directory tree, then from a caching mirror server, and only then from
+upstream (unless the fallback is disabled).
+
+Both mirror kinds use the same layout, ``<host>/<path>``, with
+directory-style paths stored as ``index.html``::
+
+    downloads.wordpress.org/plugin/akismet.latest-stable.zip
+    api.wordpress.org/plugins/info/1.0/akismet.json
+    wordpress.org/plugins/browse/popular/page/1/index.html
+
+``sync_mirror`` fills a directory tree from upstream.
+"""
+from __future__ import annotations
+
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+from urllib.parse import quote, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import (
+    API_URL,
+    DEFAULT_TIMEOUT,
+    DEFAULT_WORKERS,
+    DOWNLOADS_URL,
+    MIRROR_DIR,
+    MIRROR_FALLBACK,
+    MIRROR_URL,
+    SITE_URL,
+)
+
+UPSTREAM_HOSTS = tuple(urlsplit(u).netloc for u in (DOWNLOADS_URL, API_URL, SITE_URL))
+
+
+@dataclass
+class MirrorSettings:
+    url: Optional[str] = MIRROR_URL
+    directory: Optional[Path] = MIRROR_DIR
+    fallback: bool = MIRROR_FALLBACK
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.url or self.directory) or not self.fallback
+
+
+_settings = MirrorSettings()
+
+
+def configure(url: Optional[str] = None, directory: Optional[Path] = None, fallback: bool = True) -> MirrorSettings:
+    """Set the process-wide mirror; affects sessions configured afterwards."""
+    global _settings
+    _settings = MirrorSettings(url.rstrip("/") if url else None, Path(directory) if directory else None, fallback)
+    return _settings
+
+
+def settings() -> MirrorSettings:
+    return _settings
+
+
+# -- URL builders -------------------------------------------------------------
+def zip_url(slug: str) -> str:
+    return f"{DOWNLOADS_URL}/plugin/{slug}.latest-stable.zip"
+
+
+def info_url(slug: str) -> str:
+    return f"{API_URL}/plugins/info/1.0/{slug}.json"
+
+
+def plugin_page_url(slug: str) -> str:
+    return f"{SITE_URL}/plugins/{slug}/"
+
+
+def browse_url(category: str, page: int) -> str:
+    return f"{SITE_URL}/plugins/browse/{category}/page/{page}/"
+
+
+def search_url(keyword: str, page: int) -> str:
+    return f"{SITE_URL}/plugins/search/{quote(keyword)}/page/{page}/"
+
+
+def site_url(path: str = "") -> str:
+    return f"{SITE_URL}/{path.lstrip('/')}"
+
+
+def mirror_path(url: str) -> Optional[str]:
+    """Relative mirror path of an upstream URL, or None for other hosts."""
+    parts = urlsplit(url)
+    if parts.netloc not in UPSTREAM_HOSTS:
+        return None
+    path = parts.path or "/"
+    if path.endswith("/"):
+        path += "index.html"
+    return parts.netloc + path
+
+
+# -- session adapter ----------------------------------------------------------
+class MirrorAdapter(HTTPAdapter):
+    """Serves wordpress.org GETs from the mirror before going upstream."""
+
+    def __init__(self, mirror: MirrorSettings, **kwargs):
+        self.mirror = mirror
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        relpath = mirror_path(request.url) if request.method == "GET" else None
+        if relpath:
+            if self.mirror.directory is not None:
+                local = self.mirror.directory / relpath
+                if local.is_file():
+                    return self._file_response(request, local)
+            if self.mirror.url:
+                mirrored = request.copy()
+                mirrored.url = f"{self.mirror.url}/{relpath}"
+                try:
+                    res = super().send(mirrored, **kwargs)
+                    if res.status_code < 400 or not self.mirror.fallback:
+                        return res
+                    res.close()
+                except requests.RequestException as e:
+                    if not self.mirror.fallback:
+                        raise
+                    print(f"DEBUG: mirror failed for {relpath}, using upstream: {e}")
+            if not self.mirror.fallback:
+                return self._not_found(request)
+        return super().send(request, **kwargs)
+
+    @staticmethod
+    def _response(request, status: int, reason: str, data: bytes) -> requests.Response:
+        res = requests.Response()
+        res.status_code = status
+        res.reason = reason
+        # body already read: iter_content serves _content, close() has a real stream
+        res._content = data
+        res._content_consumed = True
+        res.raw = io.BytesIO(data)
+        res.headers["Content-Length"] = str(len(data))
+        res.url = request.url
+        res.request = request
+        return res
+
+    @classmethod
+    def _file_response(cls, request, path: Path) -> requests.Response:
+        return cls._response(request, 200, "OK", path.read_bytes())
+
+    @classmethod
+    def _not_found(cls, request) -> requests.Response:
+        return cls._response(request, 404, "Not Found (mirror only)", b"")
+
+
+def configure_session(session: requests.Session, **adapter_kwargs) -> requests.Session:
+    """Route the wordpress.org hosts of ``session`` through the mirror, if any.
+
+    ``adapter_kwargs`` (e.g. ``max_retries``) are passed to the adapter.
+    """
+    mirror = settings()
+    if mirror.enabled:
+        adapter = MirrorAdapter(mirror, **adapter_kwargs)
+        for host in UPSTREAM_HOSTS:
+            session.mount(f"https://{host}/", adapter)
+    return session
+
+
+# -- syncing a directory mirror -------------------------------------------------
+def sync_mirror(
+    urls: Iterable[str],
+    directory: Path,
+    *,
+    session: Optional[requests.Session] = None,
+    overwrite: bool = False,
+    max_workers: int = DEFAULT_WORKERS,
+    progress_cb: Optional[Callable[[str], None]] = None,
+) -> dict:
+    """Download upstream ``urls`` into the mirror tree at ``directory``.
+
+    Files already present are skipped unless ``overwrite``. Returns counts of
+    fetched, skipped and failed URLs.
+    """
+    session = session or requests.Session()  # always upstream, never the mirror
+    directory = Path(directory)
+    counts = {"fetched": 0, "skipped": 0, "failed": 0}
+    lock = threading.Lock()
+    log = progress_cb or print
+
+    def fetch(url: str) -> None:
+        relpath = mirror_path(url)
+        if relpath is None:
+            outcome = "failed"
+        elif (directory / relpath).exists() and not overwrite:
+            outcome = "skipped"
+        else:
+            target = directory / relpath
+            try:
+                res = session.get(url, timeout=DEFAULT_TIMEOUT)
+                res.raise_for_status()
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp = target.with_name(target.name + ".part")
+                tmp.write_bytes(res.content)
+                os.replace(tmp, target)
+                outcome = "fetched"
+            except Exception as e:
+                log(f"[!] {url}: {e}")
+                outcome = "failed"
+        with lock:
+            counts[outcome] += 1
+
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        batch = []
+        for url in urls:
+            batch.append(url)
+            if len(batch) >= max_workers * 4:
+                list(ex.map(fetch, batch))
+                batch = []
+                log(f"[i] mirror sync: {counts}")
+        list(ex.map(fetch, batch))
+    return counts
+
+
+def plugin_urls(slugs: Iterable[str]) -> Iterable[str]:
+    """ZIP and plugins-API URLs of each slug, for ``sync_mirror``."""
+    for slug in slugs:
+        yield zip_url(slug)
+        yield info_url(slug)
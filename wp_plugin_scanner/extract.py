@@ -1,69 +1,238 @@
-import os
-import re
-import pandas as pd
+"""upload=True のプラグインからマッチ行を抽出する。
+
+Results go into one SQLite file (``scanned_plugins/matches.db``) instead of a
+CSV per slug. A manifest keeps the fingerprint of each slug's sources and of
+the rule set at its last extraction, so unchanged plugins are skipped; the
+rest are scanned in a process pool and written in bulk.
+"""
+import hashlib
+import io
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import BinaryIO, Iterable, Optional
 
-from wp_plugin_scanner.config import SAVE_SOURCE, CSV_PATH, UPLOAD_PATTERN
+from wp_plugin_scanner.cleanup import flagged_slugs
+from wp_plugin_scanner.config import SAVE_SOURCE, UPLOAD_PATTERN
+from wp_plugin_scanner.path_rules import PathRules, walk_files
+from wp_plugin_scanner.reporter import IReporter
+from wp_plugin_scanner.scanner import ruleset_fingerprint
+from wp_plugin_scanner.source_store import SourceStore
 
 
 # 出力フォルダ
 SCAN_OUTPUT_DIR = Path("scanned_plugins")
-SCAN_OUTPUT_DIR.mkdir(exist_ok=True)
+EXTRACT_DB_PATH = SCAN_OUTPUT_DIR / "matches.db"
 
 TARGET_EXTS = (".php", ".js", ".html", ".twig")
+EXTRACT_VERSION = "2"  # bump when the line extraction itself changes
+EXTRACT_RULESET = f"{EXTRACT_VERSION}:{ruleset_fingerprint(UPLOAD_PATTERN, TARGET_EXTS)}"
+
+
+def _scan_stream(f: BinaryIO) -> list[tuple[int, str]]:
+    matches = []
+    for lineno, line in enumerate(f, 1):
+        if UPLOAD_PATTERN.search(line):
+            try:
+                line_text = line.decode("utf-8", errors="replace").strip()
+            except Exception:
+                line_text = "<decode error>"
+            matches.append((lineno, line_text))
+    return matches
 
 
 def scan_file_for_uploads(file_path: Path) -> list[tuple[int, str]]:
     """1ファイル内で該当パターンを含む行番号と内容を取得"""
-    matches = []
     try:
         with open(file_path, "rb") as f:
-            for lineno, line in enumerate(f, 1):
-                if UPLOAD_PATTERN.search(line):
-                    try:
-                        line_text = line.decode("utf-8", errors="replace").strip()
-                    except Exception:
-                        line_text = "<decode error>"
-                    matches.append((lineno, line_text))
+            return _scan_stream(f)
     except Exception as e:
         print(f"[!] Error reading {file_path}: {e}")
-    return matches
+        return []
+
 
+def _target_files(plugin_dir: Path, rules: Optional[PathRules] = None) -> list[Path]:
+    return sorted(walk_files(plugin_dir, TARGET_EXTS, rules))
 
-def scan_plugin_dir(slug: str, plugin_dir: Path):
-    """1つのプラグインディレクトリをスキャンし、結果を CSV に保存"""
+
+def dir_fingerprint(plugin_dir: Path, rules: Optional[PathRules] = None) -> str:
+    """Digest of (path, size, mtime) of the target files; stat only, no reads."""
+    h = hashlib.blake2b(digest_size=16)
+    for path in _target_files(plugin_dir, rules):
+        st = path.stat()
+        h.update(f"{path.relative_to(plugin_dir).as_posix()}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+def scan_plugin_dir(plugin_dir: Path, rules: Optional[PathRules] = None) -> list[tuple[str, int, str]]:
+    """1つのプラグインディレクトリをスキャンし、(file, line, matched_text) を返す"""
     results = []
-    for root, _, files in os.walk(plugin_dir):
-        for fname in files:
-            if not fname.lower().endswith(TARGET_EXTS):
-                continue
-            file_path = Path(root) / fname
-            for lineno, content in scan_file_for_uploads(file_path):
-                results.append((str(file_path.relative_to(plugin_dir)), lineno, content))
+    for file_path in _target_files(plugin_dir, rules):
+        for lineno, content in scan_file_for_uploads(file_path):
+            results.append((file_path.relative_to(plugin_dir).as_posix(), lineno, content))
+    return results
+
+
+def scan_plugin_store(slug: str, store: SourceStore, rules: Optional[PathRules] = None) -> list[tuple[str, int, str]]:
+    """SourceStore に保存されたプラグインをスキャンし、(file, line, matched_text) を返す"""
+    results = []
+    for path, data in store.iter_files(slug):
+        if not path.lower().endswith(TARGET_EXTS):
+            continue
+        if rules and rules.excludes(path, len(data)):
+            continue
+        for lineno, content in _scan_stream(io.BytesIO(data)):
+            results.append((path, lineno, content))
+    return sorted(results)
+
 
-    if results:
-        df = pd.DataFrame(results, columns=["file", "line", "matched_text"])
-        df.to_csv(SCAN_OUTPUT_DIR / f"{slug}.csv", index=False)
+_worker_stores: dict[str, SourceStore] = {}  # one SourceStore per worker process
 
 
-def scan_all_true_plugins():
-    """upload=True のプラグインだけを再スキャンし、CSV 出力する"""
-    if not CSV_PATH.exists():
-        print("[!] plugin_upload_audit.csv not found")
-        return
+def _extract_slug(slug: str, source: str, store_root: Optional[str], previous: Optional[str],
+                  rules: Optional[PathRules]) -> tuple:
+    """(fingerprint or None without saved sources, rows or None when unchanged)."""
+    if store_root is not None:
+        store = _worker_stores.get(store_root)
+        if store is None:
+            store = _worker_stores[store_root] = SourceStore(Path(store_root))
+        fingerprint = store.fingerprint(slug)
+        if fingerprint is None or fingerprint == previous:
+            return fingerprint, None
+        return fingerprint, scan_plugin_store(slug, store, rules)
+    plugin_dir = Path(source)
+    if not plugin_dir.is_dir():
+        return None, None
+    fingerprint = dir_fingerprint(plugin_dir, rules)
+    if fingerprint == previous:
+        return fingerprint, None
+    return fingerprint, scan_plugin_dir(plugin_dir, rules)
 
+
+def _extract_one(job: tuple) -> tuple:
+    """Process-pool worker: (slug, fingerprint, rows or None when unchanged, error or None)."""
+    slug = job[0]
     try:
-        df = pd.read_csv(CSV_PATH)
+        return (slug, *_extract_slug(*job), None)
     except Exception as e:
-        print(f"[!] Failed to read CSV: {e}")
-        return
-
-    true_slugs = df[df["upload"] == "True"]["slug"].astype(str)
-
-    for slug in true_slugs:
-        plugin_dir = SAVE_SOURCE / slug
-        if plugin_dir.exists():
-            print(f"[i] Scanning {slug}")
-            scan_plugin_dir(slug, plugin_dir)
-        else:
-            print(f"[!] Directory not found for {slug}: {plugin_dir}")
+        print(f"[!] Failed to extract {slug}: {e}")
+        return slug, None, None, str(e)
+
+
+class ExtractionStore:
+    """Extracted match rows plus the per-slug manifest, in one SQLite file."""
+
+    def __init__(self, db_path: Path = EXTRACT_DB_PATH):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+
+    def _init_db(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS extract_manifest (
+                    slug TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    ruleset TEXT NOT NULL,
+                    matches INTEGER NOT NULL,
+                    extracted_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS extracted_matches (
+                    slug TEXT NOT NULL,
+                    file TEXT NOT NULL,
+                    line INTEGER NOT NULL,
+                    matched_text TEXT NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_extracted_matches_slug ON extracted_matches (slug)')
+            conn.commit()
+
+    def manifest(self, ruleset: str = EXTRACT_RULESET) -> dict[str, str]:
+        """slug -> source fingerprint of the extractions done with ``ruleset``."""
+        with sqlite3.connect(self.db_path) as conn:
+            return dict(conn.execute('SELECT slug, fingerprint FROM extract_manifest WHERE ruleset = ?', (ruleset,)))
+
+    def replace(self, extracted: list[tuple], ruleset: str = EXTRACT_RULESET) -> None:
+        """Store (slug, fingerprint, rows) results in one transaction."""
+        now = time.time()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany('DELETE FROM extracted_matches WHERE slug = ?', [(slug,) for slug, _, _ in extracted])
+            conn.executemany('INSERT INTO extracted_matches VALUES (?, ?, ?, ?)',
+                             [(slug, *row) for slug, _, rows in extracted for row in rows])
+            conn.executemany('INSERT OR REPLACE INTO extract_manifest VALUES (?, ?, ?, ?, ?)',
+                             [(slug, fp, ruleset, len(rows), now) for slug, fp, rows in extracted])
+            conn.commit()
+
+    def forget(self, slugs: Iterable[str]) -> None:
+        params = [(slug,) for slug in slugs]
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany('DELETE FROM extracted_matches WHERE slug = ?', params)
+            conn.executemany('DELETE FROM extract_manifest WHERE slug = ?', params)
+            conn.commit()
+
+    def matches(self, slug: str) -> list[tuple[str, int, str]]:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute('SELECT file, line, matched_text FROM extracted_matches WHERE slug = ? '
+                                'ORDER BY file, line', (slug,)).fetchall()
+
+    def slugs(self) -> list[str]:
+        with sqlite3.connect(self.db_path) as conn:
+            return [row[0] for row in conn.execute('SELECT slug FROM extract_manifest ORDER BY slug')]
+
+
+def scan_all_true_plugins(
+    store: Optional[SourceStore] = None,
+    reporter: Optional[IReporter] = None,
+    *,
+    output: Optional[ExtractionStore] = None,
+    max_workers: Optional[int] = None,
+    force: bool = False,
+    batch_size: int = 200,
+    rules: Optional[PathRules] = None,
+) -> dict:
+    """upload=True のプラグインだけを再スキャンし、matches.db に出力する
+
+    ``store`` が指定された場合は SAVE_SOURCE ではなく SourceStore から読む。
+    ``rules`` で除外されたファイルは読まない。
+    前回の抽出からソースとルールが変わっていないプラグインはスキップする（``force`` で無効化）。
+    Returns counts of extracted, unchanged, missing (no saved sources) and failed slugs.
+    """
+    counts = {"extracted": 0, "unchanged": 0, "missing": 0, "failed": 0}
+    true_slugs = flagged_slugs(reporter)
+    if true_slugs is None:
+        print("[!] No audit results found")
+        return counts
+
+    rules = rules if rules else None
+    ruleset = EXTRACT_RULESET if rules is None else f"{EXTRACT_RULESET}:{rules.fingerprint()}"
+    output = output or ExtractionStore()
+    previous = {} if force else output.manifest(ruleset)
+    # slugs no longer flagged drop out of the output
+    output.forget(s for s in output.slugs() if s not in true_slugs)
+    store_root = str(store.root) if store is not None else None
+    jobs = [(slug, str(SAVE_SOURCE / slug), store_root, previous.get(slug), rules) for slug in sorted(true_slugs)]
+
+    pending = []
+    with ProcessPoolExecutor(max_workers=max_workers) as ex:
+        for slug, fingerprint, rows, error in ex.map(_extract_one, jobs, chunksize=16):
+            if error is not None:
+                counts["failed"] += 1
+            elif fingerprint is None:
+                counts["missing"] += 1
+            elif rows is None:
+                counts["unchanged"] += 1
+            else:
+                counts["extracted"] += 1
+                pending.append((slug, fingerprint, rows))
+                if len(pending) >= batch_size:
+                    output.replace(pending, ruleset)
+                    pending = []
+    if pending:
+        output.replace(pending, ruleset)
+    print(f"[i] Extracted {counts['extracted']} plugin(s), {counts['unchanged']} unchanged, "
+          f"{counts['missing']} without saved sources, {counts['failed']} failed -> {output.db_path}")
+    return counts
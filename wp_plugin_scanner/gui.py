@@ -1,19 +1,30 @@
+import os
 import re
+import sqlite3
 import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from typing import List
 from pathlib import Path
 import csv
+from collections import deque
 
 from .manager import AuditManager
 from .downloader import RequestsDownloader
 from .scanner import UploadScanner
-from .reporter import CsvReporter, SqliteReporter, PluginDetailsSqliteReporter, CombinedReporter
+from .scan_cache import ScanCache
+from .archive_memo import ArchiveMemo
+from .reporter import CsvReporter, SqliteReporter, PluginDetailsSqliteReporter, CombinedReporter, AUDIT_RESULT_COLUMNS
 from .searcher import PluginSearcher
 from .plugin_lister import PluginLister
 from .plugin_fetcher import PluginDetailFetcher
+from .http_cache import HttpResponseCache
 from .models import SearchResult
+from .virtual_tree import PagedRows, VirtualTreeview, ChunkedTreeFiller
+from .query_scheduler import QueryScheduler
+from .ui_events import UiEventQueue
+from .log_view import BoundedLogView, RotatingLogFile
+from .config import LOG_FILE_PATH, LOG_VIEW_MAX_LINES
 
 class AuditGUI:
     def __init__(self):
@@ -21,15 +32,20 @@ class AuditGUI:
         self.root.title("WPプラグインアップロード監査ツール")
         self.root.geometry("800x800")
         
+        # ワーカースレッドからのUI更新は100msごとにまとめて反映する
+        self.ui_events = UiEventQueue(self.root, log_sink=self._append_log)
+        self.ui_events.start()
+        
         self.db_prog = None  # データベースタブ専用プログレスバー
         self.db_status_var = tk.StringVar(value="準備完了")
         
         self._build_widgets()
         self.searcher = PluginSearcher()
         self.plugin_lister = PluginLister()
-        self.plugin_fetcher = PluginDetailFetcher()
+        self.plugin_fetcher = PluginDetailFetcher(cache=HttpResponseCache())
         self.details_reporter = PluginDetailsSqliteReporter()
-        self.logs: List[str] = []
+        self.db_queries = QueryScheduler(self.root, lambda: sqlite3.connect(self.details_reporter.db_path))
+        self.logs: deque[str] = deque(maxlen=LOG_VIEW_MAX_LINES)
         self.fetched_plugins: List[str] = []
         self.fetch_running = False
         self.stop_zip_download = False
@@ -84,8 +100,19 @@ class AuditGUI:
         self.log_btn = ttk.Button(audit_frame, text="ログ表示 ▼", command=self._toggle_logs)
         self.log_btn.pack(fill="x", padx=10, pady=(5, 0))
         self.log_frame = ttk.Frame(audit_frame)
+        log_search_row = ttk.Frame(self.log_frame)
+        log_search_row.pack(fill="x", pady=(0, 3))
+        self.log_search_var = tk.StringVar()
+        log_search_entry = ttk.Entry(log_search_row, textvariable=self.log_search_var, width=30)
+        log_search_entry.pack(side="left")
+        log_search_entry.bind("<Return>", lambda e: self._find_in_log())
+        ttk.Button(log_search_row, text="次を検索", command=self._find_in_log).pack(side="left", padx=5)
+        ttk.Button(log_search_row, text="ログファイル検索", command=self._search_log_file).pack(side="left", padx=5)
         self.log_box = tk.Text(self.log_frame, height=8, width=60, state="disabled")
         self.log_box.pack(fill="both", expand=True)
+        # 表示は最新LOG_VIEW_MAX_LINES行のみ、全行はローテーションするログファイルへ
+        log_file = RotatingLogFile(LOG_FILE_PATH) if LOG_FILE_PATH else None
+        self.log_view = BoundedLogView(self.log_box, LOG_VIEW_MAX_LINES, log_file)
     
     def _create_plugin_list_tab(self):
         list_frame = ttk.Frame(self.notebook)
@@ -211,6 +238,7 @@ class AuditGUI:
         self.db_search_var = tk.StringVar()
         search_entry = ttk.Entry(search_row1, textvariable=self.db_search_var, width=30)
         search_entry.pack(side="left", padx=5)
+        self.db_search_var.trace_add("write", self._schedule_database_filter)
         ttk.Button(search_row1, text="検索", command=self._search_database).pack(side="left", padx=5)
         ttk.Button(search_row1, text="クリア", command=self._clear_database_search).pack(side="left", padx=5)
         
@@ -227,6 +255,7 @@ class AuditGUI:
         audit_combo = ttk.Combobox(search_row2, textvariable=self.audit_filter_var, values=audit_options, state="readonly", width=15)
         self.audit_filter_var.set("全て")
         audit_combo.pack(side="left", padx=5)
+        audit_combo.bind("<<ComboboxSelected>>", self._schedule_database_filter)
         
         # Sort controls
         ttk.Label(search_row2, text="ソート:").pack(side="left", padx=(10, 0))
@@ -237,9 +266,11 @@ class AuditGUI:
         sort_combo = ttk.Combobox(search_row2, textvariable=self.db_sort_var, values=sort_options, state="readonly", width=15)
         self.db_sort_var.set("スラッグ")
         sort_combo.pack(side="left", padx=5)
+        sort_combo.bind("<<ComboboxSelected>>", self._schedule_database_filter)
         
         self.db_sort_desc = tk.BooleanVar(value=False)
-        ttk.Checkbutton(search_row2, text="降順", variable=self.db_sort_desc).pack(side="left", padx=5)
+        ttk.Checkbutton(search_row2, text="降順", variable=self.db_sort_desc,
+                        command=self._schedule_database_filter).pack(side="left", padx=5)
         
         # Action buttons
         search_row3 = ttk.Frame(search_frame)
@@ -289,10 +320,11 @@ class AuditGUI:
         self.db_tree.column("audit_result", width=80)
         self.db_tree.column("matches", width=60)
         
-        # Add scrollbars
-        tree_scroll_y = ttk.Scrollbar(tree_frame, orient="vertical", command=self.db_tree.yview)
+        # Add scrollbars; the vertical one spans the whole result set
+        tree_scroll_y = ttk.Scrollbar(tree_frame, orient="vertical")
         tree_scroll_x = ttk.Scrollbar(tree_frame, orient="horizontal", command=self.db_tree.xview)
-        self.db_tree.configure(yscrollcommand=tree_scroll_y.set, xscrollcommand=tree_scroll_x.set)
+        self.db_tree.configure(xscrollcommand=tree_scroll_x.set)
+        self.db_view = VirtualTreeview(self.db_tree, tree_scroll_y, self._format_database_row)
         
         self.db_tree.pack(side="left", fill="both", expand=True)
         tree_scroll_y.pack(side="right", fill="y")
@@ -347,31 +379,74 @@ class AuditGUI:
         else:
             reporter = CombinedReporter(reporters)
 
-        self.mgr = AuditManager(RequestsDownloader(), UploadScanner(), reporter, save_sources=self.save_var.get(), save_zip=self.save_zip_var.get())
+        self.mgr = AuditManager(RequestsDownloader(), UploadScanner(cache=ScanCache()), reporter, archive_memo=ArchiveMemo(), save_sources=self.save_var.get(), save_zip=self.save_zip_var.get())
         self.prog.start()
         threading.Thread(target=lambda: self._worker(slugs), daemon=True).start()
 
     def _worker(self, slugs):
         try:
             self.mgr.run(slugs, progress_cb=self._progress_cb)
-            self.root.after(0, lambda: messagebox.showinfo(
-                "完了", f"監査が完了しました"
-            ))
+            self.ui_events.post(messagebox.showinfo, "完了", "監査が完了しました")
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("エラー", str(e)))
+            self.ui_events.post(messagebox.showerror, "エラー", str(e))
         finally:
-            self.root.after(0, self.prog.stop)
+            self.ui_events.post(self.prog.stop)
 
     def _progress_cb(self, msg: str) -> None:
+        # called from worker threads; lines reach _append_log in batches
         self.logs.append(msg)
-        self.root.after(0, lambda m=msg: self._append_log(m))
+        self.ui_events.log(msg)
 
-    def _append_log(self, msg: str) -> None:
-        self.status_var.set(msg)
-        self.log_box.configure(state="normal")
-        self.log_box.insert("end", msg + "\n")
-        self.log_box.see("end")
-        self.log_box.configure(state="disabled")
+    def _append_log(self, msg) -> None:
+        """Append one line or a batch of lines to the log box."""
+        lines = [msg] if isinstance(msg, str) else msg
+        if not lines:
+            return
+        self.status_var.set(lines[-1])
+        self.log_view.append(lines)
+
+    def _find_in_log(self) -> None:
+        term = self.log_search_var.get().strip()
+        if term and not self.log_view.find(term):
+            self.status_var.set(f"ログに '{term}' は見つかりません（ログファイル検索で過去分を検索できます）")
+
+    def _search_log_file(self) -> None:
+        """ログファイル全体（ローテーション分を含む）を検索して結果を表示"""
+        term = self.log_search_var.get().strip()
+        log_file = self.log_view.log_file
+        if not term or log_file is None:
+            return
+        hits = log_file.search(term)
+        if not hits:
+            messagebox.showinfo("ログ検索", f"'{term}' はログファイルに見つかりませんでした。")
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title(f"ログ検索: {term}（{len(hits)}件）")
+        window.geometry("900x500")
+        hit_list = tk.Listbox(window, height=10)
+        hit_list.pack(fill="x", padx=5, pady=5)
+        for path, lineno, line in hits:
+            hit_list.insert("end", f"{path.name}:{lineno}: {line}")
+        context_box = tk.Text(window, state="disabled")
+        context_box.pack(fill="both", expand=True, padx=5, pady=5)
+        context_box.tag_configure("match", background="yellow")
+        
+        def show_context(event=None):
+            selection = hit_list.curselection()
+            if not selection:
+                return
+            path, lineno, _ = hits[selection[0]]
+            context_box.configure(state="normal")
+            context_box.delete("1.0", "end")
+            for current, line in log_file.context(path, lineno):
+                context_box.insert("end", f"{current:>7}  {line}\n", "match" if current == lineno else ())
+            context_box.configure(state="disabled")
+            match = context_box.tag_ranges("match")
+            if match:
+                context_box.see(match[0])
+        
+        hit_list.bind("<<ListboxSelect>>", show_context)
 
     def _toggle_logs(self) -> None:
         if self.log_frame.winfo_ismapped():
@@ -427,7 +502,7 @@ class AuditGUI:
             def progress_callback(msg: str, count: int):
                 if not self.fetch_running:
                     return
-                self.root.after(0, lambda: self._update_fetch_progress(msg, count))
+                self.ui_events.post_latest("fetch_progress", self._update_fetch_progress, msg, count)
             
             plugins = self.plugin_lister.fetch_by_category(
                 category=category,
@@ -437,11 +512,11 @@ class AuditGUI:
             )
             
             if self.fetch_running:
-                self.root.after(0, lambda: self._finish_plugin_fetch(plugins))
+                self.ui_events.post(self._finish_plugin_fetch, plugins)
         except Exception as e:
             if self.fetch_running:
                 error_msg = str(e)
-                self.root.after(0, lambda: self._fetch_error(error_msg))
+                self.ui_events.post(self._fetch_error, error_msg)
 
     def _fetch_plugins_by_search_thread(self, keyword: str, limit: int, interval: float):
         """検索キーワードでプラグインを取得するスレッド関数。"""
@@ -449,7 +524,7 @@ class AuditGUI:
             def progress_callback(msg: str, count: int):
                 if not self.fetch_running:
                     return
-                self.root.after(0, lambda: self._update_fetch_progress(msg, count))
+                self.ui_events.post_latest("fetch_progress", self._update_fetch_progress, msg, count)
             
             # searcher.searchは制限に対応していないため、結果を制限する
             if progress_callback:
@@ -461,11 +536,11 @@ class AuditGUI:
             all_slugs = self.searcher.search(keyword, search_limit, search_interval, progress_callback)
             
             if self.fetch_running:
-                self.root.after(0, lambda: self._finish_plugin_fetch(all_slugs))
+                self.ui_events.post(self._finish_plugin_fetch, all_slugs)
         except Exception as e:
             if self.fetch_running:
                 error_msg = str(e)
-                self.root.after(0, lambda: self._fetch_error(error_msg))
+                self.ui_events.post(self._fetch_error, error_msg)
 
     def _update_fetch_progress(self, msg: str, count: int):
         if not self.fetch_running:
@@ -536,17 +611,17 @@ class AuditGUI:
         try:
             # 429エラーを避けるため、長めのインターバルを設定
             def search_progress(msg: str, count: int):
-                self.root.after(0, lambda: self.list_status_var.set(msg))
+                self.ui_events.set_var(self.list_status_var, msg)
             
             slugs = self.searcher.search(keyword, interval=2.0, progress_callback=search_progress)
             if not slugs:
-                self.root.after(0, lambda: messagebox.showinfo("Search", f"No plugins found for '{keyword}'."))
+                self.ui_events.post(messagebox.showinfo, "Search", f"No plugins found for '{keyword}'.")
             else:
-                self.root.after(0, lambda: self._finish_keyword_search(keyword, slugs))
+                self.ui_events.post(self._finish_keyword_search, keyword, slugs)
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Search Error", f"Search failed for '{keyword}':\n{str(e)}"))
+            self.ui_events.post(messagebox.showerror, "Search Error", f"Search failed for '{keyword}':\n{str(e)}")
         finally:
-            self.root.after(0, self.list_prog.stop)
+            self.ui_events.post(self.list_prog.stop)
 
     def _finish_keyword_search(self, keyword: str, slugs: List[str]):
         """Handle completion of keyword search."""
@@ -665,11 +740,11 @@ class AuditGUI:
             total_count = self.plugin_lister.get_total_plugin_count()
             
             if total_count:
-                self.root.after(0, lambda: self._display_total_count(total_count, "Quick method"))
+                self.ui_events.post(self._display_total_count, total_count, "Quick method")
             else:
-                self.root.after(0, lambda: self._total_count_error("Could not determine total count from website text"))
+                self.ui_events.post(self._total_count_error, "Could not determine total count from website text")
         except Exception as e:
-            self.root.after(0, lambda: self._total_count_error(str(e)))
+            self.ui_events.post(self._total_count_error, str(e))
 
     def _get_total_count_accurate(self):
         """Get total count using accurate sampling method."""
@@ -681,16 +756,16 @@ class AuditGUI:
     def _thread_get_total_accurate(self):
         try:
             def progress_callback(msg: str, count: int):
-                self.root.after(0, lambda: self.list_status_var.set(msg))
+                self.ui_events.set_var(self.list_status_var, msg)
             
             total_count = self.plugin_lister.estimate_total_plugins_by_sampling(progress_callback)
             
             if total_count:
-                self.root.after(0, lambda: self._display_total_count(total_count, "Sampling method"))
+                self.ui_events.post(self._display_total_count, total_count, "Sampling method")
             else:
-                self.root.after(0, lambda: self._total_count_error("Could not estimate total count"))
+                self.ui_events.post(self._total_count_error, "Could not estimate total count")
         except Exception as e:
-            self.root.after(0, lambda: self._total_count_error(str(e)))
+            self.ui_events.post(self._total_count_error, str(e))
 
     def _display_total_count(self, count: int, method: str):
         """Display the total count result."""
@@ -738,7 +813,7 @@ class AuditGUI:
             
             def progress_callback(msg, current, total_plugins):
                 # 新しい形式に対応
-                self.root.after(0, lambda: self.list_status_var.set(msg))
+                self.ui_events.set_var(self.list_status_var, msg)
             
             results = self.plugin_fetcher.fetch_multiple_plugin_details(
                 self.fetched_plugins, 
@@ -746,16 +821,14 @@ class AuditGUI:
             )
             
             # 取得結果を保存
-            success_count = 0
-            for details in results:
-                if details:
-                    self.details_reporter.save_plugin_details(details)
-                    success_count += 1
+            success_count = self.details_reporter.save_many_plugin_details(
+                details for details in results if details
+            )
             
-            self.root.after(0, lambda: self._finish_details_fetch(success_count, total))
+            self.ui_events.post(self._finish_details_fetch, success_count, total)
             
         except Exception as e:
-            self.root.after(0, lambda: self._details_fetch_error(str(e)))
+            self.ui_events.post(self._details_fetch_error, str(e))
 
     def _finish_details_fetch(self, success_count: int, total: int):
         """Handle completion of details fetching."""
@@ -814,18 +887,18 @@ class AuditGUI:
                 details = self.plugin_fetcher.fetch_plugin_details(slug)
                 if details:
                     self.details_reporter.save_plugin_details(details)
-                    self.root.after(0, lambda: self._show_plugin_details_window(details))
+                    self.ui_events.post(self._show_plugin_details_window, details)
                 else:
-                    self.root.after(0, lambda: messagebox.showerror(
-                        "Error", f"Failed to fetch details for '{slug}'"
-                    ))
+                    self.ui_events.post(
+                        messagebox.showerror, "Error", f"Failed to fetch details for '{slug}'"
+                    )
             except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror(
-                    "Error", f"Error fetching details for '{slug}':\n{str(e)}"
-                ))
+                self.ui_events.post(
+                    messagebox.showerror, "Error", f"Error fetching details for '{slug}':\n{str(e)}"
+                )
             finally:
-                self.root.after(0, self.list_prog.stop)
-                self.root.after(0, lambda: self.list_status_var.set("Ready"))
+                self.ui_events.post(self.list_prog.stop)
+                self.ui_events.set_var(self.list_status_var, "Ready")
         
         threading.Thread(target=fetch_thread, daemon=True).start()
 
@@ -916,85 +989,6 @@ class AuditGUI:
         return "\n".join(lines)
 
     # Database viewer methods
-    def _search_database(self):
-        """Search database for plugins."""
-        search_term = self.db_search_var.get().strip()
-        if not search_term:
-            messagebox.showwarning("Warning", "Please enter a search term.")
-            return
-        
-        try:
-            plugins = self.details_reporter.search_plugins(search_term, limit=100)
-            self._populate_tree(plugins)
-            self._update_database_stats(len(plugins))
-        except Exception as e:
-            messagebox.showerror("Error", f"Search failed:\n{str(e)}")
-
-    def _clear_database_search(self):
-        """Clear search and reload all plugins."""
-        self.db_search_var.set("")
-        self._load_all_plugins()
-
-    def _load_all_plugins(self):
-        """Load all plugins from database."""
-        try:
-            # Load first 1000 plugins to avoid performance issues
-            plugins = self.details_reporter.get_all_plugins(limit=1000)
-            
-            if not plugins:
-                self._populate_tree([])
-                self._update_database_stats(0)
-                return
-            
-            # Sort plugins based on user selection
-            sort_display = self.db_sort_var.get()
-            sort_key = self.sort_mapping.get(sort_display, "name")
-            reverse = self.db_sort_desc.get()
-            
-            if sort_key == "name":
-                plugins.sort(key=lambda x: x.name or "", reverse=reverse)
-            elif sort_key == "active_installs_raw":
-                plugins.sort(key=lambda x: x.active_installs_raw or 0, reverse=reverse)
-            elif sort_key == "last_updated":
-                plugins.sort(key=lambda x: x.last_updated or "", reverse=reverse)
-            elif sort_key == "rating":
-                plugins.sort(key=lambda x: x.rating or 0, reverse=reverse)
-            elif sort_key == "downloaded":
-                plugins.sort(key=lambda x: x.downloaded or 0, reverse=reverse)
-            
-            self._populate_tree(plugins)
-            self._update_database_stats(len(plugins))
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load plugins:\n{str(e)}")
-
-    def _populate_tree(self, plugins):
-        """Populate tree view with plugin data."""
-        # Clear existing items
-        for item in self.db_tree.get_children():
-            self.db_tree.delete(item)
-        
-        # Add plugins to tree
-        for i, plugin in enumerate(plugins):
-            # Format values for display
-            installs = plugin.active_installs or "Unknown"
-            rating = f"{plugin.rating:.1f}" if plugin.rating else "N/A"
-            updated = plugin.last_updated[:10] if plugin.last_updated else "Unknown"
-            
-            try:
-                self.db_tree.insert("", "end", 
-                                  text=plugin.slug,
-                                  values=(
-                                      plugin.name or "Unknown",
-                                      plugin.version or "N/A",
-                                      plugin.author or "Unknown",
-                                      installs,
-                                      rating,
-                                      updated
-                                  ))
-            except Exception:
-                continue
-
     def _update_database_stats(self, loaded_count=None):
         """Update database statistics display."""
         try:
@@ -1036,76 +1030,102 @@ class AuditGUI:
         # Apply current filter settings to refresh database view
         self._apply_database_filter()
     
-    def _apply_database_filter(self):
-        """Apply current filter settings to database view."""
-        search_term = self.db_search_var.get().strip()
-        audit_filter = self.audit_mapping.get(self.audit_filter_var.get(), "all")
-        sort_by = self.sort_mapping.get(self.db_sort_var.get(), "name")
-        sort_desc = self.db_sort_desc.get()
-        
-        def load_thread():
-            try:
-                results = self.details_reporter.get_plugins_with_audit_results(
-                    search_term=search_term,
-                    audit_filter=audit_filter,
-                    sort_by=sort_by,
-                    sort_desc=sort_desc,
-                    limit=1000
-                )
-                self.root.after(0, lambda: self._populate_database_tree(results))
-            except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror("Error", f"Filter failed: {str(e)}"))
-        
-        threading.Thread(target=load_thread, daemon=True).start()
-    
-    def _populate_database_tree(self, results):
-        """Populate the tree view with filtered results."""
-        # Clear existing items
-        for item in self.db_tree.get_children():
-            self.db_tree.delete(item)
-        
-        # Add new items
-        for result in results:
-            plugin = result['plugin']
-            audit_status = result['audit_status']
-            matches_count = result['matches_count']
-            
-            # Format audit result for display
-            if audit_status == 'true':
-                audit_display = '✓ True'
-            elif audit_status == 'false':
-                audit_display = '✗ False'
-            elif audit_status == 'no_audit':
-                audit_display = '- 未監査'
-            else:
-                audit_display = audit_status
-            
-            # Format values for display
-            installs = plugin.active_installs or "Unknown"
-            rating = f"{plugin.rating:.1f}" if plugin.rating else "N/A"
-            updated = plugin.last_updated[:10] if plugin.last_updated else "N/A"
-            matches_display = str(matches_count) if matches_count > 0 else ""
-            
-            values = (
-                plugin.name or "Unknown",
-                plugin.version or "N/A", 
-                plugin.author or "Unknown",
-                installs,
-                rating,
-                updated,
-                audit_display,
-                matches_display
+    def _database_query(self) -> dict:
+        """Current filter settings of the database tab as query arguments."""
+        return {
+            "search_term": self.db_search_var.get().strip(),
+            "audit_filter": self.audit_mapping.get(self.audit_filter_var.get(), "all"),
+            "sort_by": self.sort_mapping.get(self.db_sort_var.get(), "name"),
+            "sort_desc": self.db_sort_desc.get(),
+        }
+
+    def _database_rows(self, query: dict, conn=None) -> tuple:
+        """Count the matching plugins and prefetch the first page on ``conn``."""
+        counts = self.details_reporter.count_plugins_with_audit_results(
+            query["search_term"], query["audit_filter"], conn=conn
+        )
+
+        def fetch(after, offset, limit, conn=None):
+            return self.details_reporter.get_plugins_with_audit_results(
+                limit=limit, offset=offset, after=after, conn=conn, **query
             )
-            
-            self.db_tree.insert("", "end", text=plugin.slug, values=values)
+
+        # scrolling loads further pages on the query worker, on this generation's connection
+        rows = PagedRows(fetch, sum(counts.values()), schedule=self.db_queries.follow)
+        rows.store(0, self.details_reporter.get_plugins_with_audit_results(
+            limit=rows.page_size, conn=conn, **query
+        ))
+        return rows, counts
+
+    def _apply_database_filter(self, delay_ms=0, keep_position=False):
+        """Apply current filter settings to database view.
+        
+        Queries go through ``self.db_queries``: a newer filter change
+        interrupts the running query and its results are discarded.
+        """
+        query = self._database_query()
+        self.db_status_var.set("検索中...")
+        
+        def on_result(result):
+            rows, counts = result
+            self.db_status_var.set("準備完了")
+            self._populate_database_tree(rows, counts, keep_position=keep_position)
+        
+        def on_error(e):
+            self.db_status_var.set("準備完了")
+            messagebox.showerror("Error", f"Filter failed: {str(e)}")
+        
+        self.db_queries.submit(
+            lambda conn: self._database_rows(query, conn), on_result, on_error, delay_ms=delay_ms
+        )
+    
+    def _schedule_database_filter(self, *_):
+        """Debounced filter for live typing and filter widget changes."""
+        self._apply_database_filter(delay_ms=self.db_queries.delay_ms)
+    
+    def _format_database_row(self, result):
+        """Treeview text and values for one get_plugins_with_audit_results row."""
+        plugin = result['plugin']
+        audit_status = result['audit_status']
+        matches_count = result['matches_count']
+        
+        # Format audit result for display
+        if audit_status == 'true':
+            audit_display = '✓ True'
+        elif audit_status == 'false':
+            audit_display = '✗ False'
+        elif audit_status == 'no_audit':
+            audit_display = '- 未監査'
+        else:
+            audit_display = audit_status
+        
+        # Format values for display
+        installs = plugin.active_installs or "Unknown"
+        rating = f"{plugin.rating:.1f}" if plugin.rating else "N/A"
+        updated = plugin.last_updated[:10] if plugin.last_updated else "N/A"
+        matches_display = str(matches_count) if matches_count else ""
+        
+        values = (
+            plugin.name or "Unknown",
+            plugin.version or "N/A", 
+            plugin.author or "Unknown",
+            installs,
+            rating,
+            updated,
+            audit_display,
+            matches_display
+        )
+        return plugin.slug, values
+    
+    def _populate_database_tree(self, rows, counts, keep_position=False):
+        """Show a paged result set in the virtualized tree view."""
+        if keep_position:
+            self.db_view.refresh(rows)
+        else:
+            self.db_view.set_rows(rows)
         
         # Update stats
-        total_count = len(results)
-        audit_true_count = sum(1 for r in results if r['audit_status'] == 'true')
-        audit_false_count = sum(1 for r in results if r['audit_status'] == 'false')
-        no_audit_count = sum(1 for r in results if r['audit_status'] == 'no_audit')
-        
-        stats_text = f"表示中: {total_count}件 | 監査済み(True): {audit_true_count}件 | 監査済み(False): {audit_false_count}件 | 未監査: {no_audit_count}件"
+        stats_text = f"表示中: {rows.total:,}件 | 監査済み(True): {counts['true']:,}件 | 監査済み(False): {counts['false']:,}件 | 未監査: {counts['no_audit']:,}件"
         self.db_stats_var.set(stats_text)
     
     def _search_database(self):
@@ -1166,8 +1186,9 @@ class AuditGUI:
         messagebox.showinfo("Success", f"Copied {len(slugs)} plugin slugs to audit tab.")
 
     def _export_database_results(self):
-        """Export current tree view results to CSV."""
-        if not self.db_tree.get_children():
+        """Export every row matching the current filter to CSV."""
+        rows = self.db_view.rows
+        if not rows or not rows.total:
             messagebox.showinfo("Info", "No data to export.")
             return
         
@@ -1189,10 +1210,9 @@ class AuditGUI:
                 # Write header
                 writer.writerow(["Slug", "Name", "Version", "Author", "Active Installs", "Rating", "Last Updated", "Audit Result", "Matches"])
                 
-                # Write data
-                for item in self.db_tree.get_children():
-                    slug = self.db_tree.item(item, "text")
-                    values = self.db_tree.item(item, "values")
+                # Write data, paging through the full result set
+                for result in rows.iter_rows():
+                    slug, values = self._format_database_row(result)
                     writer.writerow([slug] + list(values))
             
             messagebox.showinfo("Success", f"Results exported to {filename}")
@@ -1229,11 +1249,8 @@ class AuditGUI:
                 
                 conn.commit()
             
-            # Remove from tree view
-            for item in selections:
-                self.db_tree.delete(item)
-            
-            self._update_database_stats()
+            # Reload the current window; page boundaries shift after a delete
+            self._apply_database_filter(keep_position=True)
             messagebox.showinfo("Success", f"Deleted {len(slugs)} plugin(s) from database.")
             
         except Exception as e:
@@ -1243,7 +1260,7 @@ class AuditGUI:
         from tkinter import filedialog, messagebox
         import sqlite3
         import requests
-        from .config import ZIP_URL_TMPL
+        from . import endpoints
         from pathlib import Path
 
         # 保存先フォルダ選択
@@ -1274,23 +1291,24 @@ class AuditGUI:
             return sorted(slugs)
 
         def worker():
-            self.root.after(0, self.db_prog.start)
-            self.root.after(0, lambda: self.db_status_var.set("保存処理を開始しています..."))
+            self.ui_events.post(self.db_prog.start)
+            self.ui_events.set_var(self.db_status_var, "保存処理を開始しています...")
             self.stop_zip_download = False
 
             slugs = fetch_slugs_from_db()
             if not slugs:
-                self.root.after(0, self.db_prog.stop)
-                self.root.after(0, lambda: self.db_status_var.set("アップロード機能ありのプラグインが見つかりませんでした。"))
-                self.root.after(0, lambda: messagebox.showwarning("警告", "アップロード機能ありのプラグインが見つかりませんでした。"))
+                self.ui_events.post(self.db_prog.stop)
+                self.ui_events.set_var(self.db_status_var, "アップロード機能ありのプラグインが見つかりませんでした。")
+                self.ui_events.post(messagebox.showwarning, "警告", "アップロード機能ありのプラグインが見つかりませんでした。")
                 return
 
             count = 0
             total = len(slugs)
+            session = endpoints.configure_session(requests.Session())
             for i, slug in enumerate(slugs, 1):
                 if self.stop_zip_download:
-                    self.root.after(0, self.db_prog.stop)
-                    self.root.after(0, lambda: self.db_status_var.set("保存処理を中止しました"))
+                    self.ui_events.post(self.db_prog.stop)
+                    self.ui_events.set_var(self.db_status_var, "保存処理を中止しました")
                     return
 
                 try:
@@ -1298,8 +1316,8 @@ class AuditGUI:
                     if out_path.exists():
                         print(f"[=] スキップ（既存）: {out_path}")
                         continue
-                    url = ZIP_URL_TMPL.format(slug=slug)
-                    res = requests.get(url, timeout=30)
+                    url = endpoints.zip_url(slug)
+                    res = session.get(url, timeout=30)
                     res.raise_for_status()
                     out_path.write_bytes(res.content)
                     print(f"[✔] 保存: {out_path}")
@@ -1309,12 +1327,12 @@ class AuditGUI:
 
                 # ステータス更新
                 msg = f"[{i}/{total}] {slug} のZIPを保存中..."
-                self.root.after(0, lambda m=msg: self.db_status_var.set(m))
+                self.ui_events.set_var(self.db_status_var, msg)
 
             self.stop_zip_download = False
-            self.root.after(0, self.db_prog.stop)
-            self.root.after(0, lambda: self.db_status_var.set("保存処理が完了しました"))
-            self.root.after(0, lambda: messagebox.showinfo("完了", f"{count} 件のプラグインを保存しました。"))
+            self.ui_events.post(self.db_prog.stop)
+            self.ui_events.set_var(self.db_status_var, "保存処理が完了しました")
+            self.ui_events.post(messagebox.showinfo, "完了", f"{count} 件のプラグインを保存しました。")
 
         import threading
         threading.Thread(target=worker, daemon=True).start()
@@ -1385,28 +1403,30 @@ class AuditGUI:
                         success_count += 1
                 
                 progress_msg = f"Auto-fetching: {current}/{total_plugins} (saved: {success_count})"
-                self.root.after(0, lambda: self.list_status_var.set(progress_msg))
+                self.ui_events.set_var(self.list_status_var, progress_msg)
             
-            # Fetch basic info for each plugin
+            # Fetch basic info for each plugin, saving in batches
+            pending = []
             for i, slug in enumerate(self.fetched_plugins):
                 if not self.details_reporter.plugin_exists(slug):
                     details = self.plugin_fetcher.fetch_plugin_details(slug)
-                    if details:
-                        self.details_reporter.save_plugin_details(details)
-                        success_count += 1
-                    else:
+                    if not details:
                         # Create minimal record
-                        basic_details = self._create_basic_plugin_details(slug, slug.replace('-', ' ').title())
-                        self.details_reporter.save_plugin_details(basic_details)
-                        success_count += 1
+                        details = self._create_basic_plugin_details(slug, slug.replace('-', ' ').title())
+                    pending.append(details)
+                    if len(pending) >= 100:
+                        success_count += self.details_reporter.save_many_plugin_details(pending)
+                        pending = []
                 
                 progress_msg = f"Auto-fetching: {i+1}/{total} (saved: {success_count})"
-                self.root.after(0, lambda msg=progress_msg: self.list_status_var.set(msg))
+                self.ui_events.set_var(self.list_status_var, progress_msg)
+            
+            success_count += self.details_reporter.save_many_plugin_details(pending)
             
-            self.root.after(0, lambda: self._finish_auto_details_fetch(success_count, total))
+            self.ui_events.post(self._finish_auto_details_fetch, success_count, total)
             
         except Exception as e:
-            self.root.after(0, lambda: self._auto_details_fetch_error(str(e)))
+            self.ui_events.post(self._auto_details_fetch_error, str(e))
 
     def _create_basic_plugin_details(self, slug: str, name: str):
         """Create basic plugin details when full fetch fails."""
@@ -1438,15 +1458,21 @@ class AuditGUI:
         audit_window.title("監査結果詳細")
         audit_window.geometry("1200x600")
         
-        # CSVとSQLiteの両方から監査結果を取得
-        audit_data = self._get_audit_results()
+        # SQLite（無ければCSVを取り込んだ一時DB）の準備はワーカーで行い、
+        # 終わるまでは空のウィンドウを表示しておく
+        loaded = {"source": None, "closed": False}
+        loaded_lock = threading.Lock()
         
-        if not audit_data:
-            ttk.Label(audit_window, text="監査結果が見つかりません。").pack(pady=20)
-            return
+        # フィルタとソートはSQLで実行し、結果は少しずつTreeviewに挿入する
+        columns = AUDIT_RESULT_COLUMNS
+        # 読み込み用の最初のクエリは接続を使わないのでメモリDBで足りる
+        queries = QueryScheduler(
+            self.root, lambda: sqlite3.connect(loaded["source"].db_path if loaded["source"] else ":memory:")
+        )
+        state = {"filter_column": None, "keyword": "", "sort_by": None, "sort_desc": False}
+        status_var = tk.StringVar(value="読み込み中...")
         
         # create filter frame
-        columns = ("slug", "upload", "timestamp", "files_scanned", "matches_count", "file_path", "line_number", "line_content", "matched_pattern")
         filter_frame = ttk.Frame(audit_window)
         filter_frame.pack(fill="x", padx=10, pady=5)
 
@@ -1454,10 +1480,7 @@ class AuditGUI:
 
         filter_column_var = tk.StringVar(value="slug")
         filter_column_combo = ttk.Combobox(filter_frame, textvariable=filter_column_var, state="readonly", width=15)
-        filter_column_combo["values"] = [
-            "slug", "upload", "timestamp", "files_scanned", "matches_count",
-            "file_path", "line_number", "line_content", "matched_pattern"
-        ]
+        filter_column_combo["values"] = list(columns)
         filter_column_combo.pack(side="left", padx=5)
 
         ttk.Label(filter_frame, text="検索語:").pack(side="left")
@@ -1465,63 +1488,49 @@ class AuditGUI:
         filter_entry = ttk.Entry(filter_frame, textvariable=filter_value_var, width=30)
         filter_entry.pack(side="left", padx=5)
 
+        stream = {"generation": None}
+
+        def reload():
+            source = loaded["source"]
+            if source is None:
+                return
+            filler.reset()
+            status_var.set("読み込み中...")
+            stream["generation"] = queries.submit(
+                lambda conn: source.iter_audit_rows(conn=conn, **state),
+                filler.feed,
+                lambda e: status_var.set(f"読み込み失敗: {e}"),
+                delay_ms=0,
+                on_done=lambda: filler.finish(lambda: status_var.set(f"{filler.inserted:,}件")),
+            )
+
         def apply_column_filter():
             column = filter_column_var.get()
-            keyword = filter_value_var.get().strip().lower()
             if not column:
                 return
-
-            tree.delete(*tree.get_children())
-            col_index = columns.index(column)
-            for row in audit_data:
-                cell_value = str(row[col_index]).lower()
-                if keyword in cell_value:
-                    tree.insert("", "end", values=row)
+            state["filter_column"] = column
+            state["keyword"] = filter_value_var.get().strip()
+            reload()
 
         def clear_column_filter():
             filter_value_var.set("")
-            tree.delete(*tree.get_children())
-            for row in audit_data:
-                tree.insert("", "end", values=row)
+            state["keyword"] = ""
+            reload()
 
         ttk.Button(filter_frame, text="検索", command=apply_column_filter).pack(side="left", padx=5)
         ttk.Button(filter_frame, text="クリア", command=clear_column_filter).pack(side="left", padx=5)
+        ttk.Label(filter_frame, textvariable=status_var).pack(side="left", padx=10)
+        filter_entry.bind("<Return>", lambda e: apply_column_filter())
         
         # Treeviewを作成
         tree = ttk.Treeview(audit_window, columns=columns, show="headings", height=20)
-        sort_state = {"column": None, "descending": False}
+        # 挿入待ちの行が無くなってから次のバッチを読み込む
+        filler = ChunkedTreeFiller(tree, on_empty=lambda: queries.more(stream["generation"]))
         
         def sort_treeview_by_column(col):
-            col_index = columns.index(col)
-            descending = sort_state["column"] == col and not sort_state["descending"]
-            sort_state["column"] = col
-            sort_state["descending"] = descending
-
-            # 再描画用に audit_data をフィルタ＋ソート
-            filtered_data = []
-            for row_id in tree.get_children():
-                values = tree.item(row_id)["values"]
-                filtered_data.append(values)
-
-            try:
-                filtered_data.sort(key=lambda row: convert_sort_value(row[col_index]), reverse=descending)
-            except Exception as e:
-                print(f"[ソートエラー] {e}")
-
-            # 再描画
-            tree.delete(*tree.get_children())
-            for row in filtered_data:
-                tree.insert("", "end", values=row)
-
-        def convert_sort_value(val):
-            try:
-                return int(val)
-            except (ValueError, TypeError):
-                try:
-                    return float(val)
-                except (ValueError, TypeError):
-                    return str(val).lower()
-
+            state["sort_desc"] = state["sort_by"] == col and not state["sort_desc"]
+            state["sort_by"] = col
+            reload()
         
         # ヘッダーを設定
         for col in columns:
@@ -1537,10 +1546,23 @@ class AuditGUI:
         tree.column("line_number", width=60)
         tree.column("line_content", width=200)
         tree.column("matched_pattern", width=120)
-        
-        # データを追加
-        for row in audit_data:
-            tree.insert("", "end", values=row)
+        tree.column("files_skipped", width=80)
+        tree.column("bytes_skipped", width=90)
+        tree.column("context_before", width=200)
+        tree.column("context_after", width=200)
+
+        def show_match_context(event):
+            # マッチ前後の行を表示（保存済みソースを開かずに確認する）
+            selection = tree.selection()
+            if not selection:
+                return
+            row = dict(zip(columns, tree.item(selection[0], "values")))
+            if not row.get("file_path"):
+                return
+            text = "\n".join(part for part in (row["context_before"], f"> {row['line_content']}", row["context_after"]) if part)
+            messagebox.showinfo(f"{row['slug']} - {row['file_path']}:{row['line_number']}", text, parent=audit_window)
+
+        tree.bind("<Double-1>", show_match_context)
         
         # スクロールバーを追加
         scrollbar_y = ttk.Scrollbar(audit_window, orient="vertical", command=tree.yview)
@@ -1553,6 +1575,9 @@ class AuditGUI:
         scrollbar_x.pack(side="bottom", fill="x")
         
         def export_visible_to_csv():
+            source = loaded["source"]
+            if source is None:
+                return
             save_path = filedialog.asksaveasfilename(
                 title="保存先を選択", defaultextension=".csv",
                 filetypes=[("CSVファイル", "*.csv")]
@@ -1561,73 +1586,86 @@ class AuditGUI:
                 return
 
             try:
+                # 読み込み途中でも現在のフィルタ・ソート結果をすべて書き出す
                 with open(save_path, "w", newline="", encoding="utf-8") as f:
                     writer = csv.writer(f)
                     writer.writerow(columns)  # ヘッダー
-                    for row_id in tree.get_children():
-                        values = tree.item(row_id)["values"]
-                        writer.writerow(values)
+                    for rows in source.iter_audit_rows(**state):
+                        writer.writerows(rows)
 
                 messagebox.showinfo("完了", f"CSVにエクスポートしました：\n{save_path}")
             except Exception as e:
                 messagebox.showerror("エラー", f"エクスポート失敗: {e}")
         
+        def close_window():
+            queries.close()
+            filler.reset()
+            audit_window.destroy()
+            with loaded_lock:
+                loaded["closed"] = True
+                self._discard_audit_source(loaded["source"])
+        
         # 閉じる、CSVエクスポートボタン
         button_frame = ttk.Frame(audit_window)
         button_frame.pack(fill="x", pady=5)
 
         ttk.Button(button_frame, text="CSVエクスポート", command=export_visible_to_csv).pack(side="top", padx=5, pady=5)
-        ttk.Button(button_frame, text="閉じる", command=audit_window.destroy).pack(side="bottom", padx=5,pady=10)
+        ttk.Button(button_frame, text="閉じる", command=close_window).pack(side="bottom", padx=5,pady=10)
+        audit_window.protocol("WM_DELETE_WINDOW", close_window)
+        
+        def load_source(conn):
+            source = self._get_audit_results()
+            with loaded_lock:
+                if loaded["closed"]:
+                    # 読み込み中にウィンドウが閉じられた
+                    self._discard_audit_source(source)
+                else:
+                    loaded["source"] = source
+            return source
+
+        def on_loaded(source):
+            if source is None:
+                status_var.set("監査結果が見つかりません。")
+                return
+            reload()
+
+        queries.submit(load_source, on_loaded, lambda e: status_var.set(f"読み込み失敗: {e}"), delay_ms=0)
+
+    @staticmethod
+    def _discard_audit_source(source):
+        """CSVから作成した一時DBを削除する"""
+        if source is not None and source.db_path != Path("plugin_upload_audit.db"):
+            Path(source.db_path).unlink(missing_ok=True)
 
     def _get_audit_results(self):
-        """CSV/SQLiteから監査結果を取得"""
-        audit_data = []
-        
-        # SQLiteから監査結果を取得
+        """監査結果のSqliteReporterを返す（CSVのみの場合は一時DBに取り込む）"""
+        # SQLiteの監査結果を優先
         try:
-            import sqlite3
-            db_path = "plugin_upload_audit.db"
-            if Path(db_path).exists():
-                with sqlite3.connect(db_path) as conn:
-                    conn.row_factory = sqlite3.Row
-                    cursor = conn.execute('''
-                        SELECT slug, upload, timestamp, files_scanned, matches_count,
-                               file_path, line_number, line_content, matched_pattern
-                        FROM plugin_audit_results
-                        ORDER BY timestamp DESC
-                    ''')
-                    rows = cursor.fetchall()
-                    for row in rows:
-                        audit_data.append(tuple(row))
+            db_path = Path("plugin_upload_audit.db")
+            if db_path.exists():
+                reporter = SqliteReporter(db_path)
+                if reporter.has_results():
+                    return reporter
         except Exception as e:
             print(f"SQLiteからの監査結果取得エラー: {e}")
         
         # CSVから監査結果を取得（SQLiteにデータがない場合）
-        if not audit_data:
-            try:
-                import pandas as pd
-                csv_path = "plugin_upload_audit.csv"
-                if Path(csv_path).exists():
-                    df = pd.read_csv(csv_path)
-                    # 必要なカラムがあるかチェック
-                    required_cols = ["slug", "upload", "timestamp"]
-                    if all(col in df.columns for col in required_cols):
-                        for _, row in df.iterrows():
-                            audit_data.append((
-                                row.get("slug", ""),
-                                row.get("upload", ""),
-                                row.get("timestamp", ""),
-                                row.get("files_scanned", 0),
-                                row.get("matches_count", 0),
-                                row.get("file_path", ""),
-                                row.get("line_number", 0),
-                                row.get("line_content", ""),
-                                row.get("matched_pattern", "")
-                            ))
-            except Exception as e:
-                print(f"CSVからの監査結果取得エラー: {e}")
-        
-        return audit_data
+        csv_path = Path("plugin_upload_audit.csv")
+        if not csv_path.exists():
+            return None
+        tmp_path = None
+        try:
+            import tempfile
+            fd, tmp_path = tempfile.mkstemp(suffix=".db", prefix="audit_csv_")
+            os.close(fd)
+            reporter = SqliteReporter(Path(tmp_path))
+            if reporter.import_csv(csv_path):
+                return reporter
+        except Exception as e:
+            print(f"CSVからの監査結果取得エラー: {e}")
+        if tmp_path:
+            Path(tmp_path).unlink(missing_ok=True)
+        return None
     
     
 
@@ -0,0 +1,248 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+from .config import HTTP_CACHE_PATH, HTTP_CACHE_TTL, HTTP_CACHE_MAX_BYTES
+
+
+class CachedResponse:
+    """Minimal stand-in for ``requests.Response`` served from the cache."""
+
+    def __init__(self, url: str, status_code: int, content: bytes, headers: dict):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.from_cache = True
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} for url: {self.url}", response=None)
+
+
+class HttpResponseCache:
+    """SQLite-backed cache for GET responses with TTL and ETag/Last-Modified revalidation.
+
+    Entries younger than their TTL are served without touching the network.
+    Stale entries that carry an ``ETag`` or ``Last-Modified`` header are
+    revalidated with a conditional request; a ``304`` keeps the body but
+    takes the validators and expiry of the revalidation response. A
+    ``Cache-Control: max-age`` sets the TTL unless the caller passes one;
+    ``no-store`` responses are not kept, and ``no-cache`` (or ``private``
+    without a max-age) ones are revalidated on every use.
+    The counters are shared across threads and guarded by the lock. The
+    total body size is bounded by ``max_bytes`` and the least
+    recently used entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        db_path: Path = HTTP_CACHE_PATH,
+        *,
+        ttl: float = HTTP_CACHE_TTL,
+        max_bytes: int = HTTP_CACHE_MAX_BYTES,
+    ):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evicted = 0
+        self._init_db()
+
+    def _init_db(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    url TEXT PRIMARY KEY,
+                    status INTEGER NOT NULL,
+                    body BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_type TEXT,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_http_cache_last_access ON http_cache (last_access)')
+            conn.commit()
+
+    def get(self, session: requests.Session, url: str, *, timeout: float, ttl: Optional[float] = None):
+        """Return a response for ``url``, consulting the cache first.
+
+        Only successful (200) responses are stored; anything else is returned
+        to the caller untouched so the existing retry logic keeps working.
+        """
+        now = time.time()
+        entry = self._lookup(url)
+        if entry and entry["expires_at"] > now:
+            self._count("hits")
+            self._touch(url, now)
+            return self._to_response(url, entry)
+
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        r = session.get(url, timeout=timeout, headers=headers or None)
+        if entry and r.status_code == 304:
+            self._count("revalidated")
+            if "no-store" in self._cache_control(r):
+                self.invalidate(url)
+                return self._to_response(url, entry)
+            return self._to_response(url, self._refresh(url, entry, r, now, ttl))
+
+        self._count("misses")
+        if r.status_code == 200:
+            self._store(url, r, now, ttl)
+        return r
+
+    def invalidate(self, url: str) -> None:
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('DELETE FROM http_cache WHERE url = ?', (url,))
+                conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('DELETE FROM http_cache')
+                conn.commit()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters together with the current cache size."""
+        with sqlite3.connect(self.db_path) as conn:
+            entries, total = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache').fetchone()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "evicted": self.evicted,
+                "entries": entries,
+                "bytes": total,
+            }
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @staticmethod
+    def _cache_control(r) -> dict:
+        """Cache-Control directives of a response, lower-cased name -> value (or None)."""
+        directives = {}
+        for part in (r.headers.get("Cache-Control") or "").split(","):
+            name, _, value = part.strip().partition("=")
+            if name:
+                directives[name.lower()] = value.strip('"') or None
+        return directives
+
+    def _expires(self, r, now: float, ttl: Optional[float]) -> float:
+        """Expiry for a response: explicit ``ttl``, else its max-age, else the default TTL.
+
+        ``no-cache`` always expires at once, so the entry is revalidated on
+        every use; so does ``private`` unless a TTL or max-age is given.
+        """
+        directives = self._cache_control(r)
+        if "no-cache" in directives:
+            return now
+        if ttl is None:
+            max_age = directives.get("max-age") or ""
+            if max_age.isdigit():
+                ttl = int(max_age)
+            else:
+                ttl = 0 if "private" in directives else self.ttl
+        return now + ttl
+
+    def _lookup(self, url: str) -> Optional[sqlite3.Row]:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            return conn.execute('SELECT * FROM http_cache WHERE url = ?', (url,)).fetchone()
+
+    def _touch(self, url: str, now: float) -> None:
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('UPDATE http_cache SET last_access = ? WHERE url = ?', (now, url))
+                conn.commit()
+
+    def _refresh(self, url: str, entry: sqlite3.Row, r, now: float, ttl: Optional[float]) -> dict:
+        """Apply a 304's validators and expiry to ``entry``; return the updated entry."""
+        updated = dict(entry)
+        # a 304 omits headers that did not change, so keep the stored ones then
+        updated["etag"] = r.headers.get("ETag") or entry["etag"]
+        updated["last_modified"] = r.headers.get("Last-Modified") or entry["last_modified"]
+        updated["expires_at"] = self._expires(r, now, ttl)
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    'UPDATE http_cache SET etag = ?, last_modified = ?, expires_at = ?, last_access = ? WHERE url = ?',
+                    (updated["etag"], updated["last_modified"], updated["expires_at"], now, url),
+                )
+                conn.commit()
+        return updated
+
+    def _store(self, url: str, r, now: float, ttl: Optional[float]) -> None:
+        body = r.content
+        if "no-store" in self._cache_control(r):
+            self.invalidate(url)
+            return
+        if len(body) > self.max_bytes:
+            return
+        expires = self._expires(r, now, ttl)
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO http_cache (
+                        url, status, body, etag, last_modified, content_type,
+                        size, stored_at, expires_at, last_access
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    url, r.status_code, body, r.headers.get("ETag"), r.headers.get("Last-Modified"),
+                    r.headers.get("Content-Type"), len(body), now, expires, now,
+                ))
+                self._evict(conn)
+                conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM http_cache').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute('SELECT url, size FROM http_cache ORDER BY last_access ASC').fetchall()
+        victims = []
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            victims.append((url,))
+            total -= size
+        conn.executemany('DELETE FROM http_cache WHERE url = ?', victims)
+        self.evicted += len(victims)
+
+    @staticmethod
+    def _to_response(url: str, entry) -> CachedResponse:
+        headers = {}
+        if entry["etag"]:
+            headers["ETag"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["Last-Modified"] = entry["last_modified"]
+        if entry["content_type"]:
+            headers["Content-Type"] = entry["content_type"]
+        return CachedResponse(url, entry["status"], bytes(entry["body"]), headers)
@@ -0,0 +1,192 @@
+"""Persistent journal of AuditManager runs.
+
+Each run is a job: the submitted slug list is stored in order together with
+every slug's state (``pending`` -> ``downloading`` -> ``scanned`` ->
+``reported``, or ``error``) and the number of attempts. A crashed or
+interrupted job can be continued with ``AuditManager.resume(job_id)``;
+slugs that were in flight are processed again and errored slugs are retried
+while the ``RetryPolicy`` allows it.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .config import DEFAULT_MAX_ATTEMPTS, JOB_JOURNAL_PATH
+
+PENDING = "pending"
+DOWNLOADING = "downloading"
+SCANNED = "scanned"
+REPORTED = "reported"
+ERROR = "error"
+STATES = (PENDING, DOWNLOADING, SCANNED, REPORTED, ERROR)
+
+
+@dataclass
+class RetryPolicy:
+    """How often a slug is attempted before its error is final."""
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    backoff: float = 2.0  # seconds before the second attempt, doubled afterwards
+
+    def should_retry(self, attempts: int) -> bool:
+        return attempts < self.max_attempts
+
+    def delay(self, attempts: int) -> float:
+        return self.backoff * (2 ** max(attempts - 1, 0))
+
+
+class JobJournal:
+    """SQLite-backed record of submitted slugs and their processing state."""
+
+    def __init__(self, db_path: Path = JOB_JOURNAL_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS audit_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    total INTEGER DEFAULT 0,
+                    finished INTEGER DEFAULT 0
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS audit_job_slugs (
+                    job_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    slug TEXT NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    updated_at REAL,
+                    PRIMARY KEY (job_id, seq)
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_audit_job_slugs_state ON audit_job_slugs (job_id, state)')
+            conn.commit()
+
+    def create_job(self, slugs: Iterable[str] = (), job_id: Optional[str] = None) -> str:
+        """Register a new job and return its id."""
+        job_id = job_id or time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        now = time.time()
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    'INSERT INTO audit_jobs (job_id, created_at, updated_at) VALUES (?, ?, ?)',
+                    (job_id, now, now),
+                )
+                conn.commit()
+        self.add_slugs(job_id, slugs)
+        return job_id
+
+    def add_slugs(self, job_id: str, slugs: Iterable[str], start_seq: Optional[int] = None) -> int:
+        """Append slugs to a job in submission order; return the next sequence number."""
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                if start_seq is None:
+                    start_seq = conn.execute(
+                        'SELECT COALESCE(MAX(seq) + 1, 0) FROM audit_job_slugs WHERE job_id = ?', (job_id,)
+                    ).fetchone()[0]
+                rows = [(job_id, start_seq + i, slug) for i, slug in enumerate(slugs)]
+                conn.executemany('INSERT INTO audit_job_slugs (job_id, seq, slug) VALUES (?, ?, ?)', rows)
+                conn.execute(
+                    'UPDATE audit_jobs SET total = total + ?, updated_at = ? WHERE job_id = ?',
+                    (len(rows), time.time(), job_id),
+                )
+                conn.commit()
+        return start_seq + len(rows)
+
+    def set_state(self, job_id: str, seq: int, state: str, error: Optional[str] = None) -> None:
+        """Move one slug to ``state``; entering ``downloading`` counts an attempt."""
+        attempt = 1 if state == DOWNLOADING else 0
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('''
+                    UPDATE audit_job_slugs
+                    SET state = ?, attempts = attempts + ?, last_error = COALESCE(?, last_error), updated_at = ?
+                    WHERE job_id = ? AND seq = ?
+                ''', (state, attempt, error, time.time(), job_id, seq))
+                conn.commit()
+
+    def set_states(self, job_id: str, seqs: Iterable[int], state: str) -> None:
+        """Move several slugs to ``state`` in one transaction."""
+        now = time.time()
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany(
+                    'UPDATE audit_job_slugs SET state = ?, updated_at = ? WHERE job_id = ? AND seq = ?',
+                    [(state, now, job_id, seq) for seq in seqs],
+                )
+                conn.commit()
+
+    def attempts(self, job_id: str, seq: int) -> int:
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                'SELECT attempts FROM audit_job_slugs WHERE job_id = ? AND seq = ?', (job_id, seq)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def remaining(self, job_id: str, policy: Optional[RetryPolicy] = None) -> Iterator[tuple[int, str]]:
+        """(seq, slug) pairs still to process, in the original order.
+
+        In-flight slugs are returned again; errored slugs only while the
+        policy allows another attempt.
+        """
+        policy = policy or RetryPolicy()
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute('''
+                SELECT seq, slug FROM audit_job_slugs
+                WHERE job_id = ? AND (state IN (?, ?, ?) OR (state = ? AND attempts < ?))
+                ORDER BY seq
+            ''', (job_id, PENDING, DOWNLOADING, SCANNED, ERROR, policy.max_attempts))
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    return
+                yield from rows
+
+    def errored(self, job_id: str) -> set[int]:
+        """Seqs whose last attempt ended in an error."""
+        with sqlite3.connect(self.db_path) as conn:
+            return {row[0] for row in conn.execute(
+                'SELECT seq FROM audit_job_slugs WHERE job_id = ? AND state = ?', (job_id, ERROR))}
+
+    def finish(self, job_id: str) -> None:
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    'UPDATE audit_jobs SET finished = 1, updated_at = ? WHERE job_id = ?', (time.time(), job_id)
+                )
+                conn.commit()
+
+    def job_exists(self, job_id: str) -> bool:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute('SELECT 1 FROM audit_jobs WHERE job_id = ?', (job_id,)).fetchone() is not None
+
+    def summary(self, job_id: str) -> dict:
+        """Number of slugs per state."""
+        counts = dict.fromkeys(STATES, 0)
+        with sqlite3.connect(self.db_path) as conn:
+            for state, count in conn.execute(
+                'SELECT state, COUNT(*) FROM audit_job_slugs WHERE job_id = ? GROUP BY state', (job_id,)
+            ):
+                counts[state] = count
+        return counts
+
+    def list_jobs(self, limit: int = 20) -> list[dict]:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                'SELECT * FROM audit_jobs ORDER BY created_at DESC LIMIT ?', (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
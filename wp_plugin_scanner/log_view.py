@@ -0,0 +1,137 @@
+"""Bounded GUI log view with an optional rotating log file.
+
+``BoundedLogView`` keeps at most ``max_lines`` lines in a ``tk.Text``; the
+oldest lines are trimmed as new ones arrive so insert and redraw cost stay
+constant during long runs. Every line can also be written to a
+``RotatingLogFile``, which is what searches fall back to once a line has
+left the widget.
+"""
+import os
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .config import LOG_FILE_BACKUPS, LOG_FILE_MAX_BYTES, LOG_VIEW_MAX_LINES
+
+
+class RotatingLogFile:
+    """Append-only text log rotated to ``name.1`` .. ``name.N`` by size."""
+
+    def __init__(self, path: Path, max_bytes: int = LOG_FILE_MAX_BYTES, backups: int = LOG_FILE_BACKUPS):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write_lines(self, lines: list[str]) -> None:
+        if not lines:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            size = f.tell()
+        if size >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        oldest = self._backup(self.backups)
+        if oldest.exists():
+            oldest.unlink()
+        for index in range(self.backups - 1, 0, -1):
+            src = self._backup(index)
+            if src.exists():
+                os.replace(src, self._backup(index + 1))
+        if self.backups:
+            os.replace(self.path, self._backup(1))
+        else:
+            self.path.unlink()
+
+    def _backup(self, index: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.{index}")
+
+    def files(self) -> list[Path]:
+        """Existing log files, oldest first."""
+        candidates = [self._backup(i) for i in range(self.backups, 0, -1)] + [self.path]
+        return [p for p in candidates if p.exists()]
+
+    def _lines(self) -> Iterator[tuple[Path, int, str]]:
+        for path in self.files():
+            with open(path, encoding="utf-8", errors="replace") as f:
+                for lineno, line in enumerate(f, 1):
+                    yield path, lineno, line.rstrip("\n")
+
+    def search(self, term: str, limit: int = 500) -> list[tuple[Path, int, str]]:
+        """Case-insensitive substring search over every log file, oldest first."""
+        needle = term.lower()
+        hits = []
+        for hit in self._lines():
+            if needle in hit[2].lower():
+                hits.append(hit)
+                if len(hits) >= limit:
+                    break
+        return hits
+
+    def context(self, path: Path, lineno: int, radius: int = 20) -> list[tuple[int, str]]:
+        """Lines ``lineno - radius`` .. ``lineno + radius`` of one log file."""
+        first, last = max(1, lineno - radius), lineno + radius
+        lines = []
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for current, line in enumerate(f, 1):
+                if current > last:
+                    break
+                if current >= first:
+                    lines.append((current, line.rstrip("\n")))
+        return lines
+
+
+class BoundedLogView:
+    """Ring buffer of the newest ``max_lines`` lines in a read-only ``tk.Text``."""
+
+    def __init__(self, text, max_lines: int = LOG_VIEW_MAX_LINES, log_file: Optional[RotatingLogFile] = None):
+        self.text = text
+        self.max_lines = max_lines
+        self.log_file = log_file
+        self.line_count = 0
+        text.tag_configure("match", background="yellow")
+
+    def append(self, lines: list[str]) -> None:
+        if not lines:
+            return
+        if self.log_file is not None:
+            try:
+                self.log_file.write_lines(lines)
+            except OSError as e:
+                print(f"DEBUG: Could not write log file: {e}")
+        # only the newest max_lines of a huge batch are worth inserting
+        lines = lines[-self.max_lines:]
+        follow = self.text.yview()[1] >= 1.0
+        self.text.configure(state="normal")
+        self.text.insert("end", "\n".join(lines) + "\n")
+        self.line_count += len(lines)
+        excess = self.line_count - self.max_lines
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
+            self.line_count = self.max_lines
+        self.text.configure(state="disabled")
+        if follow:
+            self.text.see("end")
+
+    def clear(self) -> None:
+        self.text.configure(state="normal")
+        self.text.delete("1.0", "end")
+        self.text.configure(state="disabled")
+        self.line_count = 0
+
+    def find(self, term: str, start: str = "insert") -> bool:
+        """Highlight and jump to the next occurrence of ``term`` in the widget."""
+        self.text.tag_remove("match", "1.0", "end")
+        if not term:
+            return False
+        pos = self.text.search(term, f"{start}+1c", stopindex="end", nocase=True)
+        if not pos:
+            pos = self.text.search(term, "1.0", stopindex="end", nocase=True)
+        if not pos:
+            return False
+        end = f"{pos}+{len(term)}c"
+        self.text.tag_add("match", pos, end)
+        self.text.mark_set("insert", pos)
+        self.text.see(pos)
+        return True
@@ -1,18 +1,60 @@
 from __future__ import annotations
 import contextlib
+import hashlib
+import io
+import queue
 import shutil
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
 from pathlib import Path
-from typing import Sequence, Callable
+from typing import Callable, Iterable, Iterator, Optional, Union
 import zipfile
+from dataclasses import dataclass, field
 
-from .config import SAVE_SOURCE, SAVE_ZIP, DEFAULT_WORKERS
+from . import metrics
+from .config import SAVE_SOURCE, SAVE_ZIP, DEFAULT_WORKERS, METRICS_INTERVAL
+from .metrics import RunMetrics, SlugTimings
 from .models import PluginResult
-from .downloader import IPluginDownloader
+from .archive_memo import ArchiveMemo
+from .cleanup import DiskQuota
+from .downloader import IPluginDownloader, extract_plugin_zip
+from .path_rules import SkipStats
 from .scanner import UploadScanner
 from .reporter import IReporter
+from .report_writer import ReportWriter
+from .source_store import SourceStore
+from .job_journal import JobJournal, RetryPolicy, DOWNLOADING, SCANNED, REPORTED, ERROR
+
+_DONE = object()  # end-of-stream marker passed between pipeline stages
+
+
+@dataclass
+class _Fetched:
+    """A downloaded, extracted plugin on its way to the scan stage."""
+    path: Path
+    digest: Optional[str] = None  # archive SHA-256, with a memo
+    skipped: SkipStats = field(default_factory=SkipStats)  # members left out by the path rules
+    archive: bytes | Path | None = None  # original ZIP, saved as is when save_zip
+    attempts: int = 1  # attempts used for this slug, including the one that produced it
+
 
 class AuditManager:
+    """Download, scan and report plugins in a streaming pipeline.
+
+    Slugs flow through bounded queues (download -> scan -> report), so a slow
+    stage holds back the ones before it and memory does not grow with the
+    number of slugs; ``run`` accepts any iterable, including generators.
+    Results are written by a ``ReportWriter`` thread in group commits.
+    Per-slug stage timings are aggregated in ``self.metrics``.
+    With an ``archive_memo``, a plugin ZIP already scanned under the same
+    rule set is answered from the memo instead of being scanned again.
+    With a ``source_store``, saved sources go to its pack files instead of
+    the ``SAVE_SOURCE`` tree. A ``disk_quota`` is charged with every saved
+    source tree and ZIP and evicts old slugs once it is exceeded.
+    When the scanner has path rules, excluded archive members are not
+    extracted at all and are reported as skipped with the scan's own skips.
+    """
+
     def __init__(
         self,
         downloader: IPluginDownloader,
@@ -22,6 +64,18 @@ class AuditManager:
         save_sources: bool = False,
         save_zip: bool = True,
         max_workers: int = DEFAULT_WORKERS,
+        skip_done: bool = True,
+        scan_workers: int | None = None,
+        queue_size: int | None = None,
+        journal: JobJournal | None = None,
+        retry_policy: RetryPolicy | None = None,
+        metrics_cb: "Callable[[dict], None] | None" = None,
+        metrics_json: Path | None = None,
+        prometheus_textfile: Path | None = None,
+        metrics_interval: float = METRICS_INTERVAL,
+        archive_memo: ArchiveMemo | None = None,
+        source_store: SourceStore | None = None,
+        disk_quota: DiskQuota | None = None,
     ):
         self.downloader = downloader
         self.scanner = scanner
@@ -29,21 +83,46 @@ class AuditManager:
         self.save_sources = save_sources
         self.save_zip = save_zip
         self.max_workers = max_workers
-        
+        self.skip_done = skip_done
+        self.scan_workers = scan_workers or max(1, max_workers // 2)
+        self.queue_size = queue_size or max_workers * 2
+        self.journal = journal
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.job_id: str | None = None
+        self._retry_seqs: set[int] = set()  # errored slugs of a resumed job; their error rows are replaced
+        self._writer: ReportWriter | None = None
+        self.metrics = RunMetrics()
+        self.metrics_cb = metrics_cb
+        self.metrics_json = metrics_json
+        self.prometheus_textfile = prometheus_textfile
+        self.metrics_interval = metrics_interval
+        # the memo needs the scanner's rule-set fingerprint to key results
+        self.archive_memo = archive_memo if getattr(scanner, "ruleset", None) else None
+        self.source_store = source_store
+        self.disk_quota = disk_quota
+
         SAVE_SOURCE.mkdir(parents=True, exist_ok=True)
         SAVE_ZIP.mkdir(parents=True, exist_ok=True)
 
-    def _archive_sources(self, slug: str, plugin_path: Path):
+    def _archive_sources(self, slug: str, plugin_path: Path) -> int:
+        """Save the target files of a plugin; return the bytes saved."""
+        files = self.scanner.gather_files(plugin_path)
+        if self.source_store is not None:
+            self.source_store.put_plugin(slug, plugin_path, files)
+            return sum(src.stat().st_size for src in files)
         dest_root = SAVE_SOURCE / slug
         if dest_root.exists():
             shutil.rmtree(dest_root)
-        for src in self.scanner.gather_files(plugin_path):
+        saved = 0
+        for src in files:
             rel = src.relative_to(plugin_path)
             dest_file = dest_root / rel
             dest_file.parent.mkdir(parents=True, exist_ok=True)
             shutil.copy2(src, dest_file)
+            saved += dest_file.stat().st_size
+        return saved
     
-    def _save_zip_archive(self, slug: str, plugin_path: Path):
+    def _save_zip_archive(self, slug: str, plugin_path: Path) -> int:
         zip_path = SAVE_ZIP / f"{slug}.zip"
         if zip_path.exists():
             zip_path.unlink()
@@ -52,60 +131,388 @@ class AuditManager:
                 if src.is_file():
                     arcname = src.relative_to(plugin_path)
                     zipf.write(src, arcname)
+        return zip_path.stat().st_size
+
+    def _charge_quota(self, nbytes: int) -> None:
+        if self.disk_quota is not None and nbytes:
+            try:
+                self.disk_quota.charge(nbytes)
+            except Exception as e:
+                print(f"DEBUG: Disk quota enforcement failed: {e}")
+
+    def _mark(self, seq: int | None, state: str, error: str | None = None) -> None:
+        """Record a slug's state in the job journal, if there is one."""
+        if self.journal is not None and self.job_id is not None and seq is not None:
+            self.journal.set_state(self.job_id, seq, state, error)
+
+    def _fetch(self, slug: str) -> _Fetched | PluginResult:
+        """Download (and extract) one slug.
+
+        Returns the extracted plugin, or a memoized result when the archive
+        was scanned before. The original archive is kept for ``save_zip``,
+        so the saved ZIP is complete even when path rules filtered extraction.
+        """
+        archive = self.downloader.fetch_archive(slug)
+        if archive is None:
+            return _Fetched(self.downloader.download(slug))
+        fetched = _Fetched(None, archive=archive if self.save_zip else None)
+        if self.archive_memo is None:
+            fetched.path = self._extract(slug, archive, fetched.skipped)
+            return fetched
+        digest = _sha256(archive)
+        memoized = self.archive_memo.get(digest, self.scanner.ruleset, slug)
+        if memoized is None:
+            fetched.path, fetched.digest = self._extract(slug, archive, fetched.skipped), digest
+            return fetched
+        metrics.add_bytes("memo_hit", len(archive) if isinstance(archive, bytes) else archive.stat().st_size)
+        saved = 0
+        if self.save_sources:
+            # the scan is skipped, but archiving sources needs the files
+            tmp_path = self._extract(slug, archive)
+            try:
+                with metrics.stage("archive_sources"):
+                    saved += self._archive_sources(slug, tmp_path)
+            finally:
+                shutil.rmtree(tmp_path.parent, ignore_errors=True)
+        if self.save_zip:
+            with metrics.stage("save_zip"):
+                saved += self._copy_zip_archive(slug, archive)
+        self._charge_quota(saved)
+        return memoized
+
+    def _extract(self, slug: str, archive: bytes | Path, skipped: Optional[SkipStats] = None) -> Path:
+        try:
+            with metrics.stage("extract"):
+                source = io.BytesIO(archive) if isinstance(archive, bytes) else archive
+                return extract_plugin_zip(source, slug, getattr(self.scanner, "rules", None), skipped,
+                                          getattr(self.scanner, "exts", ()))
+        except zipfile.BadZipFile as e:
+            raise RuntimeError(f"Broken ZIP for {slug}: {e}") from e
+
+    def _copy_zip_archive(self, slug: str, archive: bytes | Path) -> int:
+        zip_path = SAVE_ZIP / f"{slug}.zip"
+        if isinstance(archive, bytes):
+            zip_path.write_bytes(archive)
+        elif not (zip_path.exists() and zip_path.samefile(archive)):
+            shutil.copyfile(archive, zip_path)
+        return zip_path.stat().st_size
+
+    def _download_stage(
+        self, seq: int | None, slug: str, attempts: int | None = None
+    ) -> Union[_Fetched, PluginResult, None]:
+        """Download one slug, retrying while the policy allows.
 
-    def _process_slug(self, slug: str) -> PluginResult:
+        Returns the extracted plugin, a result (an error, or a memo hit),
+        or None when the slug was already reported. ``attempts`` continues
+        the count of a slug whose scan failed (see ``_scan_with_retry``).
+        """
         slug = slug.strip()
         if not slug:
+            self._mark(seq, ERROR, "empty slug")
             return PluginResult(slug, "error:empty slug")
-        if self.reporter.already_done(slug):
+        retrying = attempts is not None or (seq is not None and seq in self._retry_seqs)
+        if self.skip_done and not retrying and (self._writer or self.reporter).already_done(slug):
             print(f"DEBUG: {slug} has already been processed, skipping.")
+            self._mark(seq, REPORTED)
             return None  # Do not overwrite existing results
+        if attempts is None:
+            attempts = self.journal.attempts(self.job_id, seq) if self.journal and self.job_id and seq is not None else 0
+        while True:
+            try:
+                self._mark(seq, DOWNLOADING)
+                start = time.perf_counter()
+                fetched = self._fetch(slug)
+                timings = metrics.current()
+                if timings is not None and "download" not in timings.stages:
+                    # downloader without its own instrumentation: time the whole call
+                    timings.stages["download"] = time.perf_counter() - start - timings.stages.get("extract", 0.0)
+                if isinstance(fetched, PluginResult):
+                    self._mark(seq, SCANNED)
+                else:
+                    fetched.attempts = attempts + 1
+                return fetched
+            except Exception as e:
+                attempts += 1
+                self._mark(seq, ERROR, str(e))
+                if not self.retry_policy.should_retry(attempts):
+                    return PluginResult(slug, f"error:{e}")
+                time.sleep(self.retry_policy.delay(attempts))
+
+    def _scan_stage(self, seq: int | None, slug: str, fetched: _Fetched) -> PluginResult:
+        """Scan and archive a downloaded plugin, then remove its temp directory."""
+        tmp_path, digest, skipped = fetched.path, fetched.digest, fetched.skipped
         try:
-            tmp_path = self.downloader.download(slug)
-            upload_matches, files_scanned = self.scanner.scan_for_upload_features(tmp_path)
+            with metrics.stage("scan"):
+                if hasattr(self.scanner, "scan"):
+                    outcome = self.scanner.scan(tmp_path)
+                    upload_matches, files_scanned = outcome.matches, outcome.files_scanned
+                    files_skipped, bytes_skipped = outcome.files_skipped, outcome.bytes_skipped
+                else:
+                    upload_matches, files_scanned = self.scanner.scan_for_upload_features(tmp_path)
+                    files_skipped = bytes_skipped = 0
+            files_skipped += skipped.files
+            bytes_skipped += skipped.bytes
+            if metrics.current() is not None:
+                metrics.current().files_scanned = files_scanned
             has_upload = len(upload_matches) > 0
-            
+            self._mark(seq, SCANNED)
+
+            saved = 0
             if self.save_sources:
-                self._archive_sources(slug, tmp_path)
-                
+                with metrics.stage("archive_sources"):
+                    saved += self._archive_sources(slug, tmp_path)
+
             if self.save_zip:
-                self._save_zip_archive(slug, tmp_path)
-                
+                with metrics.stage("save_zip"):
+                    if fetched.archive is not None:
+                        saved += self._copy_zip_archive(slug, fetched.archive)
+                    else:
+                        saved += self._save_zip_archive(slug, tmp_path)
+            self._charge_quota(saved)
+
             status = str(has_upload)
-            result = PluginResult(slug, status, upload_matches=upload_matches, files_scanned=files_scanned)
+            result = PluginResult(slug, status, upload_matches=upload_matches, files_scanned=files_scanned,
+                                  files_skipped=files_skipped, bytes_skipped=bytes_skipped)
+            if digest is not None and self.archive_memo is not None:
+                try:
+                    self.archive_memo.put(digest, self.scanner.ruleset, result)
+                except Exception as e:
+                    print(f"DEBUG: Failed to memoize {slug}: {e}")
         except Exception as e:
             status = f"error:{e}"
             result = PluginResult(slug, status)
+            self._mark(seq, ERROR, str(e))
         finally:
             with contextlib.suppress(Exception):
-                if "tmp_path" in locals() and tmp_path.exists():
+                if tmp_path.exists():
                     shutil.rmtree(tmp_path.parent, ignore_errors=True)
         return result
 
+    def _scan_with_retry(self, seq: int | None, slug: str, fetched: _Fetched) -> PluginResult:
+        """Scan a fetched plugin; if that fails, download and scan it again while the policy allows."""
+        while True:
+            result = self._scan_stage(seq, slug, fetched)
+            if not result.status.startswith("error:") or not self.retry_policy.should_retry(fetched.attempts):
+                return result
+            time.sleep(self.retry_policy.delay(fetched.attempts))
+            refetched = self._download_stage(seq, slug, attempts=fetched.attempts)
+            if refetched is None or isinstance(refetched, PluginResult):
+                return refetched or result
+            fetched = refetched
+
+    def _process_slug(self, slug: str, seq: int | None = None) -> PluginResult:
+        """Process one slug serially (download, scan, archive)."""
+        fetched = self._download_stage(seq, slug)
+        if fetched is None or isinstance(fetched, PluginResult):
+            return fetched
+        return self._scan_with_retry(seq, slug.strip(), fetched)
+
     def run(
         self,
-        slugs: Sequence[str],
+        slugs: Iterable[str],
         *,
         progress_cb: "Callable[[str], None] | None" = None,
     ) -> None:
-        """Process each slug and report progress."""
+        """Process each slug and report progress.
+
+        ``slugs`` may be a generator; it is consumed only as fast as the
+        download stage takes new work.
+        """
         log = progress_cb or print
-        if not slugs:
+        total = len(slugs) if hasattr(slugs, "__len__") else None
+        if total == 0:
             log("[!] No slugs to process.")
             return
-        total = len(slugs)
-        with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
-            futs = []
-            for idx, slug in enumerate(slugs, start=1):
-                log(f"[{idx}/{total}] Checking {slug}...")
-                futs.append(ex.submit(self._process_slug, slug))
-            for i, fut in enumerate(as_completed(futs), start=1):
-                res = fut.result()
+        self._retry_seqs = set()
+        if self.journal is not None:
+            self.job_id = self.journal.create_job()
+            log(f"[i] Job {self.job_id} (resume with --resume {self.job_id})")
+        self._run_items(self._numbered(slugs, total is not None), total, log)
+
+    def _numbered(self, slugs: Iterable[str], sized: bool) -> Iterator[tuple[int, str]]:
+        """Assign sequence numbers and record slugs in the journal as they arrive."""
+        if self.journal is None:
+            yield from enumerate(slugs)
+            return
+        if sized:
+            # a list is journaled in one transaction before any work starts
+            self.journal.add_slugs(self.job_id, slugs, start_seq=0)
+            yield from enumerate(slugs)
+            return
+        for seq, slug in enumerate(slugs):
+            self.journal.add_slugs(self.job_id, [slug], start_seq=seq)
+            yield seq, slug
+
+    def resume(
+        self,
+        job_id: str,
+        *,
+        progress_cb: "Callable[[str], None] | None" = None,
+    ) -> None:
+        """Continue a journaled job with the slugs it has not finished."""
+        log = progress_cb or print
+        if self.journal is None or not self.journal.job_exists(job_id):
+            log(f"[!] Unknown job: {job_id}")
+            return
+        self.job_id = job_id
+        items = list(self.journal.remaining(job_id, self.retry_policy))
+        # errors were reported too, so already_done would skip them instead of retrying
+        self._retry_seqs = self.journal.errored(job_id)
+        log(f"[i] Resuming job {job_id}: {len(items)} slugs left")
+        self._run_items(iter(items), len(items), log)
+
+    def _run_items(
+        self,
+        items: Iterator[tuple[int, str]],
+        total: int | None,
+        log: "Callable[[str], None]",
+    ) -> None:
+        """Feed (seq, slug) pairs through the download/scan/report stages.
+
+        Download and scan workers run in threads; results are logged on the
+        calling thread and written by the report writer. Every queue is
+        bounded by ``queue_size``.
+        """
+        download_q: queue.Queue = queue.Queue(self.queue_size)
+        scan_q: queue.Queue = queue.Queue(self.queue_size)
+        report_q: queue.Queue = queue.Queue(self.queue_size)
+        stop = threading.Event()
+        of_total = f"/{total}" if total is not None else ""
+        in_writer: dict[str, tuple[int | None, SlugTimings]] = {}  # slug -> (seq to mark, timings)
+        in_writer_lock = threading.Lock()
+        self.metrics = RunMetrics()
+
+        def on_written(results):
+            # journal "reported" only once the results are committed
+            share = writer.last_write_seconds / len(results)
+            seqs = []
+            for r in results:
+                with in_writer_lock:
+                    seq, timings = in_writer.pop(r.slug, (None, None))
+                if seq is not None:
+                    seqs.append(seq)
+                if timings is not None:
+                    timings.stages["add_result"] = share
+                    self.metrics.observe(timings)
+            if self.journal is not None and self.job_id is not None and seqs:
+                self.journal.set_states(self.job_id, seqs, REPORTED)
+
+        writer = ReportWriter(self.reporter, on_written=on_written).start()
+        self._writer = writer
+
+        def feed():
+            try:
+                for idx, item in enumerate(items, start=1):
+                    if stop.is_set():
+                        break
+                    download_q.put(item)  # blocks while the downloaders are busy
+                    log(f"[{idx}{of_total}] Checking {item[1]}...")
+            except Exception as e:
+                print(f"DEBUG: slug source failed: {e}")
+                log(f"[!] Slug source failed: {e}")
+            finally:
+                for _ in range(self.max_workers):
+                    download_q.put(_DONE)
+
+        def download_worker():
+            while (item := download_q.get()) is not _DONE:
+                seq, slug = item
+                if stop.is_set():
+                    continue
+                timings = SlugTimings(slug.strip())
+                try:
+                    with metrics.tracking(timings):
+                        fetched = self._download_stage(seq, slug)
+                except Exception as e:
+                    fetched = PluginResult(slug.strip(), f"error:{e}")
+                if fetched is None or isinstance(fetched, PluginResult):
+                    report_q.put((seq, fetched, timings))
+                else:
+                    scan_q.put((seq, slug.strip(), fetched, timings))
+
+        def scan_worker():
+            while (item := scan_q.get()) is not _DONE:
+                seq, slug, fetched, timings = item
+                if stop.is_set():
+                    shutil.rmtree(fetched.path.parent, ignore_errors=True)
+                    continue
+                with metrics.tracking(timings):
+                    result = self._scan_with_retry(seq, slug, fetched)
+                report_q.put((seq, result, timings))
+
+        def close_after(threads, q, count):
+            for t in threads:
+                t.join()
+            for _ in range(count):
+                q.put(_DONE)
+
+        downloaders = [threading.Thread(target=download_worker, daemon=True) for _ in range(self.max_workers)]
+        scanners = [threading.Thread(target=scan_worker, daemon=True) for _ in range(self.scan_workers)]
+        threads = [
+            threading.Thread(target=feed, daemon=True),
+            *downloaders,
+            *scanners,
+            threading.Thread(target=close_after, args=(downloaders, scan_q, self.scan_workers), daemon=True),
+            threading.Thread(target=close_after, args=(scanners, report_q, 1), daemon=True),
+        ]
+        for t in threads:
+            t.start()
+
+        done = 0
+        next_metrics = time.monotonic() + self.metrics_interval
+        try:
+            while (item := report_q.get()) is not _DONE:
+                seq, res, timings = item
+                done += 1
+                left = f"remaining {total - done}" if total is not None else f"done {done}"
                 if res is not None:
-                    self.reporter.add_result(res)
-                    remaining = total - i
-                    log(f"[{res.readable_time}] {res.slug}: {res.status} (remaining {remaining})")
+                    timings.status = res.status
+                    with in_writer_lock:
+                        in_writer[res.slug] = (None if res.status.startswith("error:") else seq, timings)
+                    writer.add_result(res)
+                    log(f"[{res.readable_time}] {res.slug}: {res.status} ({left})")
                 else:
-                    remaining = total - i
-                    log(f"[✓] skipped (remaining {remaining})")
-                    
+                    timings.status = "skipped"
+                    self.metrics.observe(timings)
+                    log(f"[✓] skipped ({left})")
+                if time.monotonic() >= next_metrics:
+                    next_metrics = time.monotonic() + self.metrics_interval
+                    self._publish_metrics()
+        except BaseException:
+            # let the workers drain so no thread stays blocked on a full queue
+            stop.set()
+            while report_q.get() is not _DONE:
+                pass
+            raise
+        finally:
+            for t in threads:
+                t.join()
+            self._writer = None
+            writer.close()
+        if self.journal is not None and self.job_id is not None:
+            self.journal.finish(self.job_id)
+            log(f"[i] Job {self.job_id}: {self.journal.summary(self.job_id)}")
+        log(self.metrics.format_line())
+        self._publish_metrics(final=True)
+
+    def _publish_metrics(self, final: bool = False) -> None:
+        """Hand the current metrics to the callback and the configured exports."""
+        try:
+            if self.metrics_cb is not None:
+                self.metrics_cb(self.metrics.snapshot())
+            if self.prometheus_textfile is not None:
+                self.metrics.write_prometheus(self.prometheus_textfile)
+            if final and self.metrics_json is not None:
+                self.metrics.write_json(self.metrics_json)
+        except Exception as e:
+            print(f"DEBUG: Failed to publish metrics: {e}")
+
+
+def _sha256(archive: bytes | Path) -> str:
+    if isinstance(archive, bytes):
+        return hashlib.sha256(archive).hexdigest()
+    h = hashlib.sha256()
+    with open(archive, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
@@ -0,0 +1,196 @@
+"""Per-slug stage timings and run-wide throughput metrics.
+
+Each slug carries a ``SlugTimings`` record through the AuditManager
+pipeline. Code that runs for the slug (downloader, scanner, archiving)
+reports into it with ``stage()`` / ``add_bytes()`` while the record is
+active on the current thread (``tracking()``); outside a tracked block
+those calls do nothing, so instrumented code works unchanged elsewhere.
+
+``RunMetrics`` aggregates finished records into totals, rolling latency
+percentiles and throughput, and can export them as JSON or as a
+Prometheus textfile.
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+
+STAGES = ("download", "extract", "scan", "archive_sources", "save_zip", "add_result")
+
+_current = threading.local()
+
+
+@dataclass
+class SlugTimings:
+    """Stage durations (seconds) and byte counts for one slug."""
+    slug: str
+    stages: dict[str, float] = field(default_factory=dict)
+    bytes: dict[str, int] = field(default_factory=dict)
+    files_scanned: int = 0
+    status: str = ""
+
+    def total(self) -> float:
+        return sum(self.stages.values())
+
+
+@contextlib.contextmanager
+def tracking(timings: Optional[SlugTimings]) -> Iterator[Optional[SlugTimings]]:
+    """Make ``timings`` the record that ``stage``/``add_bytes`` report to."""
+    previous = getattr(_current, "timings", None)
+    _current.timings = timings
+    try:
+        yield timings
+    finally:
+        _current.timings = previous
+
+
+def current() -> Optional[SlugTimings]:
+    return getattr(_current, "timings", None)
+
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Add the duration of the block to stage ``name`` of the active record."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = current()
+        if timings is not None:
+            timings.stages[name] = timings.stages.get(name, 0.0) + time.perf_counter() - start
+
+
+def add_bytes(name: str, count: int) -> None:
+    timings = current()
+    if timings is not None:
+        timings.bytes[name] = timings.bytes.get(name, 0) + count
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # nearest-rank percentile
+    index = min(len(sorted_values), max(1, math.ceil(q * len(sorted_values)))) - 1
+    return sorted_values[index]
+
+
+class RunMetrics:
+    """Thread-safe aggregate of the ``SlugTimings`` of one run."""
+
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self, window: int = 1000, rate_window: float = 60.0):
+        self.started = time.time()
+        self.rate_window = rate_window
+        self._lock = threading.Lock()
+        self._recent: dict[str, deque] = {}  # stage -> last ``window`` durations
+        self._window = window
+        self._stage_sum: dict[str, float] = {}
+        self._stage_count: dict[str, int] = {}
+        self._bytes: dict[str, int] = {}
+        self._status: dict[str, int] = {}
+        self._files_scanned = 0
+        self._finished: deque = deque()  # (time, download bytes) inside rate_window
+
+    def observe(self, timings: SlugTimings) -> None:
+        now = time.time()
+        status = timings.status if not timings.status.startswith("error") else "error"
+        with self._lock:
+            for name, seconds in timings.stages.items():
+                self._recent.setdefault(name, deque(maxlen=self._window)).append(seconds)
+                self._stage_sum[name] = self._stage_sum.get(name, 0.0) + seconds
+                self._stage_count[name] = self._stage_count.get(name, 0) + 1
+            for name, count in timings.bytes.items():
+                self._bytes[name] = self._bytes.get(name, 0) + count
+            self._status[status] = self._status.get(status, 0) + 1
+            self._files_scanned += timings.files_scanned
+            self._finished.append((now, timings.bytes.get("download", 0)))
+            self._expire(now)
+
+    def _expire(self, now: float) -> None:
+        while self._finished and self._finished[0][0] < now - self.rate_window:
+            self._finished.popleft()
+
+    def snapshot(self) -> dict:
+        """Current totals, rolling percentiles and throughput as plain data."""
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            stages = {}
+            for name in sorted(self._stage_sum, key=lambda n: (STAGES + (n,)).index(n)):
+                recent = sorted(self._recent[name])
+                stages[name] = {
+                    "count": self._stage_count[name],
+                    "seconds": round(self._stage_sum[name], 6),
+                    **{f"p{round(q * 100)}": round(_percentile(recent, q), 6) for q in self.QUANTILES},
+                }
+            window = min(self.rate_window, max(now - self.started, 1e-9))
+            elapsed = max(now - self.started, 1e-9)
+            finished = sum(self._status.values())
+            return {
+                "elapsed": round(elapsed, 3),
+                "slugs": finished,
+                "status": dict(self._status),
+                "files_scanned": self._files_scanned,
+                "bytes": dict(self._bytes),
+                "stages": stages,
+                "throughput": {
+                    "slugs_per_second": round(finished / elapsed, 3),
+                    "recent_slugs_per_second": round(len(self._finished) / window, 3),
+                    "recent_download_bytes_per_second": round(sum(b for _, b in self._finished) / window, 1),
+                },
+            }
+
+    def format_line(self) -> str:
+        """One-line summary for progress logs."""
+        snap = self.snapshot()
+        busiest = max(snap["stages"].items(), key=lambda kv: kv[1]["seconds"], default=(None, None))[0]
+        rate = snap["throughput"]
+        return (
+            f"[metrics] {snap['slugs']} slugs, {rate['recent_slugs_per_second']:.2f}/s, "
+            f"{rate['recent_download_bytes_per_second'] / 1e6:.2f} MB/s down, busiest stage: {busiest or '-'}"
+        )
+
+    def write_json(self, path: Path) -> None:
+        _atomic_write(Path(path), json.dumps(self.snapshot(), indent=2))
+
+    def write_prometheus(self, path: Path, prefix: str = "wp_audit") -> None:
+        """Write the snapshot in the Prometheus textfile-collector format."""
+        snap = self.snapshot()
+        lines = [
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for name, data in snap["stages"].items():
+            for q in self.QUANTILES:
+                lines.append(f'{prefix}_stage_seconds{{stage="{name}",quantile="{q}"}} {data[f"p{round(q * 100)}"]}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {data["seconds"]}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {data["count"]}')
+        lines.append(f"# TYPE {prefix}_bytes_total counter")
+        for name, count in snap["bytes"].items():
+            lines.append(f'{prefix}_bytes_total{{stage="{name}"}} {count}')
+        lines.append(f"# TYPE {prefix}_slugs_total counter")
+        for status, count in snap["status"].items():
+            lines.append(f'{prefix}_slugs_total{{status="{status}"}} {count}')
+        lines.append(f"# TYPE {prefix}_files_scanned_total counter")
+        lines.append(f"{prefix}_files_scanned_total {snap['files_scanned']}")
+        lines.append(f"# TYPE {prefix}_slugs_per_second gauge")
+        lines.append(f"{prefix}_slugs_per_second {snap['throughput']['recent_slugs_per_second']}")
+        lines.append(f"# TYPE {prefix}_download_bytes_per_second gauge")
+        lines.append(f"{prefix}_download_bytes_per_second {snap['throughput']['recent_download_bytes_per_second']}")
+        _atomic_write(Path(path), "\n".join(lines) + "\n")
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    # node_exporter may read the file at any moment; never expose a partial one
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
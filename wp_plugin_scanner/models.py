@@ -10,6 +10,8 @@ class UploadMatch:
     line_number: int
     line_content: str
     matched_pattern: str
+    context_before: str = ""  # 前後の行（改行区切り）
+    context_after: str = ""
 
 @dataclass
 class PluginResult:
@@ -18,6 +20,8 @@ class PluginResult:
     timestamp: float = field(default_factory=time.time)
     upload_matches: List[UploadMatch] = field(default_factory=list)  # 検出された詳細情報
     files_scanned: int = 0  # スキャンしたファイル数
+    files_skipped: int = 0  # パスルールで除外したファイル数
+    bytes_skipped: int = 0  # 除外したファイルの合計バイト数
 
     @property
     def readable_time(self) -> str:
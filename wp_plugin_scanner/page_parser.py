@@ -0,0 +1,297 @@
+"""Field extraction for the wordpress.org plugin page fallback.
+
+``extract_page_fields`` pulls every field ``PluginDetailFetcher`` needs in a
+single ``HTMLParser`` pass without building a tree. It mirrors the
+BeautifulSoup ``html.parser`` semantics used by ``extract_page_fields_soup``
+(``.string`` matching, ``get_text`` string types, whitespace collapsing) so
+both produce identical ``PluginDetails``.
+"""
+import re
+from html.entities import html5
+from html.parser import HTMLParser
+from typing import Optional
+
+from bs4 import BeautifulSoup
+
+LI_PATTERNS = {
+    "version": re.compile(r'Version:'),
+    "last_updated": re.compile(r'Last updated:'),
+    "active_installs": re.compile(r'Active installations:'),
+    "wp_version": re.compile(r'WordPress Version:'),
+    "downloaded": re.compile(r'Downloaded'),
+}
+
+# BeautifulSoup's html.parser tree builder settings
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen',
+    'link', 'menuitem', 'meta', 'param', 'source', 'track', 'wbr',
+    'basefont', 'bgsound', 'command', 'frame', 'image', 'isindex',
+    'nextid', 'spacer',
+}
+STRING_CONTAINERS = {'rt', 'rp', 'style', 'script', 'template'}
+PRESERVE_WHITESPACE = {'pre', 'textarea'}
+ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+_ENTITIES: dict[str, str] = {}
+for _name, _char in sorted(html5.items()):
+    _ENTITIES.setdefault(_name[:-1] if _name.endswith(';') else _name, _char)
+
+# kinds of text nodes
+_PLAIN, _CONTAINED, _OTHER = 0, 1, 2
+
+
+def _has_token(value: Optional[str], token: str) -> bool:
+    return value is not None and (value == token or token in value.split())
+
+
+class _Frame:
+    __slots__ = ("name", "children", "single", "string", "parts")
+
+    def __init__(self, name: str, capture: bool):
+        self.name = name
+        self.children = 0
+        self.single = None  # only child: ("text", text, kind) or ("tag", frame)
+        self.string = None  # equivalent of Tag.string once closed: (text, kind)
+        self.parts = [] if capture else None
+
+
+class PluginPageExtractor(HTMLParser):
+    """Single-pass extractor for the fields read from a plugin page."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self._stack: list[_Frame] = []
+        self._open_counts: dict[str, int] = {}
+        self._capturing: list[_Frame] = []
+        self._data: list[str] = []
+        self._preserve = 0
+        self._containers = 0
+        self._li_starts: dict[int, int] = {}
+        self._order = 0
+        self._already_closed: list[str] = []
+        self.title: Optional[_Frame] = None
+        self.author: Optional[_Frame] = None
+        self.description: Optional[_Frame] = None
+        self.rating: Optional[_Frame] = None
+        self.tags: list[_Frame] = []
+        self.li_matches: dict[str, tuple[int, str]] = {}
+
+    # -- tree bookkeeping -------------------------------------------------
+    def _add_child(self, child) -> None:
+        if self._stack:
+            parent = self._stack[-1]
+            parent.children += 1
+            parent.single = child
+
+    def _flush(self, kind: Optional[int] = None) -> None:
+        if not self._data:
+            return
+        text = ''.join(self._data)
+        self._data = []
+        if not self._preserve and not text.strip(ASCII_SPACES):
+            text = '\n' if '\n' in text else ' '
+        if kind is None:
+            kind = _CONTAINED if self._containers else _PLAIN
+        self._add_child(("text", text, kind))
+        if kind == _PLAIN:
+            for frame in self._capturing:
+                frame.parts.append(text)
+
+    def _text_node(self, text: str, kind: int) -> None:
+        self._flush()
+        self._data.append(text)
+        self._flush(kind)
+
+    def _roles(self, tag: str, attrs: dict) -> list[str]:
+        """Which of the extracted fields the opening element provides."""
+        roles = []
+        if tag == 'h1':
+            if self.title is None and _has_token(attrs.get('class'), 'plugin-title'):
+                roles.append("title")
+        elif tag == 'a':
+            if self.author is None and _has_token(attrs.get('class'), 'author'):
+                roles.append("author")
+            if _has_token(attrs.get('rel'), 'tag'):
+                roles.append("tags")
+        elif tag == 'div':
+            cls = attrs.get('class')
+            if self.description is None and _has_token(cls, 'plugin-description'):
+                roles.append("description")
+            if self.rating is None and _has_token(cls, 'rating-text'):
+                roles.append("rating")
+        return roles
+
+    def _push(self, tag: str, attrs: list) -> None:
+        attr_dict = {}
+        for key, value in attrs:
+            attr_dict[key] = '' if value is None else value
+        roles = self._roles(tag, attr_dict)
+        frame = _Frame(tag, bool(roles))
+        for role in roles:
+            if role == "tags":
+                self.tags.append(frame)
+            else:
+                setattr(self, role, frame)
+        if roles:
+            self._capturing.append(frame)
+        self._add_child(("tag", frame))
+        self._stack.append(frame)
+        self._open_counts[tag] = self._open_counts.get(tag, 0) + 1
+        if tag in PRESERVE_WHITESPACE:
+            self._preserve += 1
+        if tag in STRING_CONTAINERS:
+            self._containers += 1
+        if tag == 'li':
+            self._li_starts[id(frame)] = self._order
+        self._order += 1
+
+    def _pop(self) -> None:
+        frame = self._stack.pop()
+        self._open_counts[frame.name] -= 1
+        if frame.name in PRESERVE_WHITESPACE:
+            self._preserve -= 1
+        if frame.name in STRING_CONTAINERS:
+            self._containers -= 1
+        if frame.parts is not None:
+            self._capturing.remove(frame)
+        if frame.children == 1:
+            child = frame.single
+            if child[0] == "text":
+                frame.string = (child[1], child[2])
+            else:
+                frame.string = child[1].string
+        if frame.name == 'li':
+            start = self._li_starts.pop(id(frame))
+            if frame.string is not None:
+                text, kind = frame.string
+                for key, pattern in LI_PATTERNS.items():
+                    if pattern.search(text):
+                        known = self.li_matches.get(key)
+                        if known is None or start < known[0]:
+                            self.li_matches[key] = (start, text if kind == _PLAIN else '')
+
+    def _pop_to(self, tag: str) -> None:
+        if not self._open_counts.get(tag):
+            return
+        while self._stack:
+            name = self._stack[-1].name
+            self._pop()
+            if name == tag:
+                break
+
+    # -- HTMLParser callbacks ---------------------------------------------
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        self._push(tag, attrs)
+        if tag in VOID_ELEMENTS:
+            self._pop_to(tag)
+            # BeautifulSoup ignores the next explicit end tag of this name
+            self._already_closed.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._flush()
+        self._push(tag, attrs)
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self._already_closed:
+            self._already_closed.remove(tag)
+        else:
+            self._flush()
+            self._pop_to(tag)
+
+    def handle_data(self, data):
+        self._data.append(data)
+
+    def handle_charref(self, name):
+        if name[:1] in ('x', 'X'):
+            code = int(name.lstrip('xX'), 16)
+        else:
+            code = int(name)
+        data = None
+        if code < 256:
+            try:
+                data = bytearray([code]).decode('windows-1252')
+            except UnicodeDecodeError:
+                pass
+        if not data:
+            try:
+                data = chr(code)
+            except (ValueError, OverflowError):
+                pass
+        self._data.append(data or "\N{REPLACEMENT CHARACTER}")
+
+    def handle_entityref(self, name):
+        character = _ENTITIES.get(name)
+        self._data.append(character if character is not None else "&%s" % name)
+
+    def handle_comment(self, data):
+        self._text_node(data, _OTHER)
+
+    def handle_decl(self, data):
+        self._text_node(data[len("DOCTYPE "):], _OTHER)
+
+    def unknown_decl(self, data):
+        if data.upper().startswith('CDATA['):
+            self._text_node(data[len('CDATA['):], _PLAIN)
+        else:
+            self._text_node(data, _OTHER)
+
+    def handle_pi(self, data):
+        self._text_node(data, _OTHER)
+
+    def close(self):
+        super().close()
+        self._flush()
+        while self._stack:
+            self._pop()
+
+    # -- results ----------------------------------------------------------
+    def fields(self) -> dict:
+        def text(frame):
+            return ''.join(frame.parts) if frame is not None else None
+
+        return {
+            "name": text(self.title),
+            "version": self.li_matches.get("version", (0, None))[1],
+            "author": text(self.author),
+            "description": text(self.description),
+            "last_updated": self.li_matches.get("last_updated", (0, None))[1],
+            "active_installs": self.li_matches.get("active_installs", (0, None))[1],
+            "wp_version": self.li_matches.get("wp_version", (0, None))[1],
+            "rating": text(self.rating),
+            "downloaded": self.li_matches.get("downloaded", (0, None))[1],
+            "tags": [text(f) for f in self.tags],
+        }
+
+
+def extract_page_fields(html: str) -> dict:
+    """Return the raw text of every plugin page field in one pass."""
+    parser = PluginPageExtractor()
+    parser.feed(html)
+    parser.close()
+    return parser.fields()
+
+
+def extract_page_fields_soup(html: str) -> dict:
+    """Reference implementation of ``extract_page_fields`` using BeautifulSoup."""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    def text(elem):
+        return elem.get_text() if elem else None
+
+    def li(key):
+        return text(soup.find('li', string=LI_PATTERNS[key]))
+
+    return {
+        "name": text(soup.find('h1', class_='plugin-title')),
+        "version": li("version"),
+        "author": text(soup.find('a', class_='author')),
+        "description": text(soup.find('div', class_='plugin-description')),
+        "last_updated": li("last_updated"),
+        "active_installs": li("active_installs"),
+        "wp_version": li("wp_version"),
+        "rating": text(soup.find('div', class_='rating-text')),
+        "downloaded": li("downloaded"),
+        "tags": [tag.get_text() for tag in soup.find_all('a', {'rel': 'tag'})],
+    }
@@ -0,0 +1,188 @@
+"""gitignore-style include/exclude rules for the files a scan looks at.
+
+Patterns follow ``.gitignore``: ``#`` comments, ``!`` re-includes, a trailing
+``/`` matches directories only, a pattern containing ``/`` is anchored to
+the plugin root (otherwise it matches at any depth), ``*``/``?`` do not cross
+``/`` and ``**`` does. The last matching pattern wins, and nothing inside an
+excluded directory can be re-included. Files above ``max_file_bytes`` are
+skipped as well.
+
+Paths are relative to the plugin root with ``/`` separators, so the same
+rules apply to a directory walk and to the member list of a plugin ZIP.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+# first-party code only: dependencies, bundles and translations
+VENDORED_RULES = (
+    "node_modules/",
+    "vendor/",
+    "bower_components/",
+    "*.min.js",
+    "*.bundle.js",
+    "languages/",
+    "lang/",
+)
+
+
+@dataclass
+class SkipStats:
+    """Files and bytes left out by ``PathRules``."""
+    files: int = 0
+    bytes: int = 0
+
+    def add(self, size: int) -> None:
+        self.files += 1
+        self.bytes += size
+
+
+def _translate(pattern: str) -> str:
+    out, i = [], 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[" and "]" in pattern[i + 1:]:
+            end = pattern.index("]", i + 1)
+            body = pattern[i + 1:end]
+            out.append("[" + ("^" + body[1:] if body.startswith("!") else body) + "]")
+            i = end + 1
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+class PathRules:
+    """Ordered include/exclude patterns plus an optional per-file size cap."""
+
+    def __init__(self, patterns: Iterable[str] = (), max_file_bytes: Optional[int] = None):
+        self.patterns = [p.strip() for p in patterns if p.strip() and not p.strip().startswith("#")]
+        self.max_file_bytes = max_file_bytes
+        self._rules = []  # (regex, negated, directory only)
+        for pattern in self.patterns:
+            negated = pattern.startswith("!")
+            body = pattern[1:] if negated else pattern
+            dir_only = body.endswith("/")
+            body = body.rstrip("/")
+            anchored = "/" in body
+            body = body.lstrip("/")
+            prefix = "^" if anchored else "^(?:.*/)?"
+            self._rules.append((re.compile(prefix + _translate(body) + "$"), negated, dir_only))
+
+    @classmethod
+    def from_file(cls, path: Path, max_file_bytes: Optional[int] = None) -> "PathRules":
+        return cls(Path(path).read_text(encoding="utf-8").splitlines(), max_file_bytes)
+
+    def __bool__(self) -> bool:
+        return bool(self._rules) or self.max_file_bytes is not None
+
+    def fingerprint(self) -> str:
+        """Identifies the rules, for cache keys of results that depend on them."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update("\n".join(self.patterns).encode())
+        h.update(f"\0{self.max_file_bytes}".encode())
+        return h.hexdigest()
+
+    def _matches(self, relpath: str, is_dir: bool) -> bool:
+        excluded = False
+        for regex, negated, dir_only in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(relpath):
+                excluded = not negated
+        return excluded
+
+    def excludes_dir(self, relpath: str) -> bool:
+        return self._matches(relpath, True)
+
+    def excludes(self, relpath: str, size: int = 0) -> bool:
+        """True if the file is excluded by a pattern, by a parent directory, or by size."""
+        if self.max_file_bytes is not None and size > self.max_file_bytes:
+            return True
+        parts = relpath.split("/")
+        for depth in range(1, len(parts)):
+            if self.excludes_dir("/".join(parts[:depth])):
+                return True
+        return self._matches(relpath, False)
+
+    def walk(
+        self,
+        root: Path,
+        exts: tuple[str, ...],
+        skipped: Optional[SkipStats] = None,
+    ) -> Iterator[Path]:
+        """Files under ``root`` ending with ``exts`` that the rules keep.
+
+        Excluded directories are pruned rather than walked; target files
+        left out (directly or inside pruned directories) are counted in
+        ``skipped``.
+        """
+        root = Path(root)
+        for dirpath, dirnames, filenames in os.walk(root):
+            rel_dir = Path(dirpath).relative_to(root).as_posix()
+            rel_dir = "" if rel_dir == "." else rel_dir + "/"
+            kept = []
+            for d in dirnames:
+                if self.excludes_dir(rel_dir + d):
+                    if skipped is not None:
+                        _count_tree(Path(dirpath) / d, exts, skipped)
+                else:
+                    kept.append(d)
+            dirnames[:] = kept
+            for fname in filenames:
+                if not fname.lower().endswith(exts):
+                    continue
+                path = Path(dirpath) / fname
+                excluded = self._matches(rel_dir + fname, False)
+                if not excluded and self.max_file_bytes is None:
+                    yield path
+                    continue
+                size = path.stat().st_size
+                if excluded or size > self.max_file_bytes:
+                    if skipped is not None:
+                        skipped.add(size)
+                    continue
+                yield path
+
+
+def _count_tree(path: Path, exts: tuple[str, ...], skipped: SkipStats) -> None:
+    for dirpath, _d, filenames in os.walk(path):
+        for fname in filenames:
+            if fname.lower().endswith(exts):
+                try:
+                    skipped.add((Path(dirpath) / fname).stat().st_size)
+                except OSError:
+                    pass
+
+
+def walk_files(
+    root: Path,
+    exts: tuple[str, ...],
+    rules: Optional[PathRules] = None,
+    skipped: Optional[SkipStats] = None,
+) -> Iterator[Path]:
+    """``os.walk`` of target files, filtered by ``rules`` when given."""
+    if rules:
+        yield from rules.walk(root, exts, skipped)
+        return
+    for dirpath, _d, filenames in os.walk(root):
+        for fname in filenames:
+            if fname.lower().endswith(exts):
+                yield Path(dirpath) / fname
@@ -3,19 +3,39 @@ import json
 import re
 import time
 from typing import Optional, List
-from bs4 import BeautifulSoup
+from . import endpoints
 from .config import DEFAULT_TIMEOUT
 from .models import PluginDetails
+from .http_cache import HttpResponseCache
+from .page_parser import extract_page_fields, extract_page_fields_soup
+
+PAGE_PARSERS = {
+    "fast": extract_page_fields,
+    "soup": extract_page_fields_soup,
+}
 
 class PluginDetailFetcher:
     """Fetch detailed information about WordPress plugins."""
     
-    def __init__(self, session: requests.Session | None = None):
-        self.session = session or requests.Session()
+    def __init__(
+        self,
+        session: requests.Session | None = None,
+        cache: HttpResponseCache | None = None,
+        page_parser: str = "fast",
+    ):
+        self.session = endpoints.configure_session(session or requests.Session())
         # User-Agentを設定してより丁寧にリクエストする
         self.session.headers.update({
             'User-Agent': 'WP-Plugin-Scanner/1.0 (https://github.com/your-repo)'
         })
+        self.cache = cache
+        self._page_parser = PAGE_PARSERS[page_parser]
+    
+    def _get(self, url: str):
+        """GET through the response cache when one is configured."""
+        if self.cache is None:
+            return self.session.get(url, timeout=DEFAULT_TIMEOUT)
+        return self.cache.get(self.session, url, timeout=DEFAULT_TIMEOUT)
     
     def fetch_plugin_details(self, slug: str) -> Optional[PluginDetails]:
         """
@@ -42,13 +62,13 @@ class PluginDetailFetcher:
     def _fetch_from_api(self, slug: str) -> Optional[PluginDetails]:
         """Fetch plugin details from WordPress.org API."""
         try:
-            url = f"https://api.wordpress.org/plugins/info/1.0/{slug}.json"
+            url = endpoints.info_url(slug)
             
             # 429エラーを避けるためのリトライロジック
             max_retries = 3
             for attempt in range(max_retries):
                 try:
-                    r = self.session.get(url, timeout=DEFAULT_TIMEOUT)
+                    r = self._get(url)
                     r.raise_for_status()
                     break
                 except requests.HTTPError as e:
@@ -131,53 +151,46 @@ class PluginDetailFetcher:
     def _fetch_from_page(self, slug: str) -> Optional[PluginDetails]:
         """Fetch plugin details by scraping the plugin page."""
         try:
-            url = f"https://wordpress.org/plugins/{slug}/"
-            r = self.session.get(url, timeout=DEFAULT_TIMEOUT)
+            url = endpoints.plugin_page_url(slug)
+            r = self._get(url)
             r.raise_for_status()
             
-            soup = BeautifulSoup(r.text, 'html.parser')
+            fields = self._page_parser(r.text)
             
             # Extract basic information
-            name_elem = soup.find('h1', class_='plugin-title')
-            name = name_elem.get_text().strip() if name_elem else slug
+            name = fields['name'].strip() if fields['name'] is not None else slug
             
             # Extract version from meta or sidebar
             version = None
-            version_elem = soup.find('li', string=re.compile(r'Version:'))
-            if version_elem:
-                version = version_elem.get_text().replace('Version:', '').strip()
+            if fields['version'] is not None:
+                version = fields['version'].replace('Version:', '').strip()
             
             # Extract author
             author = None
-            author_elem = soup.find('a', class_='author')
-            if author_elem:
-                author = author_elem.get_text().strip()
+            if fields['author'] is not None:
+                author = fields['author'].strip()
             
             # Extract description
             description = None
-            desc_elem = soup.find('div', class_='plugin-description')
-            if desc_elem:
-                description = desc_elem.get_text().strip()
+            if fields['description'] is not None:
+                description = fields['description'].strip()
             
             # Extract last updated
             last_updated = None
-            updated_elem = soup.find('li', string=re.compile(r'Last updated:'))
-            if updated_elem:
-                last_updated = updated_elem.get_text().replace('Last updated:', '').strip()
+            if fields['last_updated'] is not None:
+                last_updated = fields['last_updated'].replace('Last updated:', '').strip()
             
             # Extract active installations
             active_installs = None
-            installs_elem = soup.find('li', string=re.compile(r'Active installations:'))
-            if installs_elem:
-                active_installs = installs_elem.get_text().replace('Active installations:', '').strip()
+            if fields['active_installs'] is not None:
+                active_installs = fields['active_installs'].replace('Active installations:', '').strip()
             
             # Extract WordPress version compatibility
             requires_wp = None
             tested_up_to = None
             
-            wp_elem = soup.find('li', string=re.compile(r'WordPress Version:'))
-            if wp_elem:
-                wp_text = wp_elem.get_text()
+            if fields['wp_version'] is not None:
+                wp_text = fields['wp_version']
                 # Parse "WordPress Version: 4.6 or higher" or "Tested up to: 6.4"
                 if 'or higher' in wp_text:
                     requires_wp = wp_text.split('or higher')[0].replace('WordPress Version:', '').strip()
@@ -186,28 +199,23 @@ class PluginDetailFetcher:
             
             # Extract rating
             rating = None
-            rating_elem = soup.find('div', class_='rating-text')
-            if rating_elem:
-                rating_text = rating_elem.get_text()
-                rating_match = re.search(r'(\d+\.?\d*)', rating_text)
+            if fields['rating'] is not None:
+                rating_match = re.search(r'(\d+\.?\d*)', fields['rating'])
                 if rating_match:
                     rating = float(rating_match.group(1))
             
             # Extract download count
             downloaded = None
-            download_elem = soup.find('li', string=re.compile(r'Downloaded'))
-            if download_elem:
-                download_text = download_elem.get_text()
+            if fields['downloaded'] is not None:
                 # Parse "Downloaded 1,234,567 times"
-                download_match = re.search(r'Downloaded ([\d,]+)', download_text)
+                download_match = re.search(r'Downloaded ([\d,]+)', fields['downloaded'])
                 if download_match:
                     downloaded = int(download_match.group(1).replace(',', ''))
             
             # Extract tags
             tags = None
-            tag_elems = soup.find_all('a', {'rel': 'tag'})
-            if tag_elems:
-                tags = ', '.join([tag.get_text().strip() for tag in tag_elems])
+            if fields['tags']:
+                tags = ', '.join([tag.strip() for tag in fields['tags']])
             
             return PluginDetails(
                 slug=slug,
@@ -1,14 +1,15 @@
 import requests
 import time
 import re
-from typing import Callable, Optional
+from typing import Callable, Iterator, Optional
+from . import endpoints
 from .config import DEFAULT_TIMEOUT, SLUG_RE
 
 class PluginLister:
     """Fetch all available WordPress plugins from the repository."""
     
     def __init__(self, session: requests.Session | None = None):
-        self.session = session or requests.Session()
+        self.session = endpoints.configure_session(session or requests.Session())
         # User-Agentを設定してより丁寧にリクエストする
         self.session.headers.update({
             'User-Agent': 'WP-Plugin-Scanner/1.0 (https://github.com/your-repo)'
@@ -23,7 +24,7 @@ class PluginLister:
         """
         try:
             # Try to get total count from the main plugins page
-            url = "https://wordpress.org/plugins/"
+            url = endpoints.site_url("plugins/")
             r = self.session.get(url, timeout=DEFAULT_TIMEOUT)
             r.raise_for_status()
             
@@ -62,7 +63,7 @@ class PluginLister:
         """
         try:
             # Search for a very common term to get maximum results
-            url = "https://wordpress.org/plugins/search/wordpress/"
+            url = endpoints.site_url("plugins/search/wordpress/")
             r = self.session.get(url, timeout=DEFAULT_TIMEOUT)
             r.raise_for_status()
             
@@ -116,7 +117,7 @@ class PluginLister:
                 if progress_callback:
                     progress_callback(f"Testing page {test_page}...", 0)
                 
-                url = f"https://wordpress.org/plugins/browse/popular/page/{test_page}/"
+                url = endpoints.browse_url("popular", test_page)
                 
                 try:
                     r = self.session.get(url, timeout=DEFAULT_TIMEOUT)
@@ -150,7 +151,7 @@ class PluginLister:
                 if progress_callback:
                     progress_callback(f"Binary search: testing page {mid}...", 0)
                 
-                url = f"https://wordpress.org/plugins/browse/popular/page/{mid}/"
+                url = endpoints.browse_url("popular", mid)
                 
                 try:
                     r = self.session.get(url, timeout=DEFAULT_TIMEOUT)
@@ -211,7 +212,7 @@ class PluginLister:
                 progress_callback(f"Fetching page {page}...", len(all_slugs))
             
             # WordPress.org popular plugins page
-            url = f"https://wordpress.org/plugins/browse/popular/page/{page}/"
+            url = endpoints.browse_url("popular", page)
             
             try:
                 r = self.session.get(url, timeout=DEFAULT_TIMEOUT)
@@ -268,17 +269,35 @@ class PluginLister:
             limit: Maximum number of plugins to fetch
             interval: Sleep interval between requests in seconds
         """
-        all_slugs: list[str] = []
+        return list(self.iter_by_category(category, progress_callback, limit, interval))
+
+    def iter_by_category(
+        self,
+        category: str = "popular",
+        progress_callback: Optional[Callable[[str, int], None]] = None,
+        limit: Optional[int] = None,
+        interval: float = 1.0
+    ) -> Iterator[str]:
+        """
+        Yield plugin slugs of a category page by page as they are found.
+        
+        Args:
+            category: Category name (popular, newest, updated, etc.)
+            progress_callback: Called with (status_message, plugin_count)
+            limit: Maximum number of plugins to fetch
+            interval: Sleep interval between requests in seconds
+        """
+        seen: set[str] = set()
         page = 1
         
         while True:
-            if limit and len(all_slugs) >= limit:
+            if limit and len(seen) >= limit:
                 break
                 
             if progress_callback:
-                progress_callback(f"[ページ {page}] {category}カテゴリを取得中... (現在 {len(all_slugs)} プラグイン)", len(all_slugs))
+                progress_callback(f"[ページ {page}] {category}カテゴリを取得中... (現在 {len(seen)} プラグイン)", len(seen))
             
-            url = f"https://wordpress.org/plugins/browse/{category}/page/{page}/"
+            url = endpoints.browse_url(category, page)
             
             try:
                 # 429エラーを避けるためのリトライロジック
@@ -293,13 +312,13 @@ class PluginLister:
                             if attempt < max_retries - 1:
                                 wait_time = interval * (2 ** attempt)
                                 if progress_callback:
-                                    progress_callback(f"[ページ {page}] レート制限に達しました。{wait_time:.1f}秒待機中...", len(all_slugs))
+                                    progress_callback(f"[ページ {page}] レート制限に達しました。{wait_time:.1f}秒待機中...", len(seen))
                                 time.sleep(wait_time)
                                 continue
                             else:
                                 if progress_callback:
-                                    progress_callback(f"Rate limit exceeded on page {page}", len(all_slugs))
-                                return all_slugs  # 取得できた分だけ返す
+                                    progress_callback(f"Rate limit exceeded on page {page}", len(seen))
+                                return  # 取得できた分だけ返す
                         else:
                             raise
                     except requests.RequestException as e:
@@ -307,40 +326,39 @@ class PluginLister:
                             time.sleep(interval)
                             continue
                         if progress_callback:
-                            progress_callback(f"Error on page {page}: {e}", len(all_slugs))
-                        return all_slugs  # 取得できた分だけ返す
+                            progress_callback(f"Error on page {page}: {e}", len(seen))
+                        return  # 取得できた分だけ返す
             except requests.RequestException as e:
                 if progress_callback:
-                    progress_callback(f"Error on page {page}: {e}", len(all_slugs))
+                    progress_callback(f"Error on page {page}: {e}", len(seen))
                 break
             
             matches = SLUG_RE.findall(r.text)
             
             if not matches:
                 if progress_callback:
-                    progress_callback("No more plugins found", len(all_slugs))
+                    progress_callback("No more plugins found", len(seen))
                 break
             
             page_slugs = []
             for slug in matches:
-                if slug not in all_slugs:
-                    all_slugs.append(slug)
+                if slug not in seen:
+                    seen.add(slug)
                     page_slugs.append(slug)
+                    yield slug
                     
-                    if limit and len(all_slugs) >= limit:
+                    if limit and len(seen) >= limit:
                         break
             
             if progress_callback:
-                progress_callback(f"[ページ {page}] {len(page_slugs)}個の新しいプラグインを発見 (合計: {len(all_slugs)})", len(all_slugs))
+                progress_callback(f"[ページ {page}] {len(page_slugs)}個の新しいプラグインを発見 (合計: {len(seen)})", len(seen))
             
             page += 1
             
             if interval > 0:
                 if progress_callback:
-                    progress_callback(f"次のページ({page})まで {interval}秒待機中...", len(all_slugs))
+                    progress_callback(f"次のページ({page})まで {interval}秒待機中...", len(seen))
                 time.sleep(interval)
         
         if progress_callback:
-            progress_callback(f"完了: {category}カテゴリから{len(all_slugs)}個のプラグインを取得しました", len(all_slugs))
-        
-        return all_slugs
\ No newline at end of file
+            progress_callback(f"完了: {category}カテゴリから{len(seen)}個のプラグインを取得しました", len(seen))
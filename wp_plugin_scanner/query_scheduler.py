@@ -0,0 +1,191 @@
+"""Debounced, cancellable background queries for the GUI.
+
+``QueryScheduler`` runs SQLite queries on a single worker thread. Only the
+newest request matters: submitting a query bumps a generation counter,
+interrupts the query that is currently running (``Connection.interrupt()``,
+backed by a progress handler) and drops any request that has not started
+yet. Results are delivered on the Tk thread through ``root.after`` and only
+when their generation is still current, so a slow earlier query can never
+overwrite newer results. Streams are pulled on demand: the worker fetches
+the next item only after the consumer asks for it with ``more()``.
+
+A generation keeps one connection: ``follow()`` queues further queries
+(e.g. the pages a view loads while scrolling) on the connection of the
+current generation, so temp views and attachments made by the first
+query are reused until a newer ``submit()`` replaces it.
+"""
+import sqlite3
+import threading
+from collections import deque
+from typing import Callable, Optional
+
+
+class QueryScheduler:
+    """Single-worker query runner where the newest request wins."""
+
+    def __init__(self, root, connect: Callable[[], sqlite3.Connection], delay_ms: int = 250):
+        self.root = root
+        self.connect = connect
+        self.delay_ms = delay_ms
+        self.generation = 0
+        self._cond = threading.Condition()
+        self._pending: deque = deque()
+        self._active: Optional[sqlite3.Connection] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_generation: Optional[int] = None
+        self._credit = 1  # stream items the consumer is ready for
+        self._after_id = None
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(
+        self,
+        query: Callable[[sqlite3.Connection], object],
+        on_result: Callable[[object], None],
+        on_error: Optional[Callable[[Exception], None]] = None,
+        delay_ms: Optional[int] = None,
+        on_done: Optional[Callable[[], None]] = None,
+    ) -> int:
+        """Schedule ``query(conn)`` after the debounce delay; return its generation.
+
+        With ``on_done`` the query is a stream: it returns an iterable and
+        ``on_result`` is called for every item, followed by ``on_done``.
+        After the first item the worker waits for ``more(generation)``
+        before pulling the next one, so a slow consumer holds the query
+        back instead of piling every item up on the Tk thread.
+        Must be called from the Tk thread.
+        """
+        self.cancel()
+        generation = self.generation
+        job = (generation, query, on_result, on_error, on_done)
+        delay = self.delay_ms if delay_ms is None else delay_ms
+        if delay > 0:
+            self._after_id = self.root.after(delay, self._enqueue, job)
+        else:
+            self._enqueue(job)
+        return generation
+
+    def cancel(self) -> None:
+        """Supersede every submitted query and interrupt the running one."""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        with self._cond:
+            self.generation += 1
+            self._pending.clear()
+            self._credit = 1
+            if self._active is not None:
+                self._active.interrupt()
+            # wake a stream waiting in more() so it sees the new generation
+            self._cond.notify_all()
+
+    def follow(
+        self,
+        query: Callable[[sqlite3.Connection], object],
+        on_result: Callable[[object], None],
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ) -> int:
+        """Queue ``query(conn)`` behind the current generation's queries.
+
+        Unlike ``submit()`` this neither debounces nor cancels anything; it
+        runs on the same connection and is dropped with its generation.
+        Must be called from the Tk thread.
+        """
+        with self._cond:
+            self._pending.append((self.generation, query, on_result, on_error, None))
+            self._cond.notify()
+            return self.generation
+
+    def more(self, generation: int) -> None:
+        """Let the stream of ``generation`` pull its next item."""
+        with self._cond:
+            if generation == self.generation:
+                self._credit += 1
+                self._cond.notify_all()
+
+    def close(self) -> None:
+        self.cancel()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _enqueue(self, job: tuple) -> None:
+        self._after_id = None
+        with self._cond:
+            if job[0] != self.generation:
+                return
+            self._pending.append(job)
+            self._cond.notify()
+
+    def _connection(self, generation: int) -> sqlite3.Connection:
+        # called with the lock held; one connection per generation
+        if self._conn_generation != generation:
+            self._close_connection()
+            conn = self.connect()
+            # interrupt() only stops statements that are already running;
+            # the progress handler catches a cancel that lands before that
+            conn.set_progress_handler(lambda: generation != self.generation, 10000)
+            self._conn, self._conn_generation = conn, generation
+        return self._conn
+
+    def _close_connection(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn, self._conn_generation = None, None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    self._close_connection()
+                    return
+                generation, query, on_result, on_error, on_done = self._pending.popleft()
+                if generation != self.generation:
+                    continue
+                try:
+                    conn = self._connection(generation)
+                except sqlite3.Error as e:
+                    print(f"DEBUG: QueryScheduler could not connect: {e}")
+                    continue
+                self._active = conn
+            try:
+                result, error = query(conn), None
+                if on_done is not None:
+                    self._stream(generation, result, on_result)
+            except Exception as e:
+                result, error = None, e
+            finally:
+                with self._cond:
+                    self._active = None
+            if generation != self.generation:
+                continue
+            if error is not None and on_error is None:
+                print(f"DEBUG: Background query failed: {error}")
+            elif error is not None:
+                self.root.after(0, self._deliver, generation, on_error, error)
+            elif on_done is not None:
+                self.root.after(0, self._deliver_done, generation, on_done)
+            else:
+                self.root.after(0, self._deliver, generation, on_result, result)
+
+    def _stream(self, generation: int, items, on_result: Callable) -> None:
+        for item in items:
+            self.root.after(0, self._deliver, generation, on_result, item)
+            with self._cond:
+                self._credit -= 1
+                while self._credit <= 0 and generation == self.generation and not self._closed:
+                    self._cond.wait()
+                if generation != self.generation or self._closed:
+                    return
+
+    def _deliver(self, generation: int, callback: Callable, value) -> None:
+        # runs on the Tk thread; a newer submit() may have happened meanwhile
+        if generation == self.generation:
+            callback(value)
+
+    def _deliver_done(self, generation: int, on_done: Callable[[], None]) -> None:
+        if generation == self.generation:
+            on_done()
@@ -0,0 +1,170 @@
+"""Asynchronous reporting stage for AuditManager.
+
+``ReportWriter`` wraps any ``IReporter``: ``add_result`` only enqueues, and a
+single writer thread hands everything that has piled up to the reporter's
+``add_results`` as one group commit. The queue is bounded, so a slow
+reporter still holds back the pipeline instead of buffering without limit.
+Pending results are flushed by ``close()``, at interpreter exit, and on
+SIGTERM/SIGINT when the writer is started from the main thread.
+"""
+from __future__ import annotations
+
+import atexit
+import queue
+import signal
+import threading
+import time
+from typing import Callable, Optional
+
+from .models import PluginResult
+from .reporter import IReporter
+
+_STOP = object()
+
+
+class ReportWriter(IReporter):
+    """Single writer thread in front of an ``IReporter``."""
+
+    def __init__(
+        self,
+        reporter: IReporter,
+        *,
+        batch_size: int = 200,
+        max_pending: int = 1000,
+        on_written: Optional[Callable[[list[PluginResult]], None]] = None,
+    ):
+        self.reporter = reporter
+        self.batch_size = batch_size
+        self.on_written = on_written
+        self._queue: queue.Queue = queue.Queue(max_pending)
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._previous_handlers: dict = {}
+        self.written = 0
+        self.failed = 0  # results the reporter rejected even one by one
+        self.batches = 0
+        self.last_write_seconds = 0.0  # duration of the latest group commit
+
+    # -- IReporter ---------------------------------------------------------
+    def already_done(self, slug: str) -> bool:
+        with self._lock:
+            if slug in self._pending:
+                return True
+        return self.reporter.already_done(slug)
+
+    def add_result(self, result: PluginResult) -> None:
+        if self._thread is None:
+            self.start()
+        with self._lock:
+            self._pending.add(result.slug)
+        self._queue.put(result)  # blocks while max_pending results wait
+
+    # -- lifecycle ---------------------------------------------------------
+    def start(self) -> "ReportWriter":
+        if self._thread is not None:
+            return self
+        self._thread = threading.Thread(target=self._loop, name="report-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        if threading.current_thread() is threading.main_thread():
+            self._install_signal_handlers()
+        return self
+
+    def flush(self) -> None:
+        """Block until every queued result has been handed to the reporter."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Flush and stop the writer thread; safe to call more than once."""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join()
+        atexit.unregister(self.close)
+        self._restore_signal_handlers()
+
+    def __enter__(self) -> "ReportWriter":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -- writer thread -----------------------------------------------------
+    def _loop(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            # group everything that is already waiting into one commit
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                stopping = True
+            results = [item for item in batch if item is not _STOP]
+            try:
+                if results:
+                    self._write(results)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, results: list[PluginResult]) -> None:
+        start = time.perf_counter()
+        slugs = [r.slug for r in results]
+        try:
+            self.reporter.add_results(results)
+        except Exception as e:
+            print(f"DEBUG: group write of {len(results)} results failed: {e}")
+            # retry one by one so a single bad result does not lose the batch
+            written = []
+            for result in results:
+                try:
+                    self.reporter.add_result(result)
+                    written.append(result)
+                except Exception as e:
+                    print(f"DEBUG: Failed to write result for {result.slug}: {e}")
+            self.failed += len(results) - len(written)
+            results = written
+        self.last_write_seconds = time.perf_counter() - start
+        with self._lock:
+            # failed slugs leave too, or already_done() would skip them for good
+            self._pending.difference_update(slugs)
+        self.written += len(results)
+        self.batches += 1
+        if self.on_written is not None and results:
+            try:
+                self.on_written(results)
+            except Exception as e:
+                print(f"DEBUG: on_written callback failed: {e}")
+
+    # -- signals -----------------------------------------------------------
+    def _install_signal_handlers(self) -> None:
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._previous_handlers[signum] = signal.signal(signum, self._on_signal)
+            except (ValueError, OSError) as e:
+                print(f"DEBUG: Could not install handler for signal {signum}: {e}")
+
+    def _restore_signal_handlers(self) -> None:
+        for signum, handler in self._previous_handlers.items():
+            try:
+                signal.signal(signum, handler)
+            except (ValueError, OSError):
+                pass
+        self._previous_handlers.clear()
+
+    def _on_signal(self, signum, frame) -> None:
+        # results already queued are written before the interrupt propagates
+        self.flush()
+        previous = self._previous_handlers.get(signum)
+        if callable(previous):
+            previous(signum, frame)
+        elif signum == signal.SIGINT:
+            raise KeyboardInterrupt
+        else:
+            raise SystemExit(128 + signum)
@@ -1,13 +1,21 @@
+import contextlib
 import threading
 import sqlite3
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 import pandas as pd
 from abc import ABC, abstractmethod
 
 from .config import CSV_PATH  
 from .models import PluginResult, PluginDetails, SearchResult, UploadMatch
 
+AUDIT_RESULT_COLUMNS = (
+    "slug", "upload", "timestamp", "files_scanned", "matches_count",
+    "file_path", "line_number", "line_content", "matched_pattern",
+    "files_skipped", "bytes_skipped", "context_before", "context_after",
+)
+_NUMERIC_AUDIT_COLUMNS = ("files_scanned", "matches_count", "line_number", "files_skipped", "bytes_skipped")
+
 class IReporter(ABC):
     @abstractmethod
     def already_done(self, slug: str) -> bool:
@@ -17,6 +25,35 @@ class IReporter(ABC):
     def add_result(self, result: PluginResult) -> None:
         pass
 
+    def add_results(self, results: list[PluginResult]) -> None:
+        """Store several results; reporters override this to write them in one go."""
+        for result in results:
+            self.add_result(result)
+
+    def flagged_slugs(self) -> set[str]:
+        """Slugs whose stored result is upload=True."""
+        raise NotImplementedError
+
+    def audit_times(self) -> dict[str, str]:
+        """Latest audit timestamp (``%Y-%m-%d %H:%M:%S``) of every stored slug."""
+        raise NotImplementedError
+
+
+def _result_rows(result: PluginResult) -> list[tuple]:
+    """Rows for one result in ``AUDIT_RESULT_COLUMNS`` order, one per match."""
+    files_scanned = result.files_scanned if hasattr(result, 'files_scanned') else 0
+    matches = result.upload_matches if hasattr(result, 'upload_matches') and result.upload_matches else []
+    base = (result.slug, result.status, result.readable_time, files_scanned, len(matches))
+    skipped = (result.files_skipped, result.bytes_skipped)
+    if not matches:
+        # マッチがない場合は基本情報のみ
+        return [base + ("", 0, "", "") + skipped + ("", "")]
+    return [
+        base + (match.file_path, match.line_number, match.line_content, match.matched_pattern) + skipped
+        + (match.context_before, match.context_after)
+        for match in matches
+    ]
+
 class CsvReporter(IReporter):
     def __init__(self, path: Path = CSV_PATH):
         self.path = path
@@ -39,56 +76,47 @@ class CsvReporter(IReporter):
                 self.df["line_content"] = ""
             if "matched_pattern" not in self.df.columns:
                 self.df["matched_pattern"] = ""
+            for col in ("files_skipped", "bytes_skipped"):
+                if col not in self.df.columns:
+                    self.df[col] = 0
+            for col in ("context_before", "context_after"):
+                if col not in self.df.columns:
+                    self.df[col] = ""
         else:
-            self.df = pd.DataFrame(columns=[
-                "slug", "upload", "timestamp", "files_scanned", "matches_count", 
-                "file_path", "line_number", "line_content", "matched_pattern"
-            ])
+            self.df = pd.DataFrame(columns=list(AUDIT_RESULT_COLUMNS))
+        # already_done is called once per slug; keep the lookup O(1)
+        self._done = set(self.df["slug"].astype(str))
 
     def already_done(self, slug: str) -> bool:
-        return slug in set(self.df["slug"].astype(str))
+        return slug in self._done
+
+    def flagged_slugs(self) -> set[str]:
+        with self._lock:
+            # pandas reads the column as bool when every row is True/False
+            return set(self.df.loc[self.df["upload"].astype(str) == "True", "slug"].astype(str))
+
+    def audit_times(self) -> dict[str, str]:
+        with self._lock:
+            latest = self.df.astype({"slug": str, "timestamp": str}).groupby("slug")["timestamp"].max()
+        return latest.to_dict()
 
     def add_result(self, result: PluginResult):
-        if result.status == "skipped":
-            print(f"DEBUG: {result.slug} has already been processed, skipping.")
-            return  # Do not overwrite existing results
+        self.add_results([result])
+
+    def add_results(self, results: list[PluginResult]) -> None:
+        """Replace the rows of each result's slug and rewrite the CSV once."""
+        results = [r for r in results if r.status != "skipped"]  # Do not overwrite existing results
+        if not results:
+            return
         with self._lock:
             # 既存の同じslugのデータを削除（重複を避けるため）
-            self.df = self.df[self.df['slug'] != result.slug]
-            
-            # 基本情報を準備
-            files_scanned = result.files_scanned if hasattr(result, 'files_scanned') else 0
-            matches_count = len(result.upload_matches) if hasattr(result, 'upload_matches') and result.upload_matches else 0
-            
-            # 詳細情報がある場合は各マッチごとに行を追加
-            if hasattr(result, 'upload_matches') and result.upload_matches:
-                for match in result.upload_matches:
-                    new_row = pd.DataFrame([{
-                        "slug": result.slug,
-                        "upload": result.status,
-                        "timestamp": result.readable_time,
-                        "files_scanned": files_scanned,
-                        "matches_count": matches_count,
-                        "file_path": match.file_path,
-                        "line_number": match.line_number,
-                        "line_content": match.line_content,
-                        "matched_pattern": match.matched_pattern
-                    }])
-                    self.df = pd.concat([self.df, new_row], ignore_index=True)
-            else:
-                # マッチがない場合は基本情報のみを追加
-                new_row = pd.DataFrame([{
-                    "slug": result.slug,
-                    "upload": result.status,
-                    "timestamp": result.readable_time,
-                    "files_scanned": files_scanned,
-                    "matches_count": matches_count,
-                    "file_path": "",
-                    "line_number": 0,
-                    "line_content": "",
-                    "matched_pattern": ""
-                }])
-                self.df = pd.concat([self.df, new_row], ignore_index=True)
+            slugs = {r.slug for r in results}
+            self.df = self.df[~self.df['slug'].isin(slugs)]
+            self._done.update(slugs)
+
+            rows = [row for r in results for row in _result_rows(r)]
+            new_rows = pd.DataFrame(rows, columns=list(AUDIT_RESULT_COLUMNS))
+            self.df = pd.concat([self.df, new_rows], ignore_index=True)
             
             # CSVファイルに保存
             self.df.to_csv(self.path, index=False)
@@ -115,9 +143,32 @@ class SqliteReporter(IReporter):
                     line_number INTEGER DEFAULT 0,
                     line_content TEXT DEFAULT '',
                     matched_pattern TEXT DEFAULT '',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    files_skipped INTEGER DEFAULT 0,
+                    bytes_skipped INTEGER DEFAULT 0,
+                    context_before TEXT DEFAULT '',
+                    context_after TEXT DEFAULT ''
                 )
             ''')
+            # 既存DBに後から追加したカラムを補う
+            existing = {row[1] for row in conn.execute('PRAGMA table_info(plugin_audit_results)')}
+            for col in AUDIT_RESULT_COLUMNS:
+                if col not in existing:
+                    kind = "INTEGER DEFAULT 0" if col in _NUMERIC_AUDIT_COLUMNS else "TEXT DEFAULT ''"
+                    conn.execute(f'ALTER TABLE plugin_audit_results ADD COLUMN {col} {kind}')
+            # rows imported from bool-typed CSVs by earlier versions; fixed once per DB
+            if conn.execute('PRAGMA user_version').fetchone()[0] < 1:
+                conn.execute("""
+                    UPDATE plugin_audit_results SET upload = CASE upload WHEN '1' THEN 'True' ELSE 'False' END
+                    WHERE upload IN ('1', '0')
+                """)
+                conn.execute('PRAGMA user_version = 1')
+            
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_plugin_audit_results_slug ON plugin_audit_results (slug)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_plugin_audit_results_timestamp ON plugin_audit_results (timestamp)')
+            # covering indexes for cleanup: flagged slugs and latest audit per slug
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_plugin_audit_results_upload ON plugin_audit_results (upload, slug)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_plugin_audit_results_slug_time ON plugin_audit_results (slug, timestamp)')
             
             # 古いテーブルが存在する場合は移行
             cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='plugin_results'")
@@ -154,41 +205,114 @@ class SqliteReporter(IReporter):
             return False
 
     def add_result(self, result: PluginResult):
+        self.add_results([result])
+
+    def add_results(self, results: list[PluginResult]) -> None:
+        """Replace the rows of each result's slug in a single transaction."""
+        if not results:
+            return
+        placeholders = ", ".join("?" * len(AUDIT_RESULT_COLUMNS))
         with self._lock:
             with sqlite3.connect(self.db_path) as conn:
                 # 既存の同じslugのデータを削除
-                conn.execute('DELETE FROM plugin_audit_results WHERE slug = ?', (result.slug,))
-                
-                files_scanned = result.files_scanned if hasattr(result, 'files_scanned') else 0
-                matches_count = len(result.upload_matches) if hasattr(result, 'upload_matches') and result.upload_matches else 0
-                
-                # 詳細情報がある場合は各マッチごとに行を追加
-                if hasattr(result, 'upload_matches') and result.upload_matches:
-                    for match in result.upload_matches:
-                        conn.execute('''
-                            INSERT INTO plugin_audit_results (
-                                slug, upload, timestamp, files_scanned, matches_count,
-                                file_path, line_number, line_content, matched_pattern
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', (result.slug, result.status, result.readable_time, files_scanned, matches_count,
-                              match.file_path, match.line_number, match.line_content, match.matched_pattern))
-                else:
-                    # マッチがない場合は基本情報のみを追加
-                    conn.execute('''
-                        INSERT INTO plugin_audit_results (
-                            slug, upload, timestamp, files_scanned, matches_count,
-                            file_path, line_number, line_content, matched_pattern
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (result.slug, result.status, result.readable_time, files_scanned, matches_count,
-                          '', 0, '', ''))
-                
+                conn.executemany('DELETE FROM plugin_audit_results WHERE slug = ?', [(r.slug,) for r in results])
+                conn.executemany(
+                    f'INSERT INTO plugin_audit_results ({", ".join(AUDIT_RESULT_COLUMNS)}) VALUES ({placeholders})',
+                    [row for r in results for row in _result_rows(r)],
+                )
                 conn.commit()
                 
-                # PluginDetailsSqliteReporterにも保存（互換性のため）
-                if hasattr(result, 'upload_matches') and result.upload_matches:
-                    details_reporter = PluginDetailsSqliteReporter(self.db_path)
+            # PluginDetailsSqliteReporterにも保存（互換性のため）
+            with_matches = [r for r in results if hasattr(r, 'upload_matches') and r.upload_matches]
+            if with_matches:
+                details_reporter = PluginDetailsSqliteReporter(self.db_path)
+                for result in with_matches:
                     details_reporter.save_upload_scan_result(result)
 
+    def flagged_slugs(self) -> set[str]:
+        with sqlite3.connect(self.db_path) as conn:
+            return {row[0] for row in conn.execute(
+                "SELECT DISTINCT slug FROM plugin_audit_results WHERE upload = 'True'")}
+
+    def audit_times(self) -> dict[str, str]:
+        with sqlite3.connect(self.db_path) as conn:
+            return dict(conn.execute('SELECT slug, MAX(timestamp) FROM plugin_audit_results GROUP BY slug'))
+
+    def has_results(self) -> bool:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute('SELECT 1 FROM plugin_audit_results LIMIT 1').fetchone() is not None
+
+    def import_csv(self, csv_path: Path, chunk_size: int = 10000) -> int:
+        """Load a CsvReporter file into plugin_audit_results; return the row count."""
+        imported = 0
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                # upload stays text: an all-True/False column would otherwise be stored as 1/0
+                for chunk in pd.read_csv(csv_path, chunksize=chunk_size, dtype={"slug": str, "upload": str}):
+                    if not all(col in chunk.columns for col in ("slug", "upload", "timestamp")):
+                        return 0
+                    for col in AUDIT_RESULT_COLUMNS:
+                        if col not in chunk.columns:
+                            chunk[col] = 0 if col in _NUMERIC_AUDIT_COLUMNS else ""
+                    chunk = chunk[list(AUDIT_RESULT_COLUMNS)].astype(object).where(chunk.notna(), None)
+                    placeholders = ", ".join("?" * len(AUDIT_RESULT_COLUMNS))
+                    conn.executemany(
+                        f'INSERT INTO plugin_audit_results ({", ".join(AUDIT_RESULT_COLUMNS)}) VALUES ({placeholders})',
+                        chunk.itertuples(index=False, name=None),
+                    )
+                    imported += len(chunk)
+                conn.commit()
+        return imported
+
+    def iter_audit_rows(
+        self,
+        filter_column: Optional[str] = None,
+        keyword: str = "",
+        sort_by: Optional[str] = None,
+        sort_desc: bool = False,
+        batch_size: int = 500,
+        conn: Optional[sqlite3.Connection] = None,
+    ):
+        """
+        Stream audit rows in batches, filtered and sorted by SQLite.
+        
+        Args:
+            filter_column: Column matched against ``keyword`` (case-insensitive substring)
+            keyword: Substring to look for; empty means no filter
+            sort_by: Column to sort by; newest results first when omitted
+            sort_desc: Sort in descending order
+            batch_size: Rows per yielded batch
+            conn: Connection to run on instead of a new one
+            
+        Yields:
+            Lists of tuples in ``AUDIT_RESULT_COLUMNS`` order
+        """
+        query = f'SELECT {", ".join(AUDIT_RESULT_COLUMNS)} FROM plugin_audit_results'
+        params = []
+        if keyword and filter_column in AUDIT_RESULT_COLUMNS:
+            escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            query += f" WHERE CAST({filter_column} AS TEXT) LIKE ? ESCAPE '\\'"
+            params.append(f"%{escaped}%")
+        if sort_by in AUDIT_RESULT_COLUMNS:
+            collate = "" if sort_by in _NUMERIC_AUDIT_COLUMNS else " COLLATE NOCASE"
+            query += f" ORDER BY {sort_by}{collate} {'DESC' if sort_desc else 'ASC'}, id"
+        else:
+            query += " ORDER BY timestamp DESC, id"
+        
+        owned = conn is None
+        if owned:
+            conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield rows
+        finally:
+            if owned:
+                conn.close()
+
 class CombinedReporter(IReporter):
     """複数のレポーターに結果を同時に送信する"""
     def __init__(self, reporters: list[IReporter]):
@@ -202,6 +326,80 @@ class CombinedReporter(IReporter):
         for r in self.reporters:
             r.add_result(result)
 
+    def add_results(self, results: list[PluginResult]) -> None:
+        for r in self.reporters:
+            r.add_results(results)
+
+    def flagged_slugs(self) -> set[str]:
+        return set().union(*(r.flagged_slugs() for r in self.reporters))
+
+    def audit_times(self) -> dict[str, str]:
+        times: dict[str, str] = {}
+        for r in self.reporters:
+            for slug, ts in r.audit_times().items():
+                if ts > times.get(slug, ""):
+                    times[slug] = ts
+        return times
+
+
+PLUGIN_DETAILS_COLUMNS = (
+    "slug", "name", "version", "author", "description", "short_description",
+    "last_updated", "active_installs", "active_installs_raw", "requires_wp",
+    "tested_up_to", "requires_php", "rating", "num_ratings", "support_threads",
+    "support_threads_resolved", "downloaded", "tags", "donate_link", "homepage",
+    "download_link", "screenshots", "banners", "icons", "contributors",
+    "requires_plugins", "compatibility", "added", "fetched_at", "updated_at",
+)
+
+
+def fts_query(search_term: str) -> str:
+    """Build a trigram FTS5 MATCH expression with the LIKE '%term%' semantics.
+
+    The whole term is one quoted phrase, so it matches mid-word and CJK
+    substrings. Terms shorter than a trigram cannot use the index and
+    yield an empty expression, meaning "fall back to LIKE".
+    """
+    if len(search_term) < 3:
+        return ""
+    return '"' + search_term.replace('"', '""') + '"'
+
+
+_PLUGIN_DETAILS_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
+    id INTEGER PRIMARY KEY,
+    slug TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    version TEXT,
+    author TEXT,
+    description TEXT,
+    short_description TEXT,
+    last_updated TEXT,
+    active_installs TEXT,
+    active_installs_raw INTEGER,
+    requires_wp TEXT,
+    tested_up_to TEXT,
+    requires_php TEXT,
+    rating REAL,
+    num_ratings INTEGER,
+    support_threads INTEGER,
+    support_threads_resolved INTEGER,
+    downloaded INTEGER,
+    tags TEXT,
+    donate_link TEXT,
+    homepage TEXT,
+    download_link TEXT,
+    screenshots TEXT,
+    banners TEXT,
+    icons TEXT,
+    contributors TEXT,
+    requires_plugins TEXT,
+    compatibility TEXT,
+    added TEXT,
+    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
 
 class PluginDetailsSqliteReporter:
     """Reporter for storing detailed plugin information in SQLite."""
@@ -209,46 +407,20 @@ class PluginDetailsSqliteReporter:
     def __init__(self, db_path: Path = Path("plugin_details.db")):
         self.db_path = db_path
         self._lock = threading.Lock()
+        self.fts_enabled = False
         self._init_db()
     
     def _init_db(self):
         """Initialize database tables."""
         with sqlite3.connect(self.db_path) as conn:
+            # slugだけが主キーの古いテーブルは、明示的なid列付きに作り直す
+            # （暗黙のrowidはVACUUMで振り直され、FTSの索引とずれるため）
+            old_columns = [row[1] for row in conn.execute("PRAGMA table_info(plugin_details)")]
+            if old_columns and "id" not in old_columns:
+                self._migrate_details_table(conn, old_columns)
+            
             # Plugin details table
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS plugin_details (
-                    slug TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    version TEXT,
-                    author TEXT,
-                    description TEXT,
-                    short_description TEXT,
-                    last_updated TEXT,
-                    active_installs TEXT,
-                    active_installs_raw INTEGER,
-                    requires_wp TEXT,
-                    tested_up_to TEXT,
-                    requires_php TEXT,
-                    rating REAL,
-                    num_ratings INTEGER,
-                    support_threads INTEGER,
-                    support_threads_resolved INTEGER,
-                    downloaded INTEGER,
-                    tags TEXT,
-                    donate_link TEXT,
-                    homepage TEXT,
-                    download_link TEXT,
-                    screenshots TEXT,
-                    banners TEXT,
-                    icons TEXT,
-                    contributors TEXT,
-                    requires_plugins TEXT,
-                    compatibility TEXT,
-                    added TEXT,
-                    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+            conn.execute(_PLUGIN_DETAILS_TABLE.format(name="plugin_details"))
             
             # Search results table
             conn.execute('''
@@ -311,37 +483,160 @@ class PluginDetailsSqliteReporter:
             conn.execute('CREATE INDEX IF NOT EXISTS idx_search_results_date ON search_results (search_date)')
             
             conn.commit()
+        
+        self.fts_enabled = self._init_fts()
     
-    def save_plugin_details(self, details: PluginDetails) -> bool:
-        """Save plugin details to database."""
+    @staticmethod
+    def _migrate_details_table(conn: sqlite3.Connection, old_columns: list[str]) -> None:
+        """Rebuild a slug-keyed plugin_details with an explicit id, keeping rowids as ids.
+        
+        The copy is built under a new name and renamed over the old table
+        in one transaction: renaming the old table away instead would make
+        SQLite rewrite the child tables' foreign keys to point at it.
+        """
+        kept = ", ".join(c for c in PLUGIN_DETAILS_COLUMNS if c in old_columns)
+        conn.execute("BEGIN")
         try:
-            with self._lock:
-                with sqlite3.connect(self.db_path) as conn:
-                    conn.execute('''
-                        INSERT OR REPLACE INTO plugin_details (
-                            slug, name, version, author, description, short_description,
-                            last_updated, active_installs, active_installs_raw, requires_wp,
-                            tested_up_to, requires_php, rating, num_ratings, support_threads,
-                            support_threads_resolved, downloaded, tags, donate_link, homepage,
-                            download_link, screenshots, banners, icons, contributors,
-                            requires_plugins, compatibility, added, fetched_at, updated_at
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        details.slug, details.name, details.version, details.author,
-                        details.description, details.short_description, details.last_updated,
-                        details.active_installs, details.active_installs_raw, details.requires_wp,
-                        details.tested_up_to, details.requires_php, details.rating, details.num_ratings,
-                        details.support_threads, details.support_threads_resolved, details.downloaded,
-                        details.tags, details.donate_link, details.homepage, details.download_link,
-                        details.screenshots, details.banners, details.icons, details.contributors,
-                        details.requires_plugins, details.compatibility, details.added,
-                        details.fetched_at, details.fetched_at
-                    ))
-                    conn.commit()
-                    return True
+            conn.execute(_PLUGIN_DETAILS_TABLE.format(name="plugin_details_new"))
+            conn.execute(f"INSERT INTO plugin_details_new (id, {kept}) SELECT rowid, {kept} FROM plugin_details")
+            conn.execute("DROP TABLE plugin_details")
+            conn.execute("ALTER TABLE plugin_details_new RENAME TO plugin_details")
+            conn.commit()
         except Exception:
+            conn.rollback()
+            raise
+    
+    def _init_fts(self) -> bool:
+        """Create the FTS5 index over name/author/description and its sync triggers.
+        
+        The index uses the trigram tokenizer, keyed on the explicit
+        ``plugin_details.id``; an index built with an older layout is
+        dropped and rebuilt. Returns False when this SQLite build has no
+        FTS5 (or no trigram) support.
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute(
+                    "SELECT sql FROM sqlite_master WHERE type='table' AND name='plugin_details_fts'"
+                ).fetchone()
+                exists = row is not None and "trigram" in row[0] and "content_rowid='id'" in row[0]
+                if not exists:
+                    conn.execute("DROP TABLE IF EXISTS plugin_details_fts")
+                    for trigger in ("ai", "ad", "au"):
+                        conn.execute(f"DROP TRIGGER IF EXISTS plugin_details_fts_{trigger}")
+                    conn.execute('''
+                        CREATE VIRTUAL TABLE plugin_details_fts USING fts5(
+                            name, author, description,
+                            content='plugin_details', content_rowid='id',
+                            tokenize='trigram'
+                        )
+                    ''')
+                conn.execute('''
+                    CREATE TRIGGER IF NOT EXISTS plugin_details_fts_ai AFTER INSERT ON plugin_details BEGIN
+                        INSERT INTO plugin_details_fts (rowid, name, author, description)
+                        VALUES (new.id, new.name, new.author, new.description);
+                    END
+                ''')
+                conn.execute('''
+                    CREATE TRIGGER IF NOT EXISTS plugin_details_fts_ad AFTER DELETE ON plugin_details BEGIN
+                        INSERT INTO plugin_details_fts (plugin_details_fts, rowid, name, author, description)
+                        VALUES ('delete', old.id, old.name, old.author, old.description);
+                    END
+                ''')
+                conn.execute('''
+                    CREATE TRIGGER IF NOT EXISTS plugin_details_fts_au AFTER UPDATE ON plugin_details BEGIN
+                        INSERT INTO plugin_details_fts (plugin_details_fts, rowid, name, author, description)
+                        VALUES ('delete', old.id, old.name, old.author, old.description);
+                        INSERT INTO plugin_details_fts (rowid, name, author, description)
+                        VALUES (new.id, new.name, new.author, new.description);
+                    END
+                ''')
+                if not exists:
+                    # Index rows saved before this FTS table existed
+                    conn.execute("INSERT INTO plugin_details_fts (plugin_details_fts) VALUES ('rebuild')")
+                conn.commit()
+            return True
+        except sqlite3.OperationalError as e:
+            print(f"DEBUG: FTS5 unavailable, falling back to LIKE search: {e}")
             return False
     
+    def _search_condition(self, search_term: str) -> tuple[str, list]:
+        """WHERE clause (against plugin_audit_view) matching the search term."""
+        query = fts_query(search_term) if self.fts_enabled else ""
+        if query:
+            return (
+                "id IN (SELECT rowid FROM plugin_details_fts WHERE plugin_details_fts MATCH ?)",
+                [query],
+            )
+        pattern = f"%{search_term}%"
+        return (
+            "(name LIKE ? OR author LIKE ? OR description LIKE ?)",
+            [pattern, pattern, pattern],
+        )
+    
+    @staticmethod
+    def _details_row(details: PluginDetails) -> tuple:
+        return (
+            details.slug, details.name, details.version, details.author,
+            details.description, details.short_description, details.last_updated,
+            details.active_installs, details.active_installs_raw, details.requires_wp,
+            details.tested_up_to, details.requires_php, details.rating, details.num_ratings,
+            details.support_threads, details.support_threads_resolved, details.downloaded,
+            details.tags, details.donate_link, details.homepage, details.download_link,
+            details.screenshots, details.banners, details.icons, details.contributors,
+            details.requires_plugins, details.compatibility, details.added,
+            details.fetched_at, details.fetched_at
+        )
+    
+    def save_plugin_details(self, details: PluginDetails) -> bool:
+        """Save plugin details to database."""
+        return self.save_many_plugin_details([details]) == 1
+    
+    def save_many_plugin_details(self, details_iter: Iterable[PluginDetails], chunk_size: int = 500) -> int:
+        """
+        Save plugin details in bulk over a single connection.
+        
+        Rows are written with executemany, committing once per chunk of
+        ``chunk_size`` rows. ``details_iter`` may be a generator; it is
+        consumed lazily.
+        
+        Returns:
+            Number of rows written
+        """
+        saved = 0
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                chunk = []
+                for details in details_iter:
+                    chunk.append(self._details_row(details))
+                    if len(chunk) >= chunk_size:
+                        self._write_details_chunk(conn, chunk)
+                        saved += len(chunk)
+                        chunk = []
+                if chunk:
+                    self._write_details_chunk(conn, chunk)
+                    saved += len(chunk)
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"DEBUG: Error saving plugin details: {e}")
+        return saved
+    
+    def _write_details_chunk(self, conn: sqlite3.Connection, rows: list[tuple]) -> None:
+        # Upsert rather than INSERT OR REPLACE: REPLACE deletes the old row
+        # without firing delete triggers, which would desync the FTS index.
+        columns = ", ".join(PLUGIN_DETAILS_COLUMNS)
+        placeholders = ", ".join("?" * len(PLUGIN_DETAILS_COLUMNS))
+        updates = ", ".join(f"{c} = excluded.{c}" for c in PLUGIN_DETAILS_COLUMNS if c != "slug")
+        with self._lock:
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO plugin_details ({columns}) VALUES ({placeholders}) "
+                    f"ON CONFLICT(slug) DO UPDATE SET {updates}",
+                    rows,
+                )
+    
     def save_search_result(self, search_result: SearchResult, plugin_slugs: list[str]) -> Optional[int]:
         """Save search result and associated plugin slugs."""
         try:
@@ -454,7 +749,7 @@ class PluginDetailsSqliteReporter:
         try:
             with sqlite3.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
-                query = 'SELECT * FROM plugin_details ORDER BY name'
+                query = f'SELECT {", ".join(PLUGIN_DETAILS_COLUMNS)} FROM plugin_details ORDER BY name'
                 params = []
                 
                 if limit:
@@ -479,188 +774,249 @@ class PluginDetailsSqliteReporter:
             return []
     
     def search_plugins(self, search_term: str, limit: int = 50) -> list[PluginDetails]:
-        """Search plugins by name, author, or description."""
+        """Search plugins by name, author, or description.
+        
+        Uses the trigram FTS5 index (ranked substring match) when available
+        and the term is long enough, otherwise a substring LIKE scan.
+        """
         try:
             with sqlite3.connect(self.db_path) as conn:
                 conn.row_factory = sqlite3.Row
-                cursor = conn.execute('''
-                    SELECT * FROM plugin_details 
-                    WHERE name LIKE ? OR author LIKE ? OR description LIKE ?
-                    ORDER BY active_installs_raw DESC NULLS LAST, name
-                    LIMIT ?
-                ''', (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%', limit))
+                query = fts_query(search_term) if self.fts_enabled else ""
+                columns = ", ".join(f"plugin_details.{c}" for c in PLUGIN_DETAILS_COLUMNS)
+                if query:
+                    cursor = conn.execute(f'''
+                        SELECT {columns} FROM plugin_details_fts
+                        JOIN plugin_details ON plugin_details.id = plugin_details_fts.rowid
+                        WHERE plugin_details_fts MATCH ?
+                        ORDER BY bm25(plugin_details_fts, 10.0, 5.0, 1.0),
+                                 plugin_details.active_installs_raw DESC NULLS LAST
+                        LIMIT ?
+                    ''', (query, limit))
+                else:
+                    cursor = conn.execute(f'''
+                        SELECT {columns} FROM plugin_details 
+                        WHERE name LIKE ? OR author LIKE ? OR description LIKE ?
+                        ORDER BY active_installs_raw DESC NULLS LAST, name
+                        LIMIT ?
+                    ''', (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%', limit))
                 
                 rows = cursor.fetchall()
                 return [PluginDetails(**dict(row)) for row in rows]
         except Exception:
             return []
     
+    # Databases that may hold audit results, in order of precedence
+    AUDIT_DBS = (Path("plugin_upload_audit.db"), Path("plugin_details.db"))
+    
+    # How to join the latest row for a slug from each known audit table,
+    # and the expressions for its audit columns
+    _AUDIT_TABLE_JOINS = {
+        "plugin_audit_results": (
+            "{alias}.id = (SELECT MAX(id) FROM {schema}.plugin_audit_results WHERE slug = plugin_details.slug)",
+            ("{alias}.upload", "{alias}.timestamp", "{alias}.files_scanned", "{alias}.matches_count"),
+        ),
+        "plugin_results": (
+            "{alias}.rowid = (SELECT MAX(rowid) FROM {schema}.plugin_results WHERE slug = plugin_details.slug)",
+            ("{alias}.upload", "{alias}.timestamp", "{alias}.files_scanned", "{alias}.matches_count"),
+        ),
+        "upload_scan_results": (
+            "{alias}.slug = plugin_details.slug",
+            ("CASE WHEN {alias}.has_upload THEN 'True' ELSE 'False' END", "{alias}.scan_timestamp",
+             "{alias}.files_scanned", "0"),
+        ),
+    }
+    
+    @contextlib.contextmanager
+    def _query_connection(self, conn: Optional[sqlite3.Connection] = None):
+        """Yield ``conn`` when given, otherwise a fresh connection to the details DB."""
+        if conn is not None:
+            yield conn
+            return
+        with sqlite3.connect(self.db_path) as conn:
+            yield conn
+    
+    def _attach_audit_databases(self, conn: sqlite3.Connection) -> list[str]:
+        """Attach every existing audit database; return schemas in order of precedence."""
+        main_path = Path(self.db_path).resolve()
+        schemas = []
+        seen = set()
+        # Reuse attachments when the same connection queries the view again
+        attached = {Path(file).resolve(): name for _, name, file in conn.execute("PRAGMA database_list") if file}
+        for db_file in self.AUDIT_DBS + (Path(self.db_path),):
+            resolved = Path(db_file).resolve()
+            if resolved in seen:
+                continue
+            seen.add(resolved)
+            if resolved == main_path:
+                schemas.append("main")
+            elif resolved in attached:
+                schemas.append(attached[resolved])
+            elif resolved.exists():
+                schema = f"audit{len(schemas)}"
+                try:
+                    conn.execute("ATTACH DATABASE ? AS " + schema, (str(resolved),))
+                    schemas.append(schema)
+                except sqlite3.Error as e:
+                    print(f"DEBUG: Could not attach {db_file}: {e}")
+        return schemas
+    
+    def _create_audit_view(self, conn: sqlite3.Connection) -> None:
+        """
+        Create the temp view ``plugin_audit_view``: every plugin_details row
+        plus the latest audit result for its slug, taken from the highest
+        precedence source (database order, then table order).
+        
+        Each source is a LEFT JOIN on an indexed per-slug lookup, so SQLite
+        flattens the view and can stream ``ORDER BY ... LIMIT`` queries.
+        A connection that already has the view keeps it, so page queries
+        on a long-lived connection skip the attach/index/view setup.
+        """
+        if conn.execute(
+            "SELECT 1 FROM temp.sqlite_master WHERE type='view' AND name='plugin_audit_view'"
+        ).fetchone():
+            return
+        joins = []
+        present = []
+        for schema in self._attach_audit_databases(conn):
+            try:
+                tables = {row[0] for row in conn.execute(f"SELECT name FROM {schema}.sqlite_master WHERE type='table'")}
+            except sqlite3.Error as e:
+                print(f"DEBUG: Could not read {schema}: {e}")
+                continue
+            for table, (condition, columns) in self._AUDIT_TABLE_JOINS.items():
+                if table not in tables:
+                    continue
+                if table != "upload_scan_results":
+                    # Older databases lack the slug index the lookup relies on
+                    with contextlib.suppress(sqlite3.Error):
+                        conn.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_{table}_slug ON {table} (slug)")
+                alias = f"a{len(joins)}"
+                joins.append(f"LEFT JOIN {schema}.{table} {alias} ON " + condition.format(alias=alias, schema=schema))
+                present.append((f"{alias}.slug IS NOT NULL", [c.format(alias=alias) for c in columns]))
+        
+        def pick(index: int, default: str) -> str:
+            if not present:
+                return default
+            cases = " ".join(f"WHEN {flag} THEN {columns[index]}" for flag, columns in present)
+            return f"CASE {cases} ELSE {default} END"
+        
+        conn.execute(f'''
+            CREATE TEMP VIEW plugin_audit_view AS
+            SELECT plugin_details.*,
+                   {pick(0, "NULL")} AS audit_upload,
+                   {pick(1, "NULL")} AS audit_timestamp,
+                   COALESCE({pick(2, "0")}, 0) AS audit_files_scanned,
+                   COALESCE({pick(3, "0")}, 0) AS audit_matches_count
+            FROM main.plugin_details
+            {" ".join(joins)}
+        ''')
+    
+    # Sort fields accepted by get_plugins_with_audit_results
+    AUDIT_VIEW_SORT_FIELDS = {
+        "slug", "name", "active_installs_raw", "downloaded", "rating", "last_updated", "audit_timestamp",
+    }
+    _NULLS_LAST_SORT_FIELDS = {"active_installs_raw", "downloaded", "rating", "audit_timestamp"}
+    
+    def _audit_view_filter(self, search_term: str, audit_filter: str) -> tuple[list[str], list]:
+        """WHERE conditions and parameters for plugin_audit_view."""
+        where_conditions = []
+        params = []
+        
+        # Search term filter
+        if search_term.strip():
+            condition, condition_params = self._search_condition(search_term.strip())
+            where_conditions.append(condition)
+            params.extend(condition_params)
+        
+        # Audit filter
+        audit_conditions = {
+            "true": "audit_upload = 'True'",
+            "false": "audit_upload IS NOT NULL AND audit_upload != 'True'",
+            "no_audit": "audit_upload IS NULL",
+        }
+        if audit_filter in audit_conditions:
+            where_conditions.append(audit_conditions[audit_filter])
+        return where_conditions, params
+    
+    @staticmethod
+    def _keyset_condition(sort_field: str, sort_desc: bool, nulls_last: bool, after: tuple) -> tuple[str, list]:
+        """Condition selecting the rows that sort after ``after`` = (sort value, slug)."""
+        value, slug = after
+        cmp = "<" if sort_desc else ">"
+        if value is not None:
+            condition = f"({sort_field} {cmp} ? OR ({sort_field} = ? AND slug > ?)"
+            if nulls_last:
+                condition += f" OR {sort_field} IS NULL"
+            return condition + ")", [value, value, slug]
+        if nulls_last:
+            return f"({sort_field} IS NULL AND slug > ?)", [slug]
+        return f"(({sort_field} IS NULL AND slug > ?) OR {sort_field} IS NOT NULL)", [slug]
+    
     def get_plugins_with_audit_results(
         self, 
         search_term: str = "", 
         audit_filter: str = "all",  # "all", "true", "false", "no_audit"
         sort_by: str = "name", 
         sort_desc: bool = False, 
-        limit: int = 1000
+        limit: int = 1000,
+        offset: int = 0,
+        after: Optional[tuple] = None,
+        conn: Optional[sqlite3.Connection] = None
     ) -> list[dict]:
         """
         Get plugins with their audit results, with filtering and sorting options.
         
+        The audit databases are attached to the details database and joined
+        against a per-slug latest-audit view, so filtering, sorting and
+        pagination all run inside SQLite.
+        
         Args:
             search_term: Search term for plugin name/author/description
             audit_filter: Filter by audit results ("all", "true", "false", "no_audit")
-            sort_by: Sort field (name, active_installs_raw, downloaded, rating, last_updated)
+            sort_by: Sort field (slug, name, active_installs_raw, downloaded, rating, last_updated, audit_timestamp)
             sort_desc: Sort in descending order
             limit: Maximum number of results
+            offset: Number of matching rows to skip
+            after: Keyset cursor; the ``sort_key`` of the last row of the previous page
+            conn: Connection to run on, e.g. one the caller may ``interrupt()``
             
         Returns:
             List of dictionaries containing plugin details and audit results
         """
         try:
-            # Try to find audit results from multiple database files
-            audit_results = {}
-            
-            # Possible audit database files to check
-            possible_audit_dbs = [
-                "plugin_upload_audit.db",
-                "plugin_details.db", 
-                self.db_path
-            ]
-            
-            # Collect audit data from all possible sources
-            for db_file in possible_audit_dbs:
-                try:
-                    with sqlite3.connect(db_file) as conn:
-                        conn.row_factory = sqlite3.Row
-                        
-                        # Check for plugin_audit_results table
-                        tables = conn.execute("""
-                            SELECT name FROM sqlite_master 
-                            WHERE type='table' AND (
-                                name='plugin_audit_results' OR 
-                                name='plugin_results' OR
-                                name='upload_scan_results'
-                            )
-                        """).fetchall()
-                        
-                        if tables:
-                            print(f"DEBUG: Found audit tables in {db_file}: {[t[0] for t in tables]}")
-                        
-                        for table in tables:
-                            table_name = table[0]
-                            try:
-                                if table_name == 'plugin_audit_results':
-                                    rows = conn.execute('''
-                                        SELECT slug, upload, timestamp, 
-                                               COALESCE(files_scanned, 0) as files_scanned,
-                                               COALESCE(matches_count, 0) as matches_count
-                                        FROM plugin_audit_results 
-                                        ORDER BY id DESC
-                                    ''').fetchall()
-                                elif table_name == 'plugin_results':
-                                    rows = conn.execute('''
-                                        SELECT slug, upload, timestamp, 
-                                               COALESCE(files_scanned, 0) as files_scanned,
-                                               COALESCE(matches_count, 0) as matches_count
-                                        FROM plugin_results 
-                                        ORDER BY rowid DESC
-                                    ''').fetchall()
-                                elif table_name == 'upload_scan_results':
-                                    rows = conn.execute('''
-                                        SELECT slug, 
-                                               CASE WHEN has_upload THEN 'True' ELSE 'False' END as upload,
-                                               scan_timestamp as timestamp,
-                                               COALESCE(files_scanned, 0) as files_scanned,
-                                               0 as matches_count
-                                        FROM upload_scan_results 
-                                        ORDER BY scan_timestamp DESC
-                                    ''').fetchall()
-                                else:
-                                    continue
-                                
-                                print(f"DEBUG: Found {len(rows)} audit records in {db_file}.{table_name}")
-                                
-                                # Store the latest result for each plugin
-                                for row in rows:
-                                    slug = row['slug']
-                                    if slug not in audit_results:
-                                        audit_results[slug] = {
-                                            'upload': row['upload'],
-                                            'timestamp': row['timestamp'],
-                                            'files_scanned': row['files_scanned'],
-                                            'matches_count': row['matches_count']
-                                        }
-                            except sqlite3.Error as e:
-                                print(f"DEBUG: Error reading from {db_file}.{table_name}: {e}")
-                                continue
-                                
-                except sqlite3.Error as e:
-                    print(f"DEBUG: Could not connect to {db_file}: {e}")
-                    continue
-            
-            print(f"DEBUG: Total audit results collected: {len(audit_results)}")
-            
-            # Now get plugin details and combine with audit results
-            with sqlite3.connect(self.db_path) as conn:
+            with self._query_connection(conn) as conn:
                 conn.row_factory = sqlite3.Row
+                self._create_audit_view(conn)
                 
-                # Get all plugin details
-                base_query = 'SELECT * FROM plugin_details'
-                where_conditions = []
-                params = []
-                
-                # Search term filter
-                if search_term.strip():
-                    where_conditions.append('''
-                        (name LIKE ? OR author LIKE ? OR description LIKE ?)
-                    ''')
-                    search_pattern = f'%{search_term.strip()}%'
-                    params.extend([search_pattern, search_pattern, search_pattern])
-                
-                # Build final query
-                if where_conditions:
-                    base_query += " WHERE " + " AND ".join(where_conditions)
+                where_conditions, params = self._audit_view_filter(search_term, audit_filter)
                 
-                # Add ORDER BY
-                valid_sort_fields = {
-                    "slug": "slug",
-                    "name": "name",
-                    "active_installs_raw": "active_installs_raw",
-                    "downloaded": "downloaded", 
-                    "rating": "rating",
-                    "last_updated": "last_updated",
-                    "audit_timestamp": "last_updated"  # fallback to last_updated
-                }
-                
-                sort_field = valid_sort_fields.get(sort_by, "name")
+                sort_field = sort_by if sort_by in self.AUDIT_VIEW_SORT_FIELDS else "name"
                 sort_order = "DESC" if sort_desc else "ASC"
-                
                 # Handle NULL values properly for numeric fields
-                if sort_by in ["active_installs_raw", "downloaded", "rating"]:
-                    if sort_desc:
-                        base_query += f" ORDER BY {sort_field} DESC NULLS LAST"
-                    else:
-                        base_query += f" ORDER BY {sort_field} ASC NULLS LAST"
-                else:
-                    base_query += f" ORDER BY {sort_field} {sort_order}"
+                nulls_last = sort_field in self._NULLS_LAST_SORT_FIELDS
+                
+                if after is not None:
+                    condition, condition_params = self._keyset_condition(
+                        sort_field, sort_desc, nulls_last or sort_desc, after
+                    )
+                    where_conditions.append(condition)
+                    params.extend(condition_params)
                 
-                # Add LIMIT
-                base_query += " LIMIT ?"
-                params.append(limit)
+                query = 'SELECT * FROM plugin_audit_view'
+                if where_conditions:
+                    query += " WHERE " + " AND ".join(where_conditions)
                 
-                cursor = conn.execute(base_query, params)
-                rows = cursor.fetchall()
+                if nulls_last:
+                    query += f" ORDER BY {sort_field} {sort_order} NULLS LAST"
+                else:
+                    query += f" ORDER BY {sort_field} {sort_order}"
+                query += ", slug LIMIT ? OFFSET ?"
+                params.extend([limit, offset])
                 
                 results = []
-                for row in rows:
-                    row_dict = dict(row)
-                    slug = row_dict['slug']
-                    
-                    # Get audit results for this plugin
-                    audit_data = audit_results.get(slug, {})
-                    audit_result = audit_data.get('upload')
-                    
-                    # Determine audit status
+                for row in conn.execute(query, params):
+                    audit_result = row['audit_upload']
                     if audit_result is None:
                         audit_status = 'no_audit'
                     elif audit_result == 'True':
@@ -668,48 +1024,51 @@ class PluginDetailsSqliteReporter:
                     else:
                         audit_status = 'false'
                     
-                    # Apply audit filter
-                    if audit_filter != "all":
-                        if audit_filter == "true" and audit_status != "true":
-                            continue
-                        elif audit_filter == "false" and audit_status != "false":
-                            continue
-                        elif audit_filter == "no_audit" and audit_status != "no_audit":
-                            continue
-                    
-                    # Create result object
                     try:
-                        plugin = PluginDetails(**{k: v for k, v in row_dict.items() 
-                                                if k in ['slug', 'name', 'version', 'author', 'description', 
-                                                        'short_description', 'last_updated', 'active_installs', 
-                                                        'active_installs_raw', 'requires_wp', 'tested_up_to', 
-                                                        'requires_php', 'rating', 'num_ratings', 'support_threads',
-                                                        'support_threads_resolved', 'downloaded', 'tags', 
-                                                        'donate_link', 'homepage', 'download_link', 'screenshots',
-                                                        'banners', 'icons', 'contributors', 'requires_plugins',
-                                                        'compatibility', 'added', 'fetched_at']})
-                        
-                        result = {
-                            'plugin': plugin,
-                            'audit_status': audit_status,
-                            'audit_result': audit_result,
-                            'audit_timestamp': audit_data.get('timestamp'),
-                            'files_scanned': audit_data.get('files_scanned', 0),
-                            'matches_count': audit_data.get('matches_count', 0)
-                        }
-                        results.append(result)
+                        plugin = PluginDetails(**{k: row[k] for k in PLUGIN_DETAILS_COLUMNS if k != 'updated_at'})
                     except Exception:
                         continue
-                
-                # Sort by audit-related fields if needed
-                if sort_by == "audit_timestamp":
-                    results.sort(
-                        key=lambda x: x['audit_timestamp'] or "", 
-                        reverse=sort_desc
-                    )
-                
-                return results[:limit]
+                    results.append({
+                        'plugin': plugin,
+                        'audit_status': audit_status,
+                        'audit_result': audit_result,
+                        'audit_timestamp': row['audit_timestamp'],
+                        'files_scanned': row['audit_files_scanned'],
+                        'matches_count': row['audit_matches_count'],
+                        'sort_key': (row[sort_field], row['slug'])
+                    })
+                return results
                 
         except Exception as e:
             print(f"DEBUG: Error in get_plugins_with_audit_results: {e}")
             return []
+    
+    def count_plugins_with_audit_results(
+        self, search_term: str = "", audit_filter: str = "all", conn: Optional[sqlite3.Connection] = None
+    ) -> dict:
+        """
+        Count the plugins matching a filter, grouped by audit status.
+        
+        Returns:
+            Dictionary mapping "true", "false" and "no_audit" to row counts
+        """
+        counts = {"true": 0, "false": 0, "no_audit": 0}
+        try:
+            with self._query_connection(conn) as conn:
+                self._create_audit_view(conn)
+                where_conditions, params = self._audit_view_filter(search_term, audit_filter)
+                query = '''
+                    SELECT CASE WHEN audit_upload IS NULL THEN 'no_audit'
+                                WHEN audit_upload = 'True' THEN 'true'
+                                ELSE 'false' END AS audit_status,
+                           COUNT(*)
+                    FROM plugin_audit_view
+                '''
+                if where_conditions:
+                    query += " WHERE " + " AND ".join(where_conditions)
+                query += " GROUP BY audit_status"
+                for status, count in conn.execute(query, params):
+                    counts[status] = count
+        except Exception as e:
+            print(f"DEBUG: Error in count_plugins_with_audit_results: {e}")
+        return counts
@@ -0,0 +1,95 @@
+"""Persistent per-file scan results keyed by content hash.
+
+Plugins ship many byte-identical vendored files (PHPMailer, composer
+``vendor/`` trees, SDKs). ``UploadScanner`` hashes each file with BLAKE2b and
+looks the digest up here before running the pattern; a hit returns the
+stored matches (line number, line, pattern, context) without rescanning. Entries are
+stored per rule-set fingerprint, and entries of other rule sets are purged
+when a scanner with a new fingerprint attaches, so changing the pattern or
+the scanned extensions invalidates the cache.
+"""
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+from .config import SCAN_CACHE_PATH
+
+FileMatches = list[tuple[int, str, str, str, str]]  # (line_number, line_content, matched_pattern, before, after)
+
+
+class ScanCache:
+    """SQLite store of ``digest -> matches`` for one rule set at a time."""
+
+    def __init__(self, db_path: Path = SCAN_CACHE_PATH):
+        self.db_path = db_path
+        self.ruleset = ""
+        self._lock = threading.Lock()
+        self._local = threading.local()  # one connection per scan thread
+        self.hits = 0
+        self.misses = 0
+        self._init_db()
+
+    def _init_db(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS file_matches (
+                    digest BLOB NOT NULL,
+                    ruleset TEXT NOT NULL,
+                    matches TEXT NOT NULL,
+                    PRIMARY KEY (digest, ruleset)
+                ) WITHOUT ROWID
+            ''')
+            conn.commit()
+
+    def use_ruleset(self, ruleset: str) -> None:
+        """Select the rule set and drop entries computed with any other."""
+        if ruleset == self.ruleset:
+            return
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                purged = conn.execute('DELETE FROM file_matches WHERE ruleset != ?', (ruleset,)).rowcount
+                conn.commit()
+        if purged:
+            print(f"DEBUG: scan cache: rule set changed, dropped {purged} entries")
+        self.ruleset = ruleset
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute('PRAGMA synchronous=OFF')  # a lost entry is only rescanned
+            self._local.conn = conn
+        return conn
+
+    def get(self, digest: bytes) -> Optional[FileMatches]:
+        row = self._conn().execute(
+            'SELECT matches FROM file_matches WHERE digest = ? AND ruleset = ?', (digest, self.ruleset)
+        ).fetchone()
+        # counters are shared by the scan threads
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if row is None:
+            return None
+        return [tuple(m) for m in json.loads(row[0])]
+
+    def put_many(self, entries: list[tuple[bytes, FileMatches]]) -> None:
+        """Store the matches of newly scanned files in one transaction."""
+        if not entries:
+            return
+        rows = [(digest, self.ruleset, json.dumps(matches)) for digest, matches in entries]
+        conn = self._conn()
+        with self._lock:
+            conn.executemany('INSERT OR REPLACE INTO file_matches (digest, ruleset, matches) VALUES (?, ?, ?)', rows)
+            conn.commit()
+
+    def stats(self) -> dict:
+        with sqlite3.connect(self.db_path) as conn:
+            entries = conn.execute('SELECT COUNT(*) FROM file_matches WHERE ruleset = ?', (self.ruleset,)).fetchone()[0]
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": entries}
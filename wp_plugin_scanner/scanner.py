@@ -1,15 +1,59 @@
-import os
+import hashlib
+import io
 from pathlib import Path
 import re
-from typing import Tuple, List
+from dataclasses import dataclass, field
+from typing import Optional, Tuple, List
 
-from .config import UPLOAD_PATTERN
+from . import metrics
+from .config import MATCH_CONTEXT_LINES, MATCH_CONTEXT_MAX_CHARS, UPLOAD_PATTERN
 from .models import UploadMatch
+from .path_rules import PathRules, SkipStats, walk_files
+from .scan_cache import FileMatches, ScanCache
+
+SCANNER_VERSION = "2"  # bump when the matching logic below changes
+
+
+def ruleset_fingerprint(pattern: re.Pattern[bytes], exts: tuple[str, ...], context_lines: int = 0) -> str:
+    """Identify everything that decides a scan's matches."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (SCANNER_VERSION, pattern.pattern, str(pattern.flags), ",".join(exts), str(context_lines)):
+        h.update(part.encode() if isinstance(part, str) else part)
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _context(lines: list[str]) -> str:
+    return "\n".join(line.rstrip("\r\n")[:MATCH_CONTEXT_MAX_CHARS] for line in lines)
+
+
+@dataclass
+class ScanOutcome:
+    """Matches of one plugin plus what was scanned and what the path rules left out."""
+    matches: List[UploadMatch] = field(default_factory=list)
+    files_scanned: int = 0
+    files_skipped: int = 0
+    bytes_skipped: int = 0
+
 
 class UploadScanner:
-    def __init__(self, pattern: re.Pattern[bytes] = UPLOAD_PATTERN):
+    def __init__(
+        self,
+        pattern: re.Pattern[bytes] = UPLOAD_PATTERN,
+        cache: Optional[ScanCache] = None,
+        rules: Optional[PathRules] = None,
+        context_lines: int = MATCH_CONTEXT_LINES,
+    ):
         self.pattern = pattern
         self.exts = (".php", ".js", ".html", ".twig")
+        self.rules = rules if rules else None
+        self.context_lines = max(0, context_lines)
+        # per-file matches do not depend on the path rules; plugin results do
+        content_ruleset = ruleset_fingerprint(pattern, self.exts, self.context_lines)
+        self.ruleset = content_ruleset if self.rules is None else f"{content_ruleset}:{self.rules.fingerprint()}"
+        self.cache = cache
+        if cache is not None:
+            cache.use_ruleset(content_ruleset)
 
     def has_upload_feature(self, plugin_path: Path) -> bool:
         """アップロード機能があるかどうかを判定（後方互換性のため）"""
@@ -23,59 +67,77 @@ class UploadScanner:
         Returns:
             Tuple[List[UploadMatch], int]: (検出されたマッチ, スキャンしたファイル数)
         """
-        matches = []
-        files_scanned = 0
+        outcome = self.scan(plugin_path)
+        return outcome.matches, outcome.files_scanned
+
+    def scan(self, plugin_path: Path) -> ScanOutcome:
+        """Scan a plugin tree, applying the path rules while walking it."""
+        outcome = ScanOutcome()
+        skipped = SkipStats()
+        new_entries = []  # (digest, matches) of files not yet in the cache
         
-        for root, _d, files in os.walk(plugin_path):
-            for fname in files:
-                if not fname.lower().endswith(self.exts):
-                    continue
-                
-                file_path = Path(root) / fname
-                files_scanned += 1
-                
-                try:
-                    # テキストファイルとして読み込んでライン毎に検索
-                    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                        lines = f.readlines()
-                        
-                    for line_num, line in enumerate(lines, 1):
-                        line_bytes = line.encode('utf-8', errors='ignore')
-                        match = self.pattern.search(line_bytes)
-                        if match:
-                            # ファイルパスを相対パスに変換
-                            relative_path = str(file_path.relative_to(plugin_path))
-                            match_obj = UploadMatch(
-                                file_path=relative_path,
-                                line_number=line_num,
-                                line_content=line.strip(),
-                                matched_pattern=match.group(0).decode('utf-8', errors='ignore')
-                            )
-                            matches.append(match_obj)
-                            
-                except Exception:
-                    # ファイル読み込みエラーの場合、バイナリで読み込んで検索（従来の方法）
-                    try:
-                        with open(file_path, "rb") as f:
-                            content = f.read()
-                            if self.pattern.search(content):
-                                relative_path = str(file_path.relative_to(plugin_path))
-                                match_obj = UploadMatch(
-                                    file_path=relative_path,
-                                    line_number=0,  # ライン番号不明
-                                    line_content="[Binary file or encoding error]",
-                                    matched_pattern="[Pattern found in binary]"
-                                )
-                                matches.append(match_obj)
-                    except Exception:
-                        continue
-                        
-        return matches, files_scanned
+        for file_path in walk_files(plugin_path, self.exts, self.rules, skipped):
+            outcome.files_scanned += 1
+            try:
+                data = file_path.read_bytes()
+            except OSError:
+                continue
+            
+            digest = None
+            found = None
+            if self.cache is not None:
+                digest = hashlib.blake2b(data, digest_size=16).digest()
+                found = self.cache.get(digest)
+            if found is None:
+                metrics.add_bytes("scan", len(data))
+                found = self._scan_bytes(data)
+                if digest is not None:
+                    new_entries.append((digest, found))
+            else:
+                metrics.add_bytes("scan_cached", len(data))
+            
+            # ファイルパスを相対パスに変換
+            relative_path = str(file_path.relative_to(plugin_path))
+            for line_num, line_content, matched, before, after in found:
+                outcome.matches.append(UploadMatch(
+                    file_path=relative_path,
+                    line_number=line_num,
+                    line_content=line_content,
+                    matched_pattern=matched,
+                    context_before=before,
+                    context_after=after,
+                ))
+        
+        if self.cache is not None and new_entries:
+            try:
+                self.cache.put_many(new_entries)
+            except Exception as e:
+                print(f"DEBUG: Failed to update scan cache: {e}")
+        outcome.files_skipped, outcome.bytes_skipped = skipped.files, skipped.bytes
+        metrics.add_bytes("skipped", skipped.bytes)
+        return outcome
+
+    def _scan_bytes(self, data: bytes) -> FileMatches:
+        """Matches of one file's content as (line number, line, pattern, context before, context after)."""
+        found = []
+        try:
+            # テキストとして読み込んでライン毎に検索（open(..., errors="ignore") と同じ行分割）
+            lines = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8", errors="ignore").readlines()
+            n = self.context_lines
+            for line_num, line in enumerate(lines, 1):
+                line_bytes = line.encode('utf-8', errors='ignore')
+                match = self.pattern.search(line_bytes)
+                if match:
+                    # 同じ走査でマッチ前後の行を保存する（ソースを開き直さずに確認できるように）
+                    before = _context(lines[max(0, line_num - 1 - n):line_num - 1]) if n else ""
+                    after = _context(lines[line_num:line_num + n]) if n else ""
+                    found.append((line_num, line.strip(), match.group(0).decode('utf-8', errors='ignore'),
+                                  before, after))
+        except Exception:
+            # デコードエラーの場合、バイナリで検索（従来の方法）
+            if self.pattern.search(data):
+                found.append((0, "[Binary file or encoding error]", "[Pattern found in binary]", "", ""))  # ライン番号不明
+        return found
 
     def gather_files(self, plugin_path: Path) -> list[Path]:
-        collected: list[Path] = []
-        for root, _d, files in os.walk(plugin_path):
-            for fname in files:
-                if fname.lower().endswith(self.exts):
-                    collected.append(Path(root) / fname)
-        return collected
+        return list(walk_files(plugin_path, self.exts, self.rules))
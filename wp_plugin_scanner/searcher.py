@@ -1,12 +1,13 @@
 import requests
 import time
-from .config import DEFAULT_TIMEOUT, SLUG_RE, SEARCH_URL_TMPL, MAX_SEARCH_RESULTS
+from . import endpoints
+from .config import DEFAULT_TIMEOUT, SLUG_RE, MAX_SEARCH_RESULTS
 
 class PluginSearcher:
     """Search WordPress.org for plugin slugs by keyword."""
 
     def __init__(self, session: requests.Session | None = None):
-        self.session = session or requests.Session()
+        self.session = endpoints.configure_session(session or requests.Session())
         # User-Agentを設定してより丁寧にリクエストする
         self.session.headers.update({
             'User-Agent': 'WP-Plugin-Scanner/1.0 (https://github.com/your-repo)'
@@ -35,7 +36,7 @@ class PluginSearcher:
             if progress_callback:
                 progress_callback(f"[ページ {page}] '{keyword}' を検索中... (現在 {len(slugs)} プラグイン)", len(slugs))
                 
-            url = SEARCH_URL_TMPL.format(kw=requests.utils.quote(keyword), page=page)
+            url = endpoints.search_url(keyword, page)
             try:
                 # 429エラーを避けるためのリトライロジック
                 max_retries = 3
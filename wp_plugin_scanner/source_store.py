@@ -0,0 +1,284 @@
+"""Content-addressed pack storage for saved plugin sources.
+
+An alternative to the ``SAVE_SOURCE/{slug}/...`` tree. Every file is stored
+once per unique content (BLAKE2b digest), zlib-compressed and appended to a
+few large ``pack-NNNNNN.pack`` files; ``index.db`` maps slug/path to blob and
+blob to (pack, offset, length). Vendored copies shared by many plugins take
+the space of one, and cleaning or backing up means a handful of files.
+
+Deleting slugs only drops index rows; ``repack`` rewrites packs that are
+mostly garbage and removes them.
+"""
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from .config import SOURCE_PACK_MAX_BYTES, SOURCE_STORE_PATH
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class SourceStore:
+    """Deduplicated, packed plugin sources with a slug/path index."""
+
+    def __init__(self, root: Path = SOURCE_STORE_PATH, pack_max_bytes: int = SOURCE_PACK_MAX_BYTES):
+        self.root = Path(root)
+        self.pack_max_bytes = pack_max_bytes
+        self.db_path = self.root / "index.db"
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._init_db()
+        packs = self._pack_ids()
+        self._pack_id = packs[-1] if packs else 1
+
+    def _init_db(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS blobs (
+                    digest BLOB PRIMARY KEY,
+                    pack INTEGER NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    size INTEGER NOT NULL
+                ) WITHOUT ROWID
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS files (
+                    slug TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    digest BLOB NOT NULL,
+                    PRIMARY KEY (slug, path)
+                ) WITHOUT ROWID
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_files_digest ON files(digest)')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS plugins (
+                    slug TEXT PRIMARY KEY,
+                    stored_at REAL NOT NULL,
+                    files INTEGER NOT NULL,
+                    bytes INTEGER NOT NULL
+                )
+            ''')
+            conn.commit()
+
+    def _pack_path(self, pack_id: int) -> Path:
+        return self.root / f"pack-{pack_id:06d}.pack"
+
+    def _pack_ids(self) -> list[int]:
+        return sorted(int(p.stem.split("-", 1)[1]) for p in self.root.glob("pack-*.pack"))
+
+    # -- writing -----------------------------------------------------------
+    def put_plugin(self, slug: str, plugin_path: Path, files: Iterable[Path]) -> int:
+        """Store ``files`` (under ``plugin_path``) as the sources of ``slug``.
+
+        Replaces what was stored for the slug before. Returns the number of
+        blobs that were new to the store.
+        """
+        entries = []  # (relative path, digest, data)
+        for src in files:
+            data = src.read_bytes()
+            entries.append((src.relative_to(plugin_path).as_posix(), _digest(data), data))
+        with sqlite3.connect(self.db_path) as conn:
+            known = self._known(conn, {d for _, d, _ in entries})
+        # compress outside the lock; only the append is serialized
+        new_blobs = {}
+        for _, digest, data in entries:
+            if digest not in known and digest not in new_blobs:
+                new_blobs[digest] = (zlib.compress(data), len(data))
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                # a repack may have dropped blobs seen above
+                for _, digest, data in entries:
+                    if digest in known and digest not in new_blobs and not self._known(conn, {digest}):
+                        new_blobs[digest] = (zlib.compress(data), len(data))
+                rows = self._append(new_blobs)
+                conn.executemany('INSERT OR IGNORE INTO blobs VALUES (?, ?, ?, ?, ?)', rows)
+                conn.execute('DELETE FROM files WHERE slug = ?', (slug,))
+                conn.executemany('INSERT INTO files VALUES (?, ?, ?)', [(slug, p, d) for p, d, _ in entries])
+                conn.execute('INSERT OR REPLACE INTO plugins VALUES (?, ?, ?, ?)',
+                             (slug, time.time(), len(entries), sum(len(data) for _, _, data in entries)))
+                conn.commit()
+        return len(new_blobs)
+
+    @staticmethod
+    def _known(conn: sqlite3.Connection, digests: set) -> set:
+        digests = list(digests)
+        known = set()
+        for i in range(0, len(digests), 500):
+            chunk = digests[i:i + 500]
+            known.update(row[0] for row in conn.execute(
+                f'SELECT digest FROM blobs WHERE digest IN ({",".join("?" * len(chunk))})', chunk))
+        return known
+
+    def _append(self, blobs: dict) -> list[tuple]:
+        """Append compressed blobs to the current pack; caller holds the lock."""
+        rows = []
+        if not blobs:
+            return rows
+        pack = self._pack_path(self._pack_id)
+        if pack.exists() and pack.stat().st_size >= self.pack_max_bytes:
+            self._pack_id += 1
+            pack = self._pack_path(self._pack_id)
+        with open(pack, "ab") as f:
+            offset = f.tell()
+            for digest, (payload, size) in blobs.items():
+                f.write(payload)
+                rows.append((digest, self._pack_id, offset, len(payload), size))
+                offset += len(payload)
+            f.flush()
+            os.fsync(f.fileno())  # blobs hit the disk before the index points at them
+        return rows
+
+    # -- reading -----------------------------------------------------------
+    def __contains__(self, slug: str) -> bool:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute('SELECT 1 FROM plugins WHERE slug = ?', (slug,)).fetchone() is not None
+
+    def slugs(self) -> list[str]:
+        with sqlite3.connect(self.db_path) as conn:
+            return [row[0] for row in conn.execute('SELECT slug FROM plugins ORDER BY slug')]
+
+    def usage(self) -> dict[str, tuple[float, int]]:
+        """slug -> (stored_at, source bytes before dedup/compression)."""
+        with sqlite3.connect(self.db_path) as conn:
+            return {slug: (stored_at, size) for slug, stored_at, size in
+                    conn.execute('SELECT slug, stored_at, bytes FROM plugins')}
+
+    def fingerprint(self, slug: str) -> Optional[str]:
+        """Digest of the slug's path -> content mapping; None if not stored."""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute('SELECT path, digest FROM files WHERE slug = ? ORDER BY path', (slug,)).fetchall()
+        if not rows and slug not in self:
+            return None
+        h = hashlib.blake2b(digest_size=16)
+        for path, digest in rows:
+            h.update(path.encode() + b"\0" + digest)
+        return h.hexdigest()
+
+    def files(self, slug: str) -> list[tuple[str, int]]:
+        """(path, size) of every file stored for ``slug``."""
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute('''
+                SELECT f.path, b.size FROM files f JOIN blobs b ON b.digest = f.digest
+                WHERE f.slug = ? ORDER BY f.path
+            ''', (slug,)).fetchall()
+
+    def read(self, slug: str, path: str) -> Optional[bytes]:
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute('''
+                SELECT b.pack, b.offset, b.length FROM files f JOIN blobs b ON b.digest = f.digest
+                WHERE f.slug = ? AND f.path = ?
+            ''', (slug, path)).fetchone()
+        if row is None:
+            return None
+        pack, offset, length = row
+        with open(self._pack_path(pack), "rb") as f:
+            f.seek(offset)
+            return zlib.decompress(f.read(length))
+
+    def iter_files(self, slug: str) -> Iterator[tuple[str, bytes]]:
+        """Yield (path, content) for ``slug`` in pack order (sequential reads)."""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute('''
+                SELECT f.path, b.pack, b.offset, b.length FROM files f JOIN blobs b ON b.digest = f.digest
+                WHERE f.slug = ? ORDER BY b.pack, b.offset
+            ''', (slug,)).fetchall()
+        handle, handle_pack = None, None
+        try:
+            for path, pack, offset, length in rows:
+                if pack != handle_pack:
+                    if handle is not None:
+                        handle.close()
+                    handle, handle_pack = open(self._pack_path(pack), "rb"), pack
+                handle.seek(offset)
+                yield path, zlib.decompress(handle.read(length))
+        finally:
+            if handle is not None:
+                handle.close()
+
+    def export(self, slug: str, destination: Path) -> Path:
+        """Write the sources of ``slug`` as a tree under ``destination/slug``."""
+        dest_root = Path(destination) / slug
+        if dest_root.exists():
+            shutil.rmtree(dest_root)
+        for path, data in self.iter_files(slug):
+            dest_file = dest_root / path
+            dest_file.parent.mkdir(parents=True, exist_ok=True)
+            dest_file.write_bytes(data)
+        return dest_root
+
+    # -- maintenance -------------------------------------------------------
+    def delete(self, slugs: Iterable[str]) -> int:
+        """Drop ``slugs`` from the index; their blobs are reclaimed by ``repack``."""
+        slugs = list(slugs)
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                before = conn.total_changes
+                conn.executemany('DELETE FROM plugins WHERE slug = ?', [(s,) for s in slugs])
+                removed = conn.total_changes - before
+                conn.executemany('DELETE FROM files WHERE slug = ?', [(s,) for s in slugs])
+                conn.commit()
+        return removed
+
+    def repack(self, min_garbage: float = 0.5) -> int:
+        """Rewrite packs where at least ``min_garbage`` of the bytes are unused.
+
+        Returns the number of bytes freed on disk.
+        """
+        freed = 0
+        with self._lock:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM files)')
+                conn.commit()
+                live = dict(conn.execute('SELECT pack, SUM(length) FROM blobs GROUP BY pack'))
+                for pack_id in self._pack_ids():
+                    pack = self._pack_path(pack_id)
+                    size = pack.stat().st_size
+                    if size == 0 or 1 - live.get(pack_id, 0) / size < min_garbage:
+                        continue
+                    if pack_id == self._pack_id:
+                        self._pack_id = self._pack_ids()[-1] + 1  # never append to a pack being rewritten
+                    blobs = conn.execute('SELECT digest, offset, length, size FROM blobs WHERE pack = ? ORDER BY offset',
+                                         (pack_id,)).fetchall()
+                    with open(pack, "rb") as f:
+                        moved = {}
+                        for digest, offset, length, raw_size in blobs:
+                            f.seek(offset)
+                            moved[digest] = (f.read(length), raw_size)
+                    conn.executemany('UPDATE blobs SET pack = ?, offset = ?, length = ?, size = ? WHERE digest = ?',
+                                     [(p, o, l, s, d) for d, p, o, l, s in self._append(moved)])
+                    conn.commit()
+                    pack.unlink()
+                    freed += size - sum(len(payload) for payload, _ in moved.values())
+        return freed
+
+    def clear(self) -> None:
+        """Remove every stored plugin and pack."""
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._init_db()
+            self._pack_id = 1
+
+    def stats(self) -> dict:
+        with sqlite3.connect(self.db_path) as conn:
+            plugins, files, source_bytes = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(files), 0), COALESCE(SUM(bytes), 0) FROM plugins').fetchone()
+            blobs, blob_bytes = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs').fetchone()
+        return {
+            "plugins": plugins,
+            "files": files,
+            "source_bytes": source_bytes,
+            "blobs": blobs,
+            "unique_bytes": blob_bytes,
+            "pack_bytes": sum(self._pack_path(p).stat().st_size for p in self._pack_ids()),
+        }
@@ -0,0 +1,85 @@
+"""Batched hand-off of progress events from worker threads to the Tk loop.
+
+Workers used to post every progress message with ``root.after(0, ...)``;
+bursts of thousands of callbacks starved the event loop. ``UiEventQueue``
+buffers events under a lock and the Tk thread drains them on a fixed tick:
+
+* ``post`` queues a one-shot call; calls run in the order they were posted.
+* ``post_latest`` queues a status update that replaces a still pending
+  update with the same key, unless a ``post`` call was queued in between.
+* ``log`` buffers log lines that are handed to ``log_sink`` as one batch.
+"""
+import threading
+from typing import Callable, Hashable, Optional
+
+
+class UiEventQueue:
+    """Thread-safe event queue drained by the Tk main loop every ``interval_ms``."""
+
+    def __init__(self, root, log_sink: Optional[Callable[[list[str]], None]] = None, interval_ms: int = 100):
+        self.root = root
+        self.log_sink = log_sink
+        self.interval_ms = interval_ms
+        self._lock = threading.Lock()
+        self._events: list[list] = []  # [callback, args]
+        self._latest: dict[Hashable, list] = {}  # key -> pending event
+        self._lines: list[str] = []
+        self._after_id = None
+
+    def start(self) -> None:
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self) -> None:
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    # -- producer side (any thread) ---------------------------------------
+    def post(self, callback: Callable, *args) -> None:
+        with self._lock:
+            self._events.append([callback, args])
+            # a call may depend on earlier status updates; keep them before it
+            self._latest.clear()
+
+    def post_latest(self, key: Hashable, callback: Callable, *args) -> None:
+        with self._lock:
+            pending = self._latest.get(key)
+            if pending is not None:
+                pending[0], pending[1] = callback, args
+                return
+            event = [callback, args]
+            self._events.append(event)
+            self._latest[key] = event
+
+    def set_var(self, var, value) -> None:
+        """Coalesced ``var.set(value)`` for Tk variables."""
+        self.post_latest(var, var.set, value)
+
+    def log(self, line: str) -> None:
+        with self._lock:
+            self._lines.append(line)
+
+    # -- consumer side (Tk thread) ----------------------------------------
+    def drain(self) -> None:
+        with self._lock:
+            events, self._events = self._events, []
+            lines, self._lines = self._lines, []
+            self._latest.clear()
+        if lines and self.log_sink is not None:
+            try:
+                self.log_sink(lines)
+            except Exception as e:
+                print(f"DEBUG: log sink failed: {e}")
+        for callback, args in events:
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"DEBUG: UI event {callback!r} failed: {e}")
+
+    def _tick(self) -> None:
+        self._after_id = None
+        try:
+            self.drain()
+        finally:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
@@ -0,0 +1,320 @@
+"""Virtualized ``ttk.Treeview`` backed by a paginated query.
+
+Only a window of a few pages is kept in the tree at any time. Pages are
+fetched with keyset pagination (the ``sort_key`` of the previous page's
+last row) as the user scrolls, and the scrollbar is mapped onto the full
+result count, so arbitrarily large result sets can be browsed without
+inserting every row. With a ``schedule`` the pages are fetched off the
+Tk thread and the view shows placeholder rows until they arrive. ``ChunkedTreeFiller`` covers views that do insert
+every row, spreading the inserts over the Tk event loop.
+"""
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Iterator, Optional
+
+# fetch(after, offset, limit) -> rows; every row carries a 'sort_key'
+FetchPage = Callable[[Optional[tuple], int, int], list]
+# schedule(job, on_rows, on_error): run job(conn) in the background, report on the Tk thread
+SchedulePage = Callable[[Callable, Callable[[list], None], Callable[[Exception], None]], object]
+
+
+class PagedRows:
+    """Page cache over a keyset-paginated query with a known total.
+
+    ``request`` hands pages to a callback; with a ``schedule`` the fetch
+    runs as ``job(conn)`` on the scheduler's worker and ``fetch`` is
+    called with a ``conn`` keyword.
+    """
+
+    def __init__(
+        self,
+        fetch: FetchPage,
+        total: int,
+        page_size: int = 200,
+        max_pages: int = 8,
+        schedule: Optional[SchedulePage] = None,
+    ):
+        self.fetch = fetch
+        self.total = total
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.schedule = schedule
+        self._pages: "OrderedDict[int, list]" = OrderedDict()
+        # page index -> cursor of the previous page's last row
+        self._cursors: dict[int, Optional[tuple]] = {0: None}
+        self._loading: dict[int, list] = {}  # page index -> waiting callbacks
+
+    @property
+    def page_count(self) -> int:
+        return (self.total + self.page_size - 1) // self.page_size
+
+    def cached(self, index: int) -> Optional[list]:
+        """Return page ``index`` when it is cached, else None."""
+        if index in self._pages:
+            self._pages.move_to_end(index)
+            return self._pages[index]
+        return None
+
+    def page(self, index: int) -> list:
+        """Return the rows of page ``index``, fetching it when not cached."""
+        rows = self.cached(index)
+        if rows is not None:
+            return rows
+        if index < 0 or index >= self.page_count:
+            return []
+        rows = self._fetch_page(index)
+        self.store(index, rows)
+        return rows
+
+    def request(self, index: int, callback: Callable[[list], None]) -> None:
+        """Pass the rows of page ``index`` to ``callback``, in the background when scheduled."""
+        rows = self.cached(index)
+        if rows is not None or self.schedule is None or not 0 <= index < self.page_count:
+            callback(self.page(index))
+            return
+        if index in self._loading:
+            self._loading[index].append(callback)
+            return
+        self._loading[index] = [callback]
+
+        def on_rows(rows):
+            self.store(index, rows)
+            for waiting in self._loading.pop(index, []):
+                waiting(rows)
+
+        def on_error(e):
+            print(f"DEBUG: Failed to load page {index}: {e}")
+            for waiting in self._loading.pop(index, []):
+                waiting([])
+
+        self.schedule(lambda conn: self._fetch_page(index, conn=conn), on_rows, on_error)
+
+    def _fetch_page(self, index: int, **kwargs) -> list:
+        # Scheduled pages run in order on one worker, so a page queued after
+        # its predecessor finds the cursor that one recorded here.
+        if index in self._cursors:
+            rows = self.fetch(self._cursors[index], 0, self.page_size, **kwargs)
+        else:
+            # jump without a known cursor: fall back to OFFSET once
+            rows = self.fetch(None, index * self.page_size, self.page_size, **kwargs)
+        if rows:
+            self._cursors[index + 1] = rows[-1]["sort_key"]
+        return rows
+
+    def store(self, index: int, rows: list) -> None:
+        """Cache page ``index``, e.g. when it was prefetched elsewhere."""
+        if rows:
+            self._cursors[index + 1] = rows[-1]["sort_key"]
+        self._pages[index] = rows
+        self._pages.move_to_end(index)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def iter_rows(self) -> Iterator[dict]:
+        """Walk the whole result set page by page without caching it."""
+        after = None
+        while True:
+            rows = self.fetch(after, 0, self.page_size)
+            yield from rows
+            if len(rows) < self.page_size:
+                return
+            after = rows[-1]["sort_key"]
+
+
+class VirtualTreeview:
+    """Keep a sliding window of ``PagedRows`` pages in a ``ttk.Treeview``."""
+
+    EDGE = 0.15  # fraction of the window that triggers loading the next page
+    PLACEHOLDER = "…"
+
+    def __init__(self, tree, scrollbar, format_row: Callable[[dict], tuple], window_pages: int = 3):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.format_row = format_row
+        self.window_pages = window_pages
+        self.rows: Optional[PagedRows] = None
+        self._window: list[tuple[int, list]] = []  # (page index, item ids)
+        self._adjust_pending = False
+        tree.configure(yscrollcommand=self._on_tree_scroll)
+        scrollbar.configure(command=self._on_scrollbar)
+
+    # -- public API -------------------------------------------------------
+    def set_rows(self, rows: Optional[PagedRows]) -> None:
+        """Show a new result set, starting from the first row."""
+        self.rows = rows
+        self._load_window(0)
+        self.tree.yview_moveto(0)
+
+    def refresh(self, rows: PagedRows) -> None:
+        """Swap in a re-queried result set, keeping the scroll position."""
+        first_page = self._window[0][0] if self._window else 0
+        top = self._top_index()
+        self.rows = rows
+        self._load_window(min(first_page, max(rows.page_count - 1, 0)))
+        self._move_to_index(top)
+
+    @property
+    def window_start(self) -> int:
+        return self._window[0][0] * self.rows.page_size if self._window else 0
+
+    # -- window management ------------------------------------------------
+    def _window_len(self) -> int:
+        return sum(len(items) for _, items in self._window)
+
+    def _insert_page(self, index: int, position) -> list:
+        rows = self.rows.cached(index)
+        if rows is None and self.rows.schedule is None:
+            rows = self.rows.page(index)
+        if rows is not None:
+            return [self._insert(position, offset, *self.format_row(row)) for offset, row in enumerate(rows)]
+        # not loaded yet: reserve the rows now and fill them in when the page arrives
+        count = max(0, min(self.rows.page_size, self.rows.total - index * self.rows.page_size))
+        items = [self._insert(position, offset, "", (self.PLACEHOLDER,)) for offset in range(count)]
+        self.rows.request(index, lambda rows: self._fill(items, rows))
+        return items
+
+    def _insert(self, position, offset: int, text, values):
+        pos = position if position == "end" else position + offset
+        return self.tree.insert("", pos, text=text, values=values)
+
+    def _fill(self, items: list, rows: list) -> None:
+        for item, row in zip(items, rows):
+            if self.tree.exists(item):
+                text, values = self.format_row(row)
+                self.tree.item(item, text=text, values=values)
+        # fewer rows than reserved (the data changed meanwhile): drop the rest
+        extra = [item for item in items[len(rows):] if self.tree.exists(item)]
+        del items[len(rows):]
+        if extra:
+            self.tree.delete(*extra)
+
+    def _load_window(self, first_page: int) -> None:
+        self.tree.delete(*self.tree.get_children())
+        self._window = []
+        if self.rows is None:
+            return
+        last_page = min(first_page + self.window_pages, self.rows.page_count)
+        for index in range(first_page, last_page):
+            self._window.append((index, self._insert_page(index, "end")))
+
+    def _top_index(self) -> int:
+        return round(self.tree.yview()[0] * self._window_len())
+
+    def _move_to_index(self, index: int) -> None:
+        length = self._window_len()
+        if length:
+            self.tree.yview_moveto(max(0, min(index, length)) / length)
+
+    def _append_page(self) -> None:
+        top = self._top_index()
+        index = self._window[-1][0] + 1
+        self._window.append((index, self._insert_page(index, "end")))
+        if len(self._window) > self.window_pages:
+            _, dropped = self._window.pop(0)
+            self.tree.delete(*dropped)
+            top -= len(dropped)
+        self._move_to_index(top)
+
+    def _prepend_page(self) -> None:
+        top = self._top_index()
+        index = self._window[0][0] - 1
+        items = self._insert_page(index, 0)
+        self._window.insert(0, (index, items))
+        top += len(items)
+        if len(self._window) > self.window_pages:
+            _, dropped = self._window.pop()
+            self.tree.delete(*dropped)
+        self._move_to_index(top)
+
+    def _adjust(self) -> None:
+        self._adjust_pending = False
+        if not self._window:
+            return
+        first, last = self.tree.yview()
+        if last >= 1 - self.EDGE and self._window[-1][0] + 1 < self.rows.page_count:
+            self._append_page()
+        elif first <= self.EDGE and self._window[0][0] > 0:
+            self._prepend_page()
+
+    # -- scrolling --------------------------------------------------------
+    def _on_tree_scroll(self, first, last) -> None:
+        first, last = float(first), float(last)
+        total = self.rows.total if self.rows else 0
+        length = self._window_len()
+        if total and length:
+            start = self.window_start
+            self.scrollbar.set((start + first * length) / total, (start + last * length) / total)
+        else:
+            self.scrollbar.set(first, last)
+        # loading pages changes the view again; handle it once the tree is idle
+        if not self._adjust_pending and self._window:
+            self._adjust_pending = True
+            self.tree.after_idle(self._adjust)
+
+    def _on_scrollbar(self, *args) -> None:
+        if not self.rows or args[0] != "moveto":
+            self.tree.yview(*args)
+            return
+        target = int(float(args[1]) * self.rows.total)
+        start = self.window_start
+        if not (start <= target < start + self._window_len()):
+            page = target // self.rows.page_size
+            self._load_window(max(0, page - 1))
+        self._move_to_index(target - self.window_start)
+
+
+class ChunkedTreeFiller:
+    """Insert rows into a ``ttk.Treeview`` in time-sliced chunks.
+
+    Rows handed to ``feed`` are buffered and inserted from ``after``
+    callbacks that each stop after ``budget_ms``, so the first screen shows
+    up at once and the window stays responsive while a large result streams in.
+    ``on_empty`` is called whenever the buffer runs dry, which is the cue
+    for a streaming producer to hand over its next batch.
+    """
+
+    def __init__(self, tree, budget_ms: float = 15.0, on_empty: Optional[Callable[[], None]] = None):
+        self.tree = tree
+        self.budget = budget_ms / 1000
+        self.on_empty = on_empty
+        self.inserted = 0
+        self._buffer: deque = deque()
+        self._after_id = None
+        self._on_drained: Optional[Callable[[], None]] = None
+
+    def reset(self) -> None:
+        """Drop buffered rows and empty the tree."""
+        if self._after_id is not None:
+            self.tree.after_cancel(self._after_id)
+            self._after_id = None
+        self._buffer.clear()
+        self._on_drained = None
+        self.inserted = 0
+        self.tree.delete(*self.tree.get_children())
+
+    def feed(self, rows) -> None:
+        self._buffer.extend(rows)
+        if self._after_id is None:
+            self._after_id = self.tree.after(0, self._pump)
+
+    def finish(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` once every buffered row has been inserted."""
+        self._on_drained = callback
+        if self._after_id is None:
+            self._pump()
+
+    def _pump(self) -> None:
+        self._after_id = None
+        deadline = time.perf_counter() + self.budget
+        buffer = self._buffer
+        while buffer:
+            self.tree.insert("", "end", values=buffer.popleft())
+            self.inserted += 1
+            if not self.inserted % 100 and time.perf_counter() > deadline:
+                self._after_id = self.tree.after(1, self._pump)
+                return
+        if self.on_empty is not None:
+            self.on_empty()
+        if self._on_drained is not None:
+            callback, self._on_drained = self._on_drained, None
+            callback()